@@ -0,0 +1,65 @@
+"""Benchmark the HTML-to-text engines used by TextScraper.
+
+Usage:
+    python benchmarks/bench_text_engines.py [--corpus DIR] [--repeat N]
+
+Can be run from a source checkout; the repository root is added to the import path.
+
+Each engine extracts text from every saved page in the corpus. Timings are reported
+per page along with the speedup over the bs4 reference engine, and each engine's output
+is checked for parity with bs4.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow running from a source checkout without installing scraipe
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraipe.defaults.html_text_engines import Bs4TextEngine, available_text_engines, get_text_engine
+
+DEFAULT_CORPUS = Path(__file__).parent / "corpus"
+
+def load_corpus(corpus_dir: Path) -> dict:
+    pages = {}
+    for path in sorted(corpus_dir.glob("*.htm*")):
+        with open(path, encoding="utf-8", errors="replace", newline="") as f:
+            pages[path.name] = f.read()
+    return pages
+
+def time_engine(engine, pages: dict, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages.values():
+            engine.extract_text(html)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved HTML pages.")
+    parser.add_argument("--repeat", type=int, default=50, help="Number of passes over the corpus.")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    assert pages, f"No HTML pages found in {args.corpus}"
+    total_bytes = sum(len(html.encode("utf-8")) for html in pages.values())
+    print(f"Corpus: {len(pages)} pages, {total_bytes / 1024:.1f} KiB, {args.repeat} passes")
+
+    reference = Bs4TextEngine()
+    expected = {name: reference.extract_text(html) for name, html in pages.items()}
+
+    baseline = None
+    for name in reversed(available_text_engines()):
+        engine = get_text_engine(name)
+        mismatches = [page for page, html in pages.items() if engine.extract_text(html) != expected[page]]
+        elapsed = time_engine(engine, pages, args.repeat)
+        per_page_ms = elapsed / (args.repeat * len(pages)) * 1000
+        throughput = total_bytes * args.repeat / elapsed / (1024 * 1024)
+        if baseline is None:
+            baseline = elapsed
+        print(f"{name:>10}: {per_page_ms:8.3f} ms/page  {throughput:8.2f} MiB/s  "
+              f"x{baseline / elapsed:5.1f} vs bs4  parity={'ok' if not mismatches else mismatches}")
+
+if __name__ == "__main__":
+    main()
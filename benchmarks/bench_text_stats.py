@@ -0,0 +1,67 @@
+"""Benchmark TextStatsAnalyzer.analyze_multiple.
+
+Usage:
+    python benchmarks/bench_text_stats.py [--docs N] [--words N]
+
+Can be run from a source checkout; the repository root is added to the import path.
+
+Analyzes a synthetic corpus of N documents with the batched NumPy implementation and with
+the per-document loop it replaces, checks that both produce identical statistics, and
+reports the throughput of each.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Allow running from a source checkout without installing scraipe
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraipe.classes import IAnalyzer
+from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer
+
+VOCABULARY = ["the", "scraper", "it's", "analysis", "page", "news", "don't", "data", "LLM", "2024",
+              "café", "naïve", "über", "link", "o'clock", "results", "fast", "telegram", "reddit", "text"]
+PUNCTUATION = [" ", " ", " ", " ", ", ", ". ", "! ", "? ", "... ", "\n"]
+
+def make_corpus(count: int, words: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    corpus = {}
+    for i in range(count):
+        length = rng.randrange(words // 2, words * 3 // 2 + 1)
+        parts = []
+        for _ in range(length):
+            parts.append(rng.choice(VOCABULARY))
+            parts.append(rng.choice(PUNCTUATION))
+        corpus[f"https://example.com/{i}"] = "".join(parts)
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100_000, help="Number of documents")
+    parser.add_argument("--words", type=int, default=150, help="Average number of words per document")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs, args.words)
+    characters = sum(len(text) for text in corpus.values())
+    print(f"{args.docs} documents, {characters / 1e6:.1f}M characters")
+    analyzer = TextStatsAnalyzer()
+
+    start = time.perf_counter()
+    reference = dict(IAnalyzer.analyze_multiple(analyzer, corpus))
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = dict(analyzer.analyze_multiple(corpus))
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = [link for link in corpus if reference[link].output != batched[link].output]
+    if mismatches:
+        raise SystemExit(f"Outputs differ for {len(mismatches)} documents, e.g. {mismatches[0]}")
+    print(f"per-document loop: {loop_seconds:.2f}s ({args.docs / loop_seconds:,.0f} docs/s)")
+    print(f"batched:           {batch_seconds:.2f}s ({args.docs / batch_seconds:,.0f} docs/s)")
+    print(f"speedup:           {loop_seconds / batch_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
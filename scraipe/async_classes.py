@@ -1,15 +1,41 @@
 from abc import abstractmethod
-from typing import Generator, Tuple, AsyncIterable, Iterable
+from typing import Any, Dict, Generator, Tuple, AsyncIterable, Iterable
 from scraipe.classes import IScraper, ScrapeResult, IAnalyzer, AnalysisResult, ILinkCollector
 from scraipe.async_util import AsyncManager
+from scraipe.async_util.limiters import AdaptiveConcurrencyLimiter, TokenBucketRateLimiter
+import asyncio
 import logging
+import re
+import threading
+import time
+
+# Scrape errors that indicate the target is overloaded or throttling us
+_OVERLOAD_ERROR_RE = re.compile(r"status code: (?:429|503)\b|too many requests|timed out|timeout", re.IGNORECASE)
+
 class IAsyncScraper(IScraper):
     """
     Base class for asynchronous scrapers. Implements the IScraper interface.
     This class provides a synchronous wrapper around the asynchronous scraping method.
     Subclasses must implement the async_scrape() method.
+
+    By default scrape_multiple() runs up to max_workers scrapes at once. Call
+    enable_adaptive_concurrency() to tune the concurrency automatically instead.
+    Set rate_limiter to cap the request rate; a limiter can be shared by scrapers
+    that draw on the same quota.
     """
     max_workers:int = 4
+    timeout:float = 10
+    """The seconds scrape_multiple() allows each link before dropping it, or None for no limit."""
+    adaptive_concurrency:AdaptiveConcurrencyLimiter = None
+    """The adaptive limiter used by scrape_multiple(), or None to use max_workers."""
+    rate_limiter:TokenBucketRateLimiter = None
+    """The rate limiter applied to scrapes, or None for no rate limit."""
+    throttles_requests:bool = False
+    """True if the scraper applies rate_limiter to each network request itself (e.g. per retry)
+    rather than once per scrape in dispatch_scrape()."""
+    coalesce_scrapes:bool = True
+    """If True, concurrent dispatch_scrape() calls for the same link on the same event loop share one scrape."""
+    _inflight_lock = threading.Lock()
     def __init__(self, max_workers: int=4):
         """
         Initialize the IAsyncScraper with a maximum number of concurrent workers.
@@ -32,6 +58,68 @@ class IAsyncScraper(IScraper):
         """
         raise NotImplementedError("Subclasses must implement this method.")
     
+    async def dispatch_scrape(self, link: str) -> ScrapeResult:
+        """
+        Scrape the given URL with async_scrape(), applying the scraper's rate limiter.
+        Callers that scrape on behalf of the scraper, such as MultiScraper, should use this
+        rather than calling async_scrape() directly.
+        
+        If coalesce_scrapes is True and the same link is already being scraped on this event
+        loop, waits for that scrape and returns a copy of its result instead of scraping again.
+        
+        Args:
+            link (str): The URL to scrape.
+        
+        Returns:
+            ScrapeResult: The result of the scrape.
+        """
+        if not self.coalesce_scrapes:
+            return await self._throttled_scrape(link)
+        
+        loop = asyncio.get_running_loop()
+        key = (loop, link)
+        with IAsyncScraper._inflight_lock:
+            inflight = self.__dict__.setdefault("_inflight_scrapes", {})
+            future = inflight.get(key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                # Mark exceptions as retrieved when no other call is waiting
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                inflight[key] = future
+        
+        if not leader:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leading call was cancelled (e.g. timed out); scrape again
+                    return await self.dispatch_scrape(link)
+                raise
+            # Callers may modify their results, so each gets its own copy
+            return result.model_copy(deep=True)
+        
+        try:
+            result = await self._throttled_scrape(link)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            # Share a snapshot so changes the caller makes to its result are not seen by others
+            future.set_result(result.model_copy(deep=True))
+            return result
+        finally:
+            with IAsyncScraper._inflight_lock:
+                inflight.pop(key, None)
+    
+    async def _throttled_scrape(self, link: str) -> ScrapeResult:
+        if self.rate_limiter is not None and not self.throttles_requests:
+            await self.rate_limiter.acquire()
+        return await self.async_scrape(link)
+    
     def scrape(self, link: str) -> ScrapeResult:
         """
         Synchronously scrape the given URL. Wraps async_scrape().
@@ -42,7 +130,49 @@ class IAsyncScraper(IScraper):
         Returns:
             ScrapeResult: The result of the scrape.
         """
-        return AsyncManager.get_executor().run(self.async_scrape(link))
+        return AsyncManager.get_executor().run(self.dispatch_scrape(link))
+    
+    def enable_adaptive_concurrency(self, initial_workers: int = None, min_workers: int = 1, max_workers: int = 64, **kwargs) -> AdaptiveConcurrencyLimiter:
+        """
+        Let scrape_multiple() tune its concurrency with additive-increase/multiplicative-decrease.
+        Concurrency grows while scrapes succeed with steady latency and is cut when they time out
+        or the target responds with 429 or 503.
+        
+        Args:
+            initial_workers (int): The starting concurrency. Defaults to max_workers clamped to the bounds.
+            min_workers (int): The lowest concurrency to use.
+            max_workers (int): The highest concurrency to use.
+            **kwargs: Additional arguments for AdaptiveConcurrencyLimiter, such as decrease_factor.
+        
+        Returns:
+            AdaptiveConcurrencyLimiter: The limiter. Its history attribute records the limit over time.
+        """
+        if initial_workers is None:
+            initial_workers = min(max(self.max_workers, min_workers), max_workers)
+        self.adaptive_concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_workers, min_limit=min_workers, max_limit=max_workers, **kwargs)
+        return self.adaptive_concurrency
+    
+    def disable_adaptive_concurrency(self) -> None:
+        """
+        Go back to running up to max_workers scrapes at once.
+        """
+        self.adaptive_concurrency = None
+    
+    def is_overloaded(self, result: ScrapeResult) -> bool:
+        """
+        Check whether a failed scrape indicates that the target is overloaded or throttling.
+        Used by adaptive concurrency. Override to recognize scraper-specific errors.
+        
+        Args:
+            result (ScrapeResult): The result of a scrape.
+        
+        Returns:
+            bool: True if the scrape failed with a timeout, 429 or 503.
+        """
+        if result.scrape_success or not result.scrape_error:
+            return False
+        return _OVERLOAD_ERROR_RE.search(result.scrape_error) is not None
     
     def scrape_multiple(self, links) -> Generator[Tuple[str, ScrapeResult], None, None]:
         """
@@ -55,15 +185,25 @@ class IAsyncScraper(IScraper):
         Returns:
             Generator[Tuple[str, ScrapeResult], None, None]: A generator yielding tuples of URL and ScrapeResult.
         """
+        limiter = self.adaptive_concurrency
         def make_task(link):
             async def task():
+                start = time.perf_counter()
                 try:
-                    return link, await self.async_scrape(link)
+                    result = await self.dispatch_scrape(link)
+                except asyncio.CancelledError:
+                    # Cancelled by the executor's timeout
+                    if limiter is not None:
+                        limiter.record(time.perf_counter() - start, overloaded=True)
+                    raise
                 except Exception as e:
-                    return link, ScrapeResult.fail(link, str(e))
+                    result = ScrapeResult.fail(link, str(e))
+                if limiter is not None:
+                    limiter.record(time.perf_counter() - start, overloaded=self.is_overloaded(result))
+                return link, result
             return task()
         tasks = [make_task(link) for link in links]
-        for task_result,err in AsyncManager.get_executor().run_multiple(tasks, self.max_workers):
+        for task_result,err in AsyncManager.get_executor().run_multiple(tasks, self.max_workers, timeout=self.timeout, limiter=limiter):
             if err:
                 logging.error(f"This is bad: {err}")
                 continue
@@ -74,8 +214,15 @@ class IAsyncAnalyzer(IAnalyzer):
     Base class for asynchronous analyzers. Implements the IAnalyzer interface.
     This class provides a synchronous wrapper around the asynchronous analysis method.
     Subclasses must implement the async_analyze() method.
+    Set rate_limiter to cap the request rate; a limiter can be shared by analyzers
+    that draw on the same quota.
     """
     max_workers:int = 2
+    rate_limiter:TokenBucketRateLimiter = None
+    """The rate limiter applied to analyses, or None for no rate limit."""
+    throttles_requests:bool = False
+    """True if the analyzer applies rate_limiter to each API request itself rather than
+    once per analysis in dispatch_analyze()."""
     def __init__(self, max_workers: int = 2):
         """
         Initialize the IAsyncAnalyzer with a maximum number of concurrent workers.
@@ -98,6 +245,53 @@ class IAsyncAnalyzer(IAnalyzer):
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    async def async_analyze_with_artifacts(self, content: str, artifacts: Dict[str, Any]) -> AnalysisResult:
+        """
+        Asynchronously analyze the content, reusing artifacts derived from it by a shared
+        preprocessing stage. The default implementation ignores the artifacts.
+
+        Args:
+            content (str): The content to analyze.
+            artifacts (Dict[str, Any]): The available artifacts named in uses_artifacts.
+
+        Returns:
+            AnalysisResult: The result of the analysis.
+        """
+        return await self.async_analyze(content)
+
+    def analyze_with_artifacts(self, content: str, artifacts: Dict[str, Any]) -> AnalysisResult:
+        """
+        Synchronously analyze the content with shared artifacts. Wraps async_analyze_with_artifacts().
+
+        Args:
+            content (str): The content to analyze.
+            artifacts (Dict[str, Any]): The available artifacts named in uses_artifacts.
+
+        Returns:
+            AnalysisResult: The result of the analysis.
+        """
+        return AsyncManager.get_executor().run(self.dispatch_analyze(content, artifacts))
+
+    async def dispatch_analyze(self, content: str, artifacts: Dict[str, Any] = None) -> AnalysisResult:
+        """
+        Analyze the given content with async_analyze(), applying the analyzer's rate limiter.
+        Callers that analyze on behalf of the analyzer, such as MultiAnalyzer, should use this
+        rather than calling async_analyze() directly.
+
+        Args:
+            content (str): The content to analyze.
+            artifacts (Dict[str, Any], optional): Shared preprocessing artifacts. If given,
+                async_analyze_with_artifacts() is used instead of async_analyze().
+
+        Returns:
+            AnalysisResult: The result of the analysis.
+        """
+        if self.rate_limiter is not None and not self.throttles_requests:
+            await self.rate_limiter.acquire()
+        if artifacts is not None:
+            return await self.async_analyze_with_artifacts(content, artifacts)
+        return await self.async_analyze(content)
+
     def analyze(self, content: str) -> AnalysisResult:
         """
         Synchronously analyze the given content. Wraps async_analyze().
@@ -108,7 +302,7 @@ class IAsyncAnalyzer(IAnalyzer):
         Returns:
             AnalysisResult: The result of the analysis.
         """
-        return AsyncManager.get_executor().run(self.async_analyze(content))
+        return AsyncManager.get_executor().run(self.dispatch_analyze(content))
     
     def analyze_multiple(self, contents: dict) -> "Generator[Tuple[str, AnalysisResult], None, None]":
         """
@@ -124,7 +318,7 @@ class IAsyncAnalyzer(IAnalyzer):
         def make_task(link, content):
             async def task():
                 try:
-                    return link, await self.async_analyze(content)
+                    return link, await self.dispatch_analyze(content)
                 except Exception as e:
                     return link, AnalysisResult.fail(str(e))
             return task()
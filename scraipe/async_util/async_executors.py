@@ -7,6 +7,7 @@ import time
 import asyncio
 from scraipe.async_util.common import get_running_loop, get_running_thread
 from scraipe.async_util.common import FutureLike, get_awaitable
+from scraipe.async_util.limiters import ConcurrencyLimiter
 from typing import AsyncIterable, Iterable, TypeVar, Iterator
 
 import logging
@@ -74,26 +75,32 @@ class IAsyncExecutor:
     async def wait_for(self, future: FutureLike) -> Any:
         return await get_awaitable(future)
             
-    async def run_multiple_async(self, tasks: List[Awaitable[Any]], max_workers: int = 10, timeout:float = 10) -> AsyncGenerator[Tuple[Any, str], None]:
+    async def run_multiple_async(self, tasks: List[Awaitable[Any]], max_workers: int = 10, timeout:float = 10, limiter: ConcurrencyLimiter = None) -> AsyncGenerator[Tuple[Any, str], None]:
         """
         Run multiple coroutines in parallel using the underlying executor.
         Limits the number of concurrent tasks to max_workers and applies a timeout to each task.
+        Tasks can give up their slot while waiting with scraipe.async_util.limiters.idle_slot().
+        Time spent without the slot, such as waiting for a rate limiter token or a retry backoff,
+        does not count toward the timeout.
 
         Args:
             tasks: A list of coroutines to run.
             max_workers: The maximum number of concurrent tasks.
-            timeout: The maximum time to wait for each individual task to complete in seconds.
+            timeout: The maximum time each task may hold its slot in seconds, or None for no limit.
+            limiter: A limiter to use instead of a new ConcurrencyLimiter(max_workers). Allows the
+                concurrency to be shared or adjusted while the tasks run.
 
         Yields:
             A tuple of (result, error) for each task.
         """
-        assert max_workers > 0, "max_workers must be greater than 0"
-        semaphore = asyncio.Semaphore(max_workers)
+        if limiter is None:
+            assert max_workers > 0, "max_workers must be greater than 0"
+            limiter = ConcurrencyLimiter(max_workers)
 
-        async def work(coro: Awaitable[Any], sem: asyncio.Semaphore) -> Tuple[Any, str]:
-            async with sem:
+        async def work(coro: Awaitable[Any], limiter: ConcurrencyLimiter) -> Tuple[Any, str]:
+            async with limiter.slot() as handle:
                 try:
-                    return await asyncio.wait_for(self.async_run(coro), timeout=timeout), None
+                    return await self._run_with_timeout(coro, timeout, handle), None
                 except asyncio.TimeoutError:
                     logging.error(f"Task timed out after {timeout} seconds.")
                     return None, f"Task timed out after {timeout}>{timeout} seconds."
@@ -104,11 +111,34 @@ class IAsyncExecutor:
 
                     return None, str(e)
 
-        coros = [work(task, semaphore) for task in tasks]
+        coros = [work(task, limiter) for task in tasks]
         for completed in asyncio.as_completed(coros):
             yield await completed
 
-    def run_multiple(self, tasks: List[Awaitable[Any]], max_workers:int=10, timeout=10) -> Generator[Tuple[Any,str], None, None]:
+    async def _run_with_timeout(self, coro: Awaitable[Any], timeout: float, handle) -> Any:
+        # Like asyncio.wait_for(), but only counts the time the task holds its slot
+        task = asyncio.create_task(coro)
+        if timeout is None:
+            return await task
+        try:
+            while True:
+                remaining = timeout - handle.busy_seconds()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if done:
+                    return task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        task.cancel()
+        await asyncio.wait({task})
+        if not task.cancelled() and task.exception() is None:
+            # The task finished while being cancelled
+            return task.result()
+        raise asyncio.TimeoutError()
+
+    def run_multiple(self, tasks: List[Awaitable[Any]], max_workers:int=10, timeout=10, limiter: ConcurrencyLimiter = None) -> Generator[Tuple[Any,str], None, None]:
         """
         Run multiple coroutines in parallel using the underlying executor.
         Block calling thread and yield results as they complete.
@@ -116,7 +146,8 @@ class IAsyncExecutor:
         Args:
             tasks: A list of coroutines to run.
             max_workers: The maximum number of concurrent tasks.
-            timeout: The maximum time to wait for each individual task to complete in seconds.
+            timeout: The maximum time to wait for each individual task to complete in seconds, or None for no limit.
+            limiter: A limiter to use instead of a new ConcurrencyLimiter(max_workers).
             
         Yields:
             A tuple of (result, error) for each task.
@@ -143,7 +174,7 @@ class IAsyncExecutor:
         #         yield result
         
         # Get async generator
-        async_iterable = self.run_multiple_async(tasks, max_workers=max_workers, timeout=timeout)
+        async_iterable = self.run_multiple_async(tasks, max_workers=max_workers, timeout=timeout, limiter=limiter)
         # get wrapped iterable
         wrapped_iterable = self.wrap_async_iterable(async_iterable)
         # Return on main loop
@@ -0,0 +1,370 @@
+"""Concurrency limiters shared by scrapers, analyzers and executors."""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Deque, List, Tuple, AsyncIterator
+
+class _SlotHandle:
+    # Tracks whether a slot taken with ConcurrencyLimiter.slot() is currently held,
+    # and for how long it was given up with idle_slot()
+    def __init__(self, limiter: "ConcurrencyLimiter"):
+        self.limiter = limiter
+        self.held = True
+        self.started = time.monotonic()
+        self.idle_seconds = 0.0
+        self.idle_since: float = None
+
+    def busy_seconds(self) -> float:
+        # Time since the slot was taken, excluding time spent in idle_slot()
+        now = time.monotonic()
+        idle = self.idle_seconds
+        if self.idle_since is not None:
+            idle += now - self.idle_since
+        return now - self.started - idle
+
+# The slot held by the current task, if any
+_held_slot: ContextVar[_SlotHandle] = ContextVar("scraipe_held_slot", default=None)
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of tasks running at once, like asyncio.Semaphore.
+
+    Unlike asyncio.Semaphore, the limiter is not bound to a single event loop, so it can be
+    shared by tasks running on different loops and threads. Tasks that hold a slot through
+    slot() can temporarily give it up with idle_slot() while they wait on something other
+    than work, such as a retry backoff.
+    """
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit (int): The maximum number of slots that can be held at once.
+        """
+        assert isinstance(limit, int) and limit > 0, "limit must be a positive integer"
+        self._limit = limit
+        self._active = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """The maximum number of slots that can be held at once."""
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        """The number of slots currently held."""
+        return self._active
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Change the number of slots. Slots held above a lowered limit are not revoked;
+        new acquisitions wait until enough of them are released.
+
+        Args:
+            limit (int): The new maximum number of slots.
+        """
+        assert isinstance(limit, int) and limit > 0, "limit must be a positive integer"
+        with self._lock:
+            self._limit = limit
+            self._wake_waiters()
+
+    async def acquire(self, priority: bool = False) -> None:
+        """
+        Wait for a free slot and take it.
+
+        Args:
+            priority (bool): If True, queue ahead of other waiters. Used by tasks resuming work.
+        """
+        with self._lock:
+            if self._active < self._limit and not self._waiters:
+                self._active += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            if priority:
+                self._waiters.appendleft(waiter)
+            else:
+                self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    # Never granted
+                    self._waiters.remove(waiter)
+                    raise
+            if waiter[1].done() and not waiter[1].cancelled():
+                # Granted before the cancellation was delivered
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Give back a slot taken with acquire()."""
+        with self._lock:
+            assert self._active > 0, "release() called more times than acquire()"
+            self._active -= 1
+            self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        # Must be called with self._lock held
+        while self._waiters and self._active < self._limit:
+            loop, future = self._waiters.popleft()
+            self._active += 1
+            loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future) -> None:
+        # Runs on the waiter's event loop
+        if future.cancelled():
+            # The waiter gave up after being granted the slot
+            self.release()
+        else:
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_SlotHandle]:
+        """
+        Hold a slot for the duration of the context. The slot can be given up temporarily
+        with idle_slot() from anywhere inside the context.
+
+        Yields:
+            The slot's handle, whose busy_seconds() is the time the slot was held excluding
+            time given up with idle_slot(). Used by executors to time tasks.
+        """
+        await self.acquire()
+        handle = _SlotHandle(self)
+        token = _held_slot.set(handle)
+        try:
+            yield handle
+        finally:
+            _held_slot.reset(token)
+            if handle.held:
+                self.release()
+
+@asynccontextmanager
+async def idle_slot() -> AsyncIterator[None]:
+    """
+    Release the slot held by the current task for the duration of the context, and wait
+    for it again when the context exits normally. Does nothing if the task does not hold a slot.
+
+    Example:
+        async with idle_slot():
+            await asyncio.sleep(backoff)
+    """
+    handle = _held_slot.get()
+    if handle is None or not handle.held:
+        yield
+        return
+    handle.held = False
+    handle.idle_since = time.monotonic()
+    handle.limiter.release()
+    # On an exception (e.g. a timeout cancelling the task) the slot stays released and
+    # slot() will not release it again, so the task can unwind without waiting for a slot
+    yield
+    await handle.limiter.acquire(priority=True)
+    handle.held = True
+    handle.idle_seconds += time.monotonic() - handle.idle_since
+    handle.idle_since = None
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    A ConcurrencyLimiter whose limit is tuned with additive-increase/multiplicative-decrease (AIMD).
+
+    Callers report how each task went with record(). The limit grows by `increase` once a full
+    window of tasks (one per slot) completes healthily, stays put while latency is elevated, and
+    is multiplied by `decrease_factor` when a task signals overload, such as a timeout or a
+    429/503 response. At most one cut is made per window so a burst of failures from the same
+    congestion event does not collapse the limit.
+
+    Attributes:
+        min_limit (int): The lowest limit the controller will set.
+        max_limit (int): The highest limit the controller will set.
+        increase (int): The amount added to the limit after a healthy window.
+        decrease_factor (float): The factor applied to the limit on overload.
+        latency_tolerance (float): A task is healthy only if its latency is at most this multiple of the
+            lowest latency observed. None ignores latency.
+    """
+    def __init__(self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: int = 1,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float | None = 3.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit (int): The starting limit.
+            min_limit (int): The lowest limit the controller will set.
+            max_limit (int): The highest limit the controller will set.
+            increase (int): The amount added to the limit after a healthy window.
+            decrease_factor (float): The factor applied to the limit on overload. Must be between 0 and 1.
+            latency_tolerance (float): The allowed multiple of the lowest observed latency. None ignores latency.
+        """
+        assert 0 < min_limit <= initial_limit <= max_limit, "limits must satisfy 0 < min_limit <= initial_limit <= max_limit"
+        assert increase > 0, "increase must be positive"
+        assert 0 < decrease_factor < 1, "decrease_factor must be between 0 and 1"
+        assert latency_tolerance is None or latency_tolerance >= 1, "latency_tolerance must be at least 1"
+        super().__init__(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._min_latency: float | None = None
+        self._healthy_in_window = 0
+        self._since_decrease = initial_limit
+        self._history: List[Tuple[float, int]] = [(time.time(), initial_limit)]
+
+    @property
+    def history(self) -> List[Tuple[float, int]]:
+        """The (unix timestamp, limit) pairs recorded each time the limit changed, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def set_limit(self, limit: int) -> None:
+        assert isinstance(limit, int) and limit > 0, "limit must be a positive integer"
+        with self._lock:
+            self._update_limit(limit)
+
+    def record(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Report the outcome of a task and adjust the limit.
+
+        Args:
+            latency (float): How long the task took in seconds.
+            overloaded (bool): True if the task failed with a sign of overload (timeout, 429, 503).
+        """
+        with self._lock:
+            self._since_decrease += 1
+            if overloaded:
+                self._healthy_in_window = 0
+                # Cut at most once per window of in-flight tasks
+                if self._since_decrease >= self._limit:
+                    self._since_decrease = 0
+                    self._update_limit(max(self.min_limit, int(self._limit * self.decrease_factor)))
+                return
+            if self._min_latency is None or latency < self._min_latency:
+                self._min_latency = latency
+            if self.latency_tolerance is not None and latency > self._min_latency * self.latency_tolerance:
+                # Latency is climbing; hold the limit
+                return
+            self._healthy_in_window += 1
+            if self._healthy_in_window >= self._limit:
+                self._healthy_in_window = 0
+                self._update_limit(min(self.max_limit, self._limit + self.increase))
+
+    def _update_limit(self, limit: int) -> None:
+        # Must be called with self._lock held
+        if limit == self._limit:
+            return
+        self._limit = limit
+        self._history.append((time.time(), limit))
+        self._wake_waiters()
+
+class TokenBucketRateLimiter:
+    """
+    An async token-bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens every `per` seconds.
+    Each request takes a token, waiting for one if the bucket is empty. Waiting requests
+    reserve their tokens in order, so a burst of callers is spread evenly over time instead
+    of retrying in a storm. The limiter is thread-safe and not bound to an event loop, so one
+    instance can be shared by every scraper or analyzer that draws on the same quota.
+
+    Example:
+        # OpenAI tier limit of 500 requests per minute shared by two analyzers
+        limiter = TokenBucketRateLimiter(500, per=60)
+        summary_analyzer.rate_limiter = limiter
+        topic_analyzer.rate_limiter = limiter
+    """
+    def __init__(self, rate: float, per: float = 1.0, burst: float = None):
+        """
+        Initialize the limiter with a full bucket.
+
+        Args:
+            rate (float): The number of requests allowed every `per` seconds.
+            per (float): The length of the rate period in seconds. Defaults to 1 (requests per second).
+            burst (float): The number of requests that can be made at once after a quiet period.
+                Defaults to 1 so requests are evenly spaced.
+        """
+        assert rate > 0, "rate must be positive"
+        assert per > 0, "per must be positive"
+        assert burst is None or burst >= 1, "burst must be at least 1"
+        self._rate = rate / per
+        self._burst = float(burst) if burst is not None else 1.0
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The refill rate in tokens per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """The capacity of the bucket."""
+        return self._burst
+
+    def _refill(self) -> None:
+        # Must be called with self._lock held
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _reserve(self, tokens: float) -> float:
+        # Take the tokens, going into debt if needed, and return how long to wait for them
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self._rate)
+
+    def _refund(self, tokens: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._burst, self._tokens + tokens)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        Wait until the requested tokens are available and take them. A task holding a
+        ConcurrencyLimiter slot gives it up while waiting, and the wait does not count
+        toward the task's timeout in run_multiple().
+
+        Args:
+            tokens (float): The number of tokens to take. Defaults to 1 request.
+        """
+        assert 0 < tokens <= self._burst, "tokens must be positive and at most burst"
+        delay = self._reserve(tokens)
+        if delay <= 0:
+            return
+        try:
+            async with idle_slot():
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Give the reservation back so it does not delay other callers
+            self._refund(tokens)
+            raise
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold off all new requests for at least the given time, e.g. after the server
+        responds with 429 and a Retry-After header.
+
+        Args:
+            seconds (float): How long to pause in seconds.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self._rate)
+
+    def __str__(self):
+        return f"TokenBucketRateLimiter(rate={self._rate}/s, burst={self._burst})"
+
+    def __repr__(self):
+        return str(self)
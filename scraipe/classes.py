@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
 import collections.abc
-from typing import final, Iterable, Dict, Generator, Tuple, List
+from typing import final, Any, Iterable, Dict, Generator, Tuple, List
 import tqdm
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, field_validator, model_validator
 from re import Pattern
 
 @final
@@ -10,7 +10,7 @@ class ScrapeResult(BaseModel):
     
     # Note: It's recommended to use success() and fail() methods to create instances of ScrapeResult.
     link: str
-    content:str|None = None
+    content:str|bytes|None = None
     scrape_success:bool
     scrape_error:str|None = None
     metadata:dict|None = None
@@ -39,6 +39,18 @@ class ScrapeResult(BaseModel):
     def __repr__(self):
         return str(self)
     
+    @field_validator('content', mode='before')
+    @classmethod
+    def _adapt_buffer(cls, content):
+        # Store bytes-like content as bytes, reusing the underlying bytes object when possible
+        if isinstance(content, memoryview):
+            if isinstance(content.obj, bytes) and content.contiguous and content.nbytes == len(content.obj):
+                return content.obj
+            return content.tobytes()
+        if isinstance(content, bytearray):
+            return bytes(content)
+        return content
+    
     @model_validator(mode='after')
     def _validate(self):
         # Ensure content is present if scrape_success is True
@@ -50,12 +62,12 @@ class ScrapeResult(BaseModel):
         return self
     
     @staticmethod
-    def succeed(link: str, content: str, metadata:dict = None) -> 'ScrapeResult':
+    def succeed(link: str, content: str|bytes|memoryview, metadata:dict = None) -> 'ScrapeResult':
         """Creates a ScrapeResult instance for a successful scraping operation.
         
         Args:
             link (str): The URL that was scraped.
-            content (str): The content fetched from the link.
+            content (str|bytes|memoryview): The content fetched from the link. Binary content is stored as bytes.
             metadata (dict): Additional data scraped from the link.
         
         Returns:
@@ -189,6 +201,9 @@ class IScraper(ABC):
         return None
 
 class IAnalyzer(ABC):
+    uses_artifacts: Tuple[str, ...] = ()
+    """The names of the shared preprocessing artifacts (see MultiAnalyzer) that analyze_with_artifacts() can use."""
+    
     @abstractmethod
     def analyze(self, content: str) -> AnalysisResult:
         """Analyzes the provided content to extract structured information.
@@ -201,6 +216,21 @@ class IAnalyzer(ABC):
         """
         raise NotImplementedError()
     
+    def analyze_with_artifacts(self, content: str, artifacts: Dict[str, Any]) -> AnalysisResult:
+        """Analyzes the content, reusing artifacts derived from it by a shared preprocessing stage.
+        
+        The default implementation ignores the artifacts. Analyzers that list artifacts in
+        uses_artifacts override this to skip recomputing them.
+        
+        Args:
+            content (str): The text content to analyze.
+            artifacts (Dict[str, Any]): The available artifacts named in uses_artifacts.
+        
+        Returns:
+            AnalysisResult: The result containing analysis output or error details.
+        """
+        return self.analyze(content)
+    
     def analyze_multiple(self, contents: Dict[str, str]) -> Generator[Tuple[str, AnalysisResult], None, None]:
         """Analyze multiple contents."""
         for link, content in contents.items():
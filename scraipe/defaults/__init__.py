@@ -5,7 +5,7 @@ This package contains default implementations for scrapers and analyzers.
 # Default scrapers
 from scraipe.defaults.text_scraper import TextScraper
 from scraipe.defaults.raw_scraper import RawScraper
-from scraipe.defaults.multi_scraper import MultiScraper, IngressRule
+from scraipe.defaults.multi_scraper import MultiScraper, IngressRule, DomainRuleLearner, CircuitBreaker
 
 # Default analyzers
 from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer
\ No newline at end of file
@@ -0,0 +1,76 @@
+from scraipe.classes import IAnalyzer, AnalysisResult
+from scraipe.defaults.multi_analyzer import MultiAnalyzer
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict
+
+class CascadeAnalyzer(MultiAnalyzer):
+    """
+    A MultiAnalyzer that only runs its analyzers on content that passes a cheap gate.
+
+    The gate analyzer (e.g. TextStatsAnalyzer) runs first, and a predicate on its output
+    decides whether the expensive analyzers (e.g. OpenAiAnalyzer) run at all. Content
+    that passes is analyzed by all analyzers concurrently, like in a MultiAnalyzer, and
+    their outputs are merged with the gate's. Content that does not pass only gets
+    the gate's output. Content that passes fails if all of the analyzers fail.
+
+    The output always includes PASSED_KEY, which is True if the analyzers ran.
+    """
+    PASSED_KEY = "passed_gate"
+
+    def __init__(self, gate: IAnalyzer, predicate: Callable[[Dict[str, Any]], bool], analyzers: list[IAnalyzer],
+                 max_workers: int=10, debug: bool=False, debug_delimiter:str = "; ",
+                 sync_executor: Executor = None, preprocessors: Dict[str, Callable[[str], Any]] = None):
+        """
+        Initialize the CascadeAnalyzer.
+
+        Args:
+            gate (IAnalyzer): The cheap analyzer that runs on all content.
+            predicate (Callable[[Dict[str, Any]], bool]): Receives the gate's output and returns True if
+                the analyzers should run, e.g. lambda stats: stats["word_count"] >= 200.
+            analyzers (list[IAnalyzer]): The expensive analyzers to run on content that passes the gate.
+            max_workers (int): The maximum number of concurrent workers.
+            debug (bool): If True, successful results carry the debug chain in analysis_error.
+            debug_delimiter (str): Delimiter for joining debug log messages.
+            sync_executor (Executor, optional): The pool that runs synchronous analyzers. See MultiAnalyzer.
+            preprocessors (Dict[str, Callable[[str], Any]], optional): Shared artifact preprocessors. See MultiAnalyzer.
+                Artifacts used only by the analyzers are computed only for content that passes the gate.
+        """
+        assert isinstance(gate, IAnalyzer), "gate must extend IAnalyzer."
+        assert callable(predicate), "predicate must be callable."
+        assert len(analyzers) > 0, "No analyzers provided."
+        super().__init__([gate] + list(analyzers), max_workers=max_workers, debug=debug, debug_delimiter=debug_delimiter,
+                         sync_executor=sync_executor, preprocessors=preprocessors)
+        self.gate = gate
+        self.predicate = predicate
+
+    async def async_analyze(self, content):
+        gate_members = [0]
+        artifacts = await self._preprocess(content, members=gate_members)
+        gate_results_with_ids = await self._run_members(content, artifacts, members=gate_members)
+        gate_result = gate_results_with_ids[0][1]
+        if not gate_result.analysis_success:
+            return AnalysisResult.fail(f"Gate {self.gate.__class__.__name__} failed: {gate_result.analysis_error}")
+
+        try:
+            passed = bool(self.predicate(gate_result.output))
+        except Exception as e:
+            return AnalysisResult.fail(f"Gate predicate failed: {e}")
+        if not passed:
+            output = dict(gate_result.output)
+            output[self.PASSED_KEY] = False
+            result = AnalysisResult.succeed(output)
+            if self.debug:
+                result.analysis_error = f"{self.gate.__class__}[SUCCESS]{self.debug_delimiter}Gate not passed"
+            return result
+
+        members = range(1, len(self.analyzers))
+        artifacts = await self._preprocess(content, members=members, artifacts=artifacts)
+        analyzer_results_with_ids = await self._run_members(content, artifacts, members=members)
+        if not any(result.analysis_success for _, result in analyzer_results_with_ids):
+            # The gate's output alone is not a successful analysis of content that passed it
+            debug_chain = [f"{self.analyzers[id].__class__}[FAIL]: {result.analysis_error}"
+                           for id, result in sorted(analyzer_results_with_ids, key=lambda id_result: id_result[0])]
+            return AnalysisResult.fail("All analyzers failed... " + self.debug_delimiter.join(debug_chain))
+        result = self._process_results_with_ids(gate_results_with_ids + analyzer_results_with_ids)
+        result.output[self.PASSED_KEY] = True
+        return result
@@ -0,0 +1,205 @@
+"""Pluggable engines for extracting visible text from HTML documents.
+
+Every engine mirrors the output of BeautifulSoup's `get_text()` with the pure-Python
+`html.parser` backend, which is the reference implementation. Faster engines backed by
+lxml or selectolax are used when those packages are installed.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+from bs4 import BeautifulSoup
+
+# Optional fast backends
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _LexborHTMLParser
+except ImportError:
+    _LexborHTMLParser = None
+
+# Whitespace characters BeautifulSoup collapses in whitespace-only strings
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+# Tags whose text is never rendered
+_HIDDEN_TAGS = ("script", "style", "template")
+# Tags whose whitespace BeautifulSoup preserves
+_PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+
+def clean_text_lines(text: str) -> str:
+    """Normalizes line endings and drops blank lines from extracted text.
+
+    Args:
+        text (str): The raw extracted text.
+
+    Returns:
+        str: The text with only non-blank lines, joined by newlines.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join([line for line in text.split("\n") if line.strip() != ""])
+
+def _collapse_whitespace_string(string: str) -> str:
+    # BeautifulSoup replaces whitespace-only strings with a single newline or space
+    return "\n" if "\n" in string else " "
+
+class IHtmlTextEngine(ABC):
+    """Interface for HTML-to-text extraction engines."""
+    name: str = None
+    """The name used to select the engine."""
+
+    @abstractmethod
+    def get_text(self, html: str) -> str:
+        """Returns the visible text of an HTML document.
+
+        Args:
+            html (str): The HTML document.
+
+        Returns:
+            str: The concatenated text nodes of the document, excluding scripts, styles, templates and comments.
+        """
+        raise NotImplementedError()
+
+    def extract_text(self, html: str) -> str:
+        """Returns the visible text of an HTML document with blank lines removed.
+
+        Args:
+            html (str): The HTML document.
+
+        Returns:
+            str: The cleaned visible text.
+        """
+        return clean_text_lines(self.get_text(html))
+
+class Bs4TextEngine(IHtmlTextEngine):
+    """Reference engine that uses BeautifulSoup with the pure-Python html.parser."""
+    name = "bs4"
+
+    def get_text(self, html: str) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        return soup.get_text()
+
+class LxmlTextEngine(IHtmlTextEngine):
+    """Engine that uses libxml2's HTML parser through lxml."""
+    name = "lxml"
+    _TEXT_XPATH = None
+
+    def __init__(self):
+        if _lxml_etree is None:
+            raise ImportError("lxml is not installed. Install it with `pip install lxml`.")
+        if LxmlTextEngine._TEXT_XPATH is None:
+            hidden = " or ".join(f"ancestor::{tag}" for tag in _HIDDEN_TAGS)
+            LxmlTextEngine._TEXT_XPATH = _lxml_etree.XPath(f"//text()[not({hidden})]")
+
+    @staticmethod
+    def _preserves_whitespace(string) -> bool:
+        element = string.getparent()
+        if string.is_tail:
+            element = element.getparent()
+        while element is not None:
+            if element.tag in _PRESERVE_WHITESPACE_TAGS:
+                return True
+            element = element.getparent()
+        return False
+
+    def _parse(self, html: str):
+        # lxml parsers are not thread-safe, so create one per document
+        parser = _lxml_etree.HTMLParser(huge_tree=True)
+        try:
+            return _lxml_etree.fromstring(html, parser)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be parsed as bytes
+            parser = _lxml_etree.HTMLParser(huge_tree=True, encoding="utf-8")
+            return _lxml_etree.fromstring(html.encode("utf-8"), parser)
+
+    def get_text(self, html: str) -> str:
+        if html.strip() == "":
+            return ""
+        root = self._parse(html)
+        if root is None:
+            return ""
+        strings = []
+        for string in self._TEXT_XPATH(root):
+            if string.strip(_ASCII_SPACES) == "" and not self._preserves_whitespace(string):
+                string = _collapse_whitespace_string(string)
+            strings.append(string)
+        return "".join(strings)
+
+class SelectolaxTextEngine(IHtmlTextEngine):
+    """Engine that uses the lexbor HTML5 parser through selectolax."""
+    name = "selectolax"
+
+    def __init__(self):
+        if _LexborHTMLParser is None:
+            raise ImportError("selectolax is not installed. Install it with `pip install selectolax`.")
+
+    @staticmethod
+    def _preserves_whitespace(node) -> bool:
+        node = node.parent
+        while node is not None:
+            if node.tag in _PRESERVE_WHITESPACE_TAGS:
+                return True
+            node = node.parent
+        return False
+
+    def get_text(self, html: str) -> str:
+        tree = _LexborHTMLParser(html)
+        for node in tree.css(", ".join(_HIDDEN_TAGS)):
+            node.decompose()
+        root = tree.root
+        if root is None:
+            return ""
+        strings = []
+        for node in root.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            string = node.text_content
+            if string.strip(_ASCII_SPACES) == "" and not self._preserves_whitespace(node):
+                string = _collapse_whitespace_string(string)
+            strings.append(string)
+        return "".join(strings)
+
+TEXT_ENGINES: Dict[str, Type[IHtmlTextEngine]] = {
+    Bs4TextEngine.name: Bs4TextEngine,
+    LxmlTextEngine.name: LxmlTextEngine,
+    SelectolaxTextEngine.name: SelectolaxTextEngine,
+}
+"""Registered text engines by name."""
+
+_AUTO_PREFERENCE = [SelectolaxTextEngine.name, LxmlTextEngine.name, Bs4TextEngine.name]
+
+def available_text_engines() -> List[str]:
+    """Returns the names of the text engines whose dependencies are installed, fastest first.
+
+    Returns:
+        List[str]: The available engine names.
+    """
+    available = []
+    for name in _AUTO_PREFERENCE:
+        try:
+            TEXT_ENGINES[name]()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+def get_text_engine(engine: str | IHtmlTextEngine = "auto") -> IHtmlTextEngine:
+    """Resolves a text engine from a name or instance.
+
+    Args:
+        engine (str|IHtmlTextEngine): An engine instance, a registered engine name, or "auto"
+            to select the fastest installed engine.
+
+    Returns:
+        IHtmlTextEngine: The resolved engine.
+
+    Raises:
+        ValueError: If the engine name is not registered.
+        ImportError: If the named engine's dependency is not installed.
+    """
+    if isinstance(engine, IHtmlTextEngine):
+        return engine
+    if engine == "auto":
+        return TEXT_ENGINES[available_text_engines()[0]]()
+    if engine not in TEXT_ENGINES:
+        raise ValueError(f"Unknown text engine: {engine}. Expected one of {['auto'] + list(TEXT_ENGINES)}")
+    return TEXT_ENGINES[engine]()
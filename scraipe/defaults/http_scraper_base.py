@@ -0,0 +1,519 @@
+"""Shared HTTP fetching logic for scrapers built on aiohttp."""
+from scraipe.async_classes import IAsyncScraper
+from scraipe.async_util.limiters import idle_slot
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Tuple
+import aiohttp
+import asyncio
+import codecs
+import random
+import re
+import threading
+import time
+
+# Optional charset detection
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+def supported_content_encodings() -> List[str]:
+    """Returns the transfer encodings that aiohttp can decode in this environment.
+
+    This is the same set aiohttp advertises by default (see
+    `aiohttp.client_reqrep._gen_default_accept_encoding`); only the order differs. Brotli
+    requires the brotli or brotlicffi package and zstd requires backports.zstd (Python < 3.14),
+    which the `fast` extra installs; without them only gzip and deflate are negotiated.
+
+    Returns:
+        List[str]: The supported encodings, most compact first.
+    """
+    encodings = ["gzip", "deflate"]
+    try:
+        from aiohttp import compression_utils
+    except ImportError:
+        return encodings
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        encodings.insert(0, "br")
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        encodings.insert(0, "zstd")
+    return encodings
+
+ACCEPT_ENCODING = ", ".join(supported_content_encodings())
+"""The Accept-Encoding header advertised by HTTP scrapers."""
+
+class HttpFetchError(Exception):
+    """Raised when a page cannot be fetched or is rejected before its body is read.
+
+    Attributes:
+        status (int): The HTTP status code of the response, if one was received.
+        retry_after (float): Seconds the server asked to wait before retrying, if it sent Retry-After.
+    """
+    def __init__(self, message: str, status: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+def parse_retry_after(header: str | None) -> float | None:
+    """Parses a Retry-After header given as delay seconds or an HTTP date.
+
+    Args:
+        header (str): The raw Retry-After header value.
+
+    Returns:
+        float: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not header:
+        return None
+    header = header.strip()
+    if header.isdigit():
+        return float(header)
+    try:
+        when = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    if when is None or when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def parse_content_type(header: str | None) -> Tuple[str | None, str | None]:
+    """Splits a Content-Type header into its mimetype and charset.
+
+    Args:
+        header (str): The raw Content-Type header value.
+
+    Returns:
+        Tuple[str, str]: The lowercase mimetype and the charset parameter. Either may be None.
+    """
+    if not header:
+        return None, None
+    parts = header.split(";")
+    mimetype = parts[0].strip().lower() or None
+    charset = None
+    for param in parts[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip("\"'") or None
+    return mimetype, charset
+
+# Number of leading bytes scanned for a <meta> charset declaration
+_META_SCAN_BYTES = 4096
+# Number of leading bytes given to the charset detector
+_SNIFF_BYTES = 64 * 1024
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+_XML_ENCODING_RE = re.compile(rb"""^\s*<\?xml[^>]+?encoding\s*=\s*["']([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+# UTF-32 BOMs must be checked before the UTF-16 BOMs they start with
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+@lru_cache(maxsize=256)
+def normalize_charset(label: str | None) -> str | None:
+    """Resolves a charset label to a Python codec name.
+
+    Args:
+        label (str): A charset label such as "UTF8" or "latin-1".
+
+    Returns:
+        str: The canonical codec name, or None if the label is unknown.
+    """
+    if not label:
+        return None
+    try:
+        return codecs.lookup(label.strip().lower()).name
+    except LookupError:
+        return None
+
+def decode_body(body: bytes, declared_charset: str | None = None) -> Tuple[str, str]:
+    """Decodes a response body, resolving its charset from the cheapest reliable source.
+
+    The charset is taken from a byte order mark, then the Content-Type header, then a <meta>
+    or XML declaration near the start of the document. Undeclared bodies are decoded as UTF-8
+    when valid and otherwise sniffed with charset_normalizer, if installed.
+
+    Args:
+        body (bytes): The raw response body.
+        declared_charset (str): The charset from the Content-Type header, if any.
+
+    Returns:
+        Tuple[str, str]: The decoded text and the source of the charset
+            ("bom", "header", "meta", "utf-8", "sniff" or "fallback").
+    """
+    for bom, codec in _BOMS:
+        if body.startswith(bom):
+            return body.decode(codec, errors="replace"), "bom"
+    codec = normalize_charset(declared_charset)
+    if codec is not None:
+        return body.decode(codec, errors="replace"), "header"
+    head = body[:_META_SCAN_BYTES]
+    match = _META_CHARSET_RE.search(head) or _XML_ENCODING_RE.search(head)
+    if match is not None:
+        codec = normalize_charset(match.group(1).decode("ascii"))
+        if codec is not None:
+            return body.decode(codec, errors="replace"), "meta"
+    try:
+        return body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if charset_normalizer is not None:
+        best = charset_normalizer.from_bytes(body[:_SNIFF_BYTES]).best()
+        codec = normalize_charset(best.encoding) if best is not None else None
+        if codec is not None:
+            return body.decode(codec, errors="replace"), "sniff"
+    return body.decode("utf-8", errors="replace"), "fallback"
+
+class HttpStats:
+    """Thread-safe counters for the responses read and decoded by an HTTP scraper.
+
+    Attributes:
+        responses (int): Number of response bodies read.
+        body_bytes (int): Total decompressed body bytes read.
+        decodes (int): Number of bodies decoded to text.
+        decode_seconds (float): Total time spent decoding bodies.
+        charset_sources (Dict[str, int]): Number of decodes per charset source.
+        cache_hits (int): Number of fetches served from a shared_fetch_cache() scope.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets all counters to zero."""
+        with self._lock:
+            self.responses = 0
+            self.body_bytes = 0
+            self.decodes = 0
+            self.decode_seconds = 0.0
+            self.charset_sources: Dict[str, int] = {}
+            self.cache_hits = 0
+
+    def record_response(self, size: int) -> None:
+        """Counts a response and the size of its decompressed body in bytes."""
+        with self._lock:
+            self.responses += 1
+            self.body_bytes += size
+
+    def record_cache_hit(self) -> None:
+        """Counts a fetch served from a shared_fetch_cache() scope."""
+        with self._lock:
+            self.cache_hits += 1
+
+    def record_decode(self, seconds: float, source: str) -> None:
+        """Counts a body decode, its duration and where its charset came from."""
+        with self._lock:
+            self.decodes += 1
+            self.decode_seconds += seconds
+            self.charset_sources[source] = self.charset_sources.get(source, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the counters.
+
+        Returns:
+            dict: The current counter values.
+        """
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "body_bytes": self.body_bytes,
+                "decodes": self.decodes,
+                "decode_seconds": self.decode_seconds,
+                "charset_sources": dict(self.charset_sources),
+                "cache_hits": self.cache_hits,
+            }
+
+    def __str__(self):
+        return f"HttpStats({self.snapshot()})"
+
+    def __repr__(self):
+        return str(self)
+
+class FetchResult:
+    """The body and metadata of a successfully fetched page.
+
+    Attributes:
+        url (str): The requested URL.
+        status (int): The HTTP status code.
+        mimetype (str): The mimetype from the Content-Type header, or None if missing.
+        charset (str): The charset from the Content-Type header, or None if missing.
+        body (bytes): The raw (decompressed) response body.
+    """
+    def __init__(self, url: str, status: int, mimetype: str | None, charset: str | None, body: bytes, stats: HttpStats = None):
+        self.url = url
+        self.status = status
+        self.mimetype = mimetype
+        self.charset = charset
+        self.body = body
+        self._stats = stats
+        self._text = None
+
+    def text(self) -> str:
+        """Decodes the body once, resolving its charset with decode_body().
+
+        Returns:
+            str: The decoded body. Undecodable bytes are replaced.
+        """
+        if self._text is None:
+            start = time.perf_counter()
+            self._text, source = decode_body(self.body, self.charset)
+            if self._stats is not None:
+                self._stats.record_decode(time.perf_counter() - start, source)
+        return self._text
+
+# Fetches shared within a shared_fetch_cache() scope, keyed by URL and request headers
+_fetch_cache: ContextVar[dict] = ContextVar("scraipe_fetch_cache", default=None)
+
+@contextmanager
+def shared_fetch_cache() -> Iterator[None]:
+    """Shares HTTP fetches between scrapers for the duration of the context.
+
+    Within the scope, HttpScraperBase.fetch() reuses the body of an earlier fetch of the same URL
+    with the same request headers instead of downloading it again. Each scraper still applies its
+    own content type and size limits to the reused response. Final HTTP errors such as 404 are
+    reused too. The cache is bound to the current task's context, so it is not shared with
+    concurrently running scrapes. Nested scopes share the outermost cache.
+
+    Example:
+        with shared_fetch_cache():
+            result = await news_scraper.async_scrape(url)
+            if not result.scrape_success:
+                # Reuses the page downloaded by news_scraper
+                result = await text_scraper.async_scrape(url)
+    """
+    if _fetch_cache.get() is not None:
+        yield
+        return
+    token = _fetch_cache.set({})
+    try:
+        yield
+    finally:
+        _fetch_cache.reset(token)
+
+class HttpScraperBase(IAsyncScraper):
+    """Base class for scrapers that fetch pages over HTTP with aiohttp.
+
+    Response bodies are streamed and the download is aborted as soon as it exceeds max_bytes.
+    Responses whose Content-Type or Content-Length headers are not acceptable are rejected
+    before the body is read. Compressed transfer encodings are advertised and bodies are decoded
+    with decode_body().
+
+    Transient failures (RETRY_STATUSES and connection errors) are retried up to max_retries times
+    with capped exponential backoff and full jitter. A Retry-After header overrides the backoff,
+    and the request gives up if the server asks to wait longer than RETRY_BACKOFF_MAX or the
+    total wait would exceed RETRY_BUDGET. While
+    backing off, the task gives up its concurrency slot so other links can be scraped.
+
+    If rate_limiter is set, every request attempt, including retries, takes a token from it,
+    and a 429 response with Retry-After pauses the limiter for every scraper sharing it.
+
+    Attributes:
+        DEFAULT_USER_AGENT (str): Default User-Agent string for HTTP requests.
+        DEFAULT_MAX_BYTES (int): Default cap on the size of a response body.
+        headers (dict): HTTP headers used in the requests.
+        max_bytes (int): The maximum number of body bytes to read. None disables the cap.
+        allowed_content_types (List[str]): Glob patterns of accepted mimetypes (e.g. "text/*"). None accepts any.
+        max_retries (int): The number of times a request is retried after a transient error.
+        stats (HttpStats): Response size and decode time counters.
+    """
+    DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+    DEFAULT_MAX_RETRIES = 2
+    RETRY_STATUSES = frozenset((429, 502, 503, 504))
+    RETRY_BACKOFF_BASE = 0.5
+    """The backoff ceiling in seconds before the first retry. It doubles with each retry."""
+    RETRY_BACKOFF_MAX = 3.0
+    """The longest wait in seconds before a retry, including waits requested with Retry-After."""
+    RETRY_BUDGET = 4.0
+    """The most time in seconds spent waiting across all retries of a request. Kept well below the
+    executor's per-task timeout so a request that backs off still returns a result."""
+    throttles_requests = True
+    headers: dict = {"User-Agent": DEFAULT_USER_AGENT}
+    """Headers to be used in the HTTP requests. Defaults to a standard User-Agent header."""
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    allowed_content_types: List[str] | None = None
+    max_retries: int = DEFAULT_MAX_RETRIES
+
+    def __init__(self,
+        headers: dict = None,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        allowed_content_types: Sequence[str] | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Initializes the scraper's HTTP settings.
+
+        Args:
+            headers (dict, optional): Custom headers for HTTP requests. Defaults to the class-defined headers.
+            max_bytes (int, optional): The maximum response body size in bytes. None disables the cap.
+            allowed_content_types (Sequence[str], optional): Glob patterns of accepted mimetypes, such as
+                "text/html" or "text/*". Responses without a Content-Type header are always accepted.
+                None accepts any content type.
+            max_retries (int, optional): The number of retries after a transient error. 0 disables retries.
+        """
+        super().__init__()
+        assert max_bytes is None or (isinstance(max_bytes, int) and max_bytes > 0), "max_bytes must be a positive integer or None"
+        assert isinstance(max_retries, int) and max_retries >= 0, "max_retries must be a non-negative integer"
+        self.max_retries = max_retries
+        self.headers = headers or type(self).headers
+        self.max_bytes = max_bytes
+        self.allowed_content_types = None if allowed_content_types is None else [pattern.lower() for pattern in allowed_content_types]
+        self.stats = HttpStats()
+
+    def get_request_headers(self) -> dict:
+        """Returns the headers sent with each request, advertising compressed encodings unless overridden.
+
+        Returns:
+            dict: The request headers.
+        """
+        if any(key.lower() == "accept-encoding" for key in self.headers):
+            return self.headers
+        return {**self.headers, "Accept-Encoding": ACCEPT_ENCODING}
+
+    def is_content_type_allowed(self, mimetype: str | None) -> bool:
+        """Checks a mimetype against allowed_content_types.
+
+        Args:
+            mimetype (str): The mimetype to check. None means the server did not declare one.
+
+        Returns:
+            bool: True if the content type is accepted.
+        """
+        if self.allowed_content_types is None or mimetype is None:
+            return True
+        return any(fnmatchcase(mimetype, pattern) for pattern in self.allowed_content_types)
+
+    def _check_headers(self, url: str, response: aiohttp.ClientResponse, mimetype: str | None) -> None:
+        if not self.is_content_type_allowed(mimetype):
+            raise HttpFetchError(f"Failed to scrape {url}. Content type {mimetype} is not allowed.", status=response.status)
+        content_length = response.headers.get("Content-Length")
+        if self.max_bytes is not None and content_length is not None:
+            try:
+                length = int(content_length)
+            except ValueError:
+                return
+            if length > self.max_bytes:
+                raise HttpFetchError(f"Failed to scrape {url}. Content length {length} exceeds {self.max_bytes} bytes.", status=response.status)
+
+    async def _read_body(self, url: str, response: aiohttp.ClientResponse) -> bytes:
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+            size += len(chunk)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Drop the connection instead of draining the rest of the body
+                response.close()
+                raise HttpFetchError(f"Failed to scrape {url}. Response body exceeds {self.max_bytes} bytes.", status=response.status)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def get_retry_delay(self, attempt: int, retry_after: float | None = None, waited: float = 0.0) -> float | None:
+        """Returns how long to wait before retrying a request.
+
+        Args:
+            attempt (int): The number of failed attempts so far, starting at 1.
+            retry_after (float, optional): The delay requested by the server with Retry-After.
+            waited (float, optional): The time already spent waiting on earlier retries of the request.
+
+        Returns:
+            float: The delay in seconds, or None if the request should not be retried.
+        """
+        remaining = self.RETRY_BUDGET - waited
+        if attempt > self.max_retries or remaining <= 0:
+            return None
+        if retry_after is not None:
+            if retry_after > min(self.RETRY_BACKOFF_MAX, remaining):
+                return None
+            # A little jitter keeps clients told the same Retry-After from returning in lockstep
+            return min(remaining, retry_after + random.uniform(0, self.RETRY_BACKOFF_BASE))
+        ceiling = min(self.RETRY_BACKOFF_MAX, remaining, self.RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    async def _fetch_once(self, url: str) -> FetchResult:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        async with aiohttp.ClientSession(headers=self.get_request_headers()) as session:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    retry_after = None
+                    if response.status in self.RETRY_STATUSES:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status == 429 and retry_after is not None and self.rate_limiter is not None:
+                            # The quota is shared, so hold off every request drawing on it
+                            self.rate_limiter.pause(retry_after)
+                    raise HttpFetchError(f"Failed to scrape {url}. Status code: {response.status}", status=response.status, retry_after=retry_after)
+                mimetype, charset = parse_content_type(response.headers.get("Content-Type"))
+                self._check_headers(url, response, mimetype)
+                body = await self._read_body(url, response)
+                self.stats.record_response(len(body))
+                return FetchResult(url, response.status, mimetype, charset, body, stats=self.stats)
+
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetches a page, streaming its body up to max_bytes and retrying transient errors.
+
+        Within a shared_fetch_cache() scope, an earlier fetch of the same URL is reused.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            FetchResult: The fetched body and its metadata.
+
+        Raises:
+            HttpFetchError: If the status is not 200 after all retries, the content type is not allowed, or the body is too large.
+        """
+        cache = _fetch_cache.get()
+        if cache is None:
+            return await self._fetch_with_retries(url)
+        key = (url, tuple(sorted(self.get_request_headers().items())))
+        cached = cache.get(key)
+        if cached is not None:
+            self.stats.record_cache_hit()
+            return self._reuse_fetch(url, cached)
+        try:
+            page = await self._fetch_with_retries(url)
+        except HttpFetchError as e:
+            if e.status is not None and e.status != 200:
+                # The server's answer does not depend on this scraper's limits
+                cache[key] = e
+            raise
+        cache[key] = page
+        return page
+
+    def _reuse_fetch(self, url: str, cached: FetchResult | HttpFetchError) -> FetchResult:
+        if isinstance(cached, HttpFetchError):
+            raise HttpFetchError(str(cached), status=cached.status, retry_after=cached.retry_after)
+        if not self.is_content_type_allowed(cached.mimetype):
+            raise HttpFetchError(f"Failed to scrape {url}. Content type {cached.mimetype} is not allowed.", status=cached.status)
+        if self.max_bytes is not None and len(cached.body) > self.max_bytes:
+            raise HttpFetchError(f"Failed to scrape {url}. Response body exceeds {self.max_bytes} bytes.", status=cached.status)
+        return cached
+
+    async def _fetch_with_retries(self, url: str) -> FetchResult:
+        attempt = 0
+        waited = 0.0
+        while True:
+            try:
+                return await self._fetch_once(url)
+            except HttpFetchError as e:
+                if e.status not in self.RETRY_STATUSES:
+                    raise
+                attempt += 1
+                delay = self.get_retry_delay(attempt, e.retry_after, waited)
+                if delay is None:
+                    raise
+            except aiohttp.ClientConnectionError:
+                attempt += 1
+                delay = self.get_retry_delay(attempt, waited=waited)
+                if delay is None:
+                    raise
+            waited += delay
+            # Free the concurrency slot while waiting so other requests can run
+            async with idle_slot():
+                await asyncio.sleep(delay)
@@ -1,27 +1,79 @@
 from scraipe.async_classes import IAsyncAnalyzer
 from scraipe.classes import IAnalyzer, AnalysisResult
 from scraipe.async_util import AsyncManager
+from scraipe.defaults.text_stats_analyzer import count_text, find_words, split_sentences
 from asyncio import Future
-from typing import List, Tuple
+from concurrent.futures import Executor
+from typing import Any, Callable, Collection, Dict, List, Tuple
 import asyncio
+import logging
+
+DEFAULT_PREPROCESSORS: Dict[str, Callable[[str], Any]] = {
+    "text_counts": count_text,
+    "words": find_words,
+    "sentences": split_sentences,
+}
+"""The preprocessors every MultiAnalyzer has, keyed by artifact name."""
+
+def _run_preprocessors(preprocessors: Dict[str, Callable[[str], Any]], content) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    # Runs in the sync executor, possibly in another process, so it receives only the
+    # preprocessors to run instead of the MultiAnalyzer. Returns the artifacts and the
+    # error of each preprocessor that raised.
+    artifacts, errors = {}, {}
+    for name, preprocessor in preprocessors.items():
+        try:
+            artifacts[name] = preprocessor(content)
+        except Exception as e:
+            errors[name] = str(e)
+    return artifacts, errors
 
 class MultiAnalyzer(IAsyncAnalyzer):
     """
     MultiAnalyzer is a class that allows for the parallel execution of multiple analyzers.
     It can take IAnalyzer and IAsyncAnalyzer instances and can be used to run multiple
     analyzers concurrently.
+    Synchronous analyzers run in a worker pool, so they overlap with each other and with
+    the async analyzers, and the event loop stays responsive.
+
+    Preprocessors compute artifacts derived from the content, such as its word list, once per
+    document. Each member that names an artifact in its uses_artifacts receives it through
+    analyze_with_artifacts() instead of deriving it again.
     """
 
-    def __init__(self, analyzers: list[IAnalyzer], max_workers: int=10, debug: bool=False, debug_delimiter:str = "; "):
+    def __init__(self, analyzers: list[IAnalyzer], max_workers: int=10, debug: bool=False, debug_delimiter:str = "; ",
+                 sync_executor: Executor = None, preprocessors: Dict[str, Callable[[str], Any]] = None):
+        """
+        Initialize the MultiAnalyzer.
+
+        Args:
+            analyzers (list[IAnalyzer]): The analyzers to run on each content.
+            max_workers (int): The maximum number of concurrent workers.
+            debug (bool): If True, successful results carry the debug chain in analysis_error.
+            debug_delimiter (str): Delimiter for joining debug log messages.
+            sync_executor (Executor, optional): The pool that runs synchronous (non-async) analyzers and
+                the preprocessors. Defaults to None, which uses the event loop's default thread pool.
+                A ProcessPoolExecutor can be used for CPU-bound analyzers if they and the preprocessors
+                are picklable, e.g. module-level functions rather than lambdas.
+            preprocessors (Dict[str, Callable[[str], Any]], optional): Functions that derive shared artifacts
+                from the content, keyed by artifact name. They are added to DEFAULT_PREPROCESSORS and
+                override defaults of the same name. An artifact is only computed if a member uses it.
+                A preprocessor that raises is logged and its artifact omitted, so its consumers derive
+                it themselves. Defaults to None.
+        """
         assert len(analyzers) > 0, "No analyzers provided."
         assert all(isinstance(analyzer, (IAnalyzer)) for analyzer in analyzers), \
             "All analyzers must extend IAnalyzer."
         assert isinstance(max_workers, int) and max_workers > 0, "max_workers must be a positive integer."
+        assert sync_executor is None or isinstance(sync_executor, Executor), "sync_executor must be a concurrent.futures.Executor"
             
         self.max_workers = max_workers
         self.debug = debug
         self.debug_delimiter = debug_delimiter
         self.analyzers = analyzers
+        self.sync_executor = sync_executor
+        assert preprocessors is None or all(callable(preprocessor) for preprocessor in preprocessors.values()), \
+            "preprocessors must map artifact names to callables."
+        self.preprocessors = {**DEFAULT_PREPROCESSORS, **(preprocessors or {})}
 
         # Split analyzers into async and sync and store ids
         self.sync_analyzers: List[Tuple[int, IAnalyzer]] = []
@@ -32,13 +84,35 @@ class MultiAnalyzer(IAsyncAnalyzer):
             else:
                 self.sync_analyzers.append(id_analyzer)
                 
-    async def run_async_analyze(self, id: int, analyzer: IAsyncAnalyzer, content) -> Tuple[int, AnalysisResult]:
-        return id, await analyzer.async_analyze(content)    
+    async def run_async_analyze(self, id: int, analyzer: IAsyncAnalyzer, content, artifacts: Dict[str, Any] = None) -> Tuple[int, AnalysisResult]:
+        return id, await analyzer.dispatch_analyze(content, artifacts)    
     
-    async def _submit_async_analyzers(self, content) -> List[Future]:
-        # Submit all async analyzer tasks for parallel execution
-
-        tasks = [self.run_async_analyze(id, analyzer, content) for id, analyzer in self.async_analyzers]
+    async def _preprocess(self, content, members: Collection[int] = None, artifacts: Dict[str, Any] = None) -> Dict[str, Any]:
+        # Compute the artifacts that at least one of the members (all analyzers by default) uses
+        # and that are not known yet, once per document in the worker pool
+        artifacts = dict(artifacts) if artifacts else {}
+        needed = {name: self.preprocessors[name] for id, analyzer in enumerate(self.analyzers) if members is None or id in members
+                  for name in analyzer.uses_artifacts if name in self.preprocessors and name not in artifacts}
+        if not needed:
+            return artifacts
+        loop = asyncio.get_running_loop()
+        computed, errors = await loop.run_in_executor(self.sync_executor, _run_preprocessors, needed, content)
+        for name, error in errors.items():
+            logging.warning(f"Preprocessor for artifact '{name}' failed: {error}")
+        artifacts.update(computed)
+        return artifacts
+    
+    @staticmethod
+    def _artifacts_for(analyzer: IAnalyzer, artifacts: Dict[str, Any]) -> Dict[str, Any] | None:
+        # The artifacts an analyzer uses, or None when none are available
+        used = {name: artifacts[name] for name in analyzer.uses_artifacts if name in artifacts}
+        return used or None
+    
+    async def _submit_async_analyzers(self, content, artifacts: Dict[str, Any] = None, members: Collection[int] = None) -> List[Future]:
+        # Submit all async analyzer tasks (or those of the members) for parallel execution
+        artifacts = artifacts or {}
+        tasks = [self.run_async_analyze(id, analyzer, content, self._artifacts_for(analyzer, artifacts))
+                 for id, analyzer in self.async_analyzers if members is None or id in members]
         
         futures = []
         # Submit tasks to the executor
@@ -47,13 +121,20 @@ class MultiAnalyzer(IAsyncAnalyzer):
             futures.append(future)        
         return futures
         
-    def _run_sync_analyzers(self, content) -> List[Tuple[int, AnalysisResult]]:
-        # Run all sync analyzers in serial
-        results_with_ids: List[Tuple[int, AnalysisResult]] = []
-        for id, analyzer in self.sync_analyzers:
-            result = analyzer.analyze(content)
-            results_with_ids.append((id, result))
-        return results_with_ids
+    async def _run_sync_analyzers(self, content, artifacts: Dict[str, Any] = None, members: Collection[int] = None) -> List[Tuple[int, AnalysisResult]]:
+        # Run all sync analyzers (or those of the members) concurrently in the worker pool
+        loop = asyncio.get_running_loop()
+        artifacts = artifacts or {}
+        sync_analyzers = [(id, analyzer) for id, analyzer in self.sync_analyzers if members is None or id in members]
+        calls = []
+        for _, analyzer in sync_analyzers:
+            used = self._artifacts_for(analyzer, artifacts)
+            if used is None:
+                calls.append(loop.run_in_executor(self.sync_executor, analyzer.analyze, content))
+            else:
+                calls.append(loop.run_in_executor(self.sync_executor, analyzer.analyze_with_artifacts, content, used))
+        results = await asyncio.gather(*calls)
+        return [(id, result) for (id, _), result in zip(sync_analyzers, results)]
     
     def _process_results_with_ids(self, results_with_ids: List[Tuple[int, AnalysisResult]]) -> AnalysisResult:
         # Create an output dict and populate it with results' outputs
@@ -102,16 +183,21 @@ class MultiAnalyzer(IAsyncAnalyzer):
             debug_message = "All analyzers failed... " + self.debug_delimiter.join(debug_chain)
             return AnalysisResult.fail(debug_message)
 
-    async def async_analyze(self, content):
-        futures = await self._submit_async_analyzers(content)
-        # Run sync analyzers in serial
-        sync_results_with_ids = self._run_sync_analyzers(content)
+    async def _run_members(self, content, artifacts: Dict[str, Any], members: Collection[int] = None) -> List[Tuple[int, AnalysisResult]]:
+        # Run the members (all analyzers by default) concurrently and collect their results with ids
+        futures = await self._submit_async_analyzers(content, artifacts, members)
         # Wrap futures
         futures = [asyncio.wrap_future(future) for future in futures]
+        # Run sync analyzers in the pool while the async analyzers run
+        sync_results_with_ids = await self._run_sync_analyzers(content, artifacts, members)
         # Wait for all async results
         async_results_with_ids = [await completed for completed in asyncio.as_completed(futures)]
         # Combine sync and async results
-        results_with_ids = sync_results_with_ids + async_results_with_ids
+        return sync_results_with_ids + async_results_with_ids
+
+    async def async_analyze(self, content):
+        artifacts = await self._preprocess(content)
+        results_with_ids = await self._run_members(content, artifacts)
         # Process results with ids using instance method
         return self._process_results_with_ids(results_with_ids)
 
@@ -1,11 +1,24 @@
 from scraipe.classes import IScraper, ScrapeResult
 from scraipe.async_classes import IAsyncScraper
 from scraipe.async_util import AsyncManager
-from concurrent.futures import Future
+from scraipe.defaults.http_scraper_base import shared_fetch_cache
+from concurrent.futures import Future, Executor
 
-from typing import List, cast, final, Tuple
+from collections import deque, OrderedDict
+from functools import lru_cache
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Deque, FrozenSet, List, cast, final, Tuple
 import re
 from pydantic import BaseModel
+try:
+    from re import _parser as _sre_parse
+    from re._constants import LITERAL as _LITERAL
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+    from sre_constants import LITERAL as _LITERAL
+
 
 @final
 class IngressRule():
@@ -15,20 +28,31 @@ class IngressRule():
     Attributes:
         match (re.Pattern): A compiled regular expression used to match URLs.
         scraper (IScraper): An instance of a scraper to be used when the URL matches.
+        match_host (bool): Whether the pattern is matched against the URL's host instead of the whole URL.
+        timeout (float): The seconds the scraper may take before MultiScraper moves on, or None.
     """
     pattern: str|re.Pattern
     scraper: IScraper
     exclusive: bool = False
+    match_host: bool = False
+    timeout: float = None
     def __init__(self,
                  pattern: str | re.Pattern,
                  scraper: IScraper,
-                 exclusive: bool = False):
+                 exclusive: bool = False,
+                 match_host: bool = False,
+                 timeout: float = None):
         """
         Initialize the IngressRule with a match string and a scraper.
         Args:
             match (str|re.Pattern): The regex pattern to match against URLs.
             scraper (IScraper): The scraper to use for this match.
             exclusive (bool): If True, this rule is exclusive and no other rules will be processed if it matches.
+            match_host (bool): If True, the pattern is matched against the lowercase host of the URL
+                (e.g. r"(^|[.])reddit[.]com$") instead of the whole URL. MultiScraper caches routing
+                decisions for these rules per host.
+            timeout (float): The seconds the scraper may take for a link before it is cut off and the
+                next matching rule runs. Defaults to None, which only limits it by MultiScraper's link_timeout.
         """
         if isinstance(pattern, str):
             try:
@@ -43,8 +67,11 @@ class IngressRule():
         self.scraper = scraper
         
         self.exclusive = exclusive
+        self.match_host = match_host
+        assert timeout is None or (isinstance(timeout, (int, float)) and timeout > 0), "timeout must be None or a positive number"
+        self.timeout = timeout
     def __str__(self):
-        return f"IngressRule(match={self.pattern}, scraper={self.scraper})"
+        return f"IngressRule(match={self.pattern}, scraper={self.scraper}, match_host={self.match_host})"
     def __repr__(self):
         return self.__str__()
     @staticmethod
@@ -64,6 +91,394 @@ class IngressRule():
             match = r".*"
         return IngressRule(match, scraper, exclusive=exclusive)
 
+# Patterns that match every URL
+_CATCH_ALL_PATTERNS = frozenset(["", ".*", "^.*", ".*$", "^.*$"])
+
+def _required_literal(pattern: re.Pattern) -> str | None:
+    # Returns the longest run of literal characters that every match of the pattern contains
+    if not isinstance(pattern.pattern, str) or pattern.flags & re.LOCALE:
+        return None
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    best, run = "", []
+    for op, value in list(parsed) + [(None, None)]:
+        if op is _LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    if not best:
+        return None
+    if pattern.flags & re.IGNORECASE:
+        if not best.isascii():
+            return None
+        best = best.lower()
+    return best
+
+def _reachable(rules: List[IngressRule]) -> List[IngressRule]:
+    # Drops the rules after the first exclusive rule, which never run
+    for position, rule in enumerate(rules):
+        if rule.exclusive:
+            return rules[:position + 1]
+    return rules
+
+def _extract_host(url: str) -> str:
+    # Returns the lowercase host of a URL, with or without a scheme
+    start = url.find("://")
+    start = 0 if start == -1 else start + 3
+    end = len(url)
+    for delimiter in "/?#":
+        position = url.find(delimiter, start, end)
+        if position != -1:
+            end = position
+    host = url[start:end].rpartition("@")[2]
+    if host.startswith("["):
+        # IPv6 literal
+        host = host[:host.find("]") + 1]
+    else:
+        host = host.partition(":")[0]
+    return host.lower()
+
+@final
+class IngressRouter():
+    """
+    Finds the rules that match a URL with as little regex work as possible.
+
+    Catch-all rules such as ".*" are not evaluated at all. For every other rule, the longest
+    literal that any match must contain (e.g. "/wiki/" in r"^https?://[a-z.]+/wiki/")
+    is extracted when the router is compiled, and the rule's regex only runs on URLs that
+    contain it. The result is identical to filtering the rules with re.search.
+
+    Rules with match_host=True depend only on the URL's host, so their matches are kept in an
+    LRU cache keyed by host. When every rule is a host rule or a catch-all, routing a URL
+    from a known host is a single cache lookup.
+    """
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, rules: List[IngressRule], cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Compile the router.
+
+        Args:
+            rules (List[IngressRule]): The rules to route between, in priority order.
+            cache_size (int): The number of hosts whose matches are cached. 0 disables the cache.
+        """
+        assert isinstance(cache_size, int) and cache_size >= 0, "cache_size must be a non-negative integer"
+        self.rules = tuple(rules)
+        self._catch_all_only = True
+        self._has_host_rules = False
+        self._has_url_rules = False
+        # (rule, search, literal, ignore_case) per rule; search is None for catch-all rules
+        self._checks: List[Tuple[IngressRule, Callable | None, str | None, bool]] = []
+        for rule in self.rules:
+            pattern = rule.pattern
+            if isinstance(pattern.pattern, str) and pattern.pattern in _CATCH_ALL_PATTERNS:
+                self._checks.append((rule, None, None, False))
+                continue
+            self._catch_all_only = False
+            if rule.match_host:
+                self._has_host_rules = True
+            else:
+                self._has_url_rules = True
+            literal = _required_literal(pattern)
+            self._checks.append((rule, pattern.search, literal, bool(pattern.flags & re.IGNORECASE)))
+        self._match_host = lru_cache(maxsize=cache_size)(self._match_host_uncached)
+
+    def cache_info(self):
+        """
+        Report the host cache statistics.
+
+        Returns:
+            functools._CacheInfo: The hits, misses, maximum size and current size of the host cache.
+        """
+        return self._match_host.cache_info()
+
+    def _match_host_uncached(self, host: str) -> Tuple[FrozenSet[IngressRule], Tuple[IngressRule, ...]]:
+        # Returns the host rules matching the host, and the route when there are no URL rules
+        matched = frozenset(
+            rule for rule, search, literal, ignore_case in self._checks
+            if search is not None and rule.match_host and self._matches(host, search, literal, ignore_case))
+        route = tuple(rule for rule, search, _, _ in self._checks if search is None or rule in matched)
+        return matched, route
+
+    @staticmethod
+    def _matches(text: str, search: Callable, literal: str | None, ignore_case: bool) -> bool:
+        # Runs the literal prefilter and then the regex
+        if literal is not None:
+            if ignore_case:
+                # Non-ASCII text can fold differently under re.IGNORECASE, so skip the prefilter
+                if text.isascii() and literal not in text.lower():
+                    return False
+            elif literal not in text:
+                return False
+        return search(text) is not None
+
+    def route(self, url: str) -> List[IngressRule]:
+        """
+        Find the rules whose pattern matches the URL.
+
+        Args:
+            url (str): The URL to route.
+
+        Returns:
+            List[IngressRule]: The matching rules in priority order.
+        """
+        if self._catch_all_only:
+            return list(self.rules)
+        host_indices = frozenset()
+        if self._has_host_rules:
+            host_indices, route = self._match_host(_extract_host(url))
+            if not self._has_url_rules:
+                return list(route)
+        lowered = None
+        matched = []
+        for rule, search, literal, ignore_case in self._checks:
+            if search is None:
+                matched.append(rule)
+                continue
+            if rule.match_host:
+                if rule in host_indices:
+                    matched.append(rule)
+                continue
+            # Inlined literal prefilter; see _matches()
+            if literal is not None:
+                if ignore_case:
+                    if lowered is None:
+                        lowered = url.lower() if url.isascii() else False
+                    if lowered is not False and literal not in lowered:
+                        continue
+                elif literal not in url:
+                    continue
+            if search(url):
+                matched.append(rule)
+        return matched
+
+@final
+class CircuitBreaker():
+    """
+    Stops sending links to a scraper that keeps failing.
+
+    The breaker is closed while the scraper works. After failure_threshold consecutive failures
+    it opens, and every attempt is refused without running the scraper. Once cooldown seconds
+    have passed it is half-open: a single probe is let through, which closes the breaker if it
+    succeeds and reopens it for another cooldown if it fails.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            failure_threshold (int): The consecutive failures that open the breaker.
+            cooldown (float): The seconds the breaker stays open before a probe is allowed.
+        """
+        assert isinstance(failure_threshold, int) and failure_threshold >= 1, "failure_threshold must be a positive integer"
+        assert isinstance(cooldown, (int, float)) and cooldown >= 0, "cooldown must be a non-negative number"
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The current state: CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if self._probing or time.monotonic() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self.OPEN
+
+    def allow(self) -> bool:
+        """
+        Check whether an attempt may run. A half-open breaker admits one probe at a time.
+
+        Returns:
+            bool: True if the scraper should run; the caller must then report the outcome.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful attempt, closing the breaker."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed attempt, opening the breaker after enough consecutive failures."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """Report that an allowed attempt ended without an outcome, e.g. because it was cancelled."""
+        with self._lock:
+            self._probing = False
+
+@final
+class DomainRuleLearner():
+    """
+    Learns which ingress rules work for each domain, so MultiScraper tries them first.
+
+    The learner keeps the recent outcomes of every rule per host. A rule whose success
+    rate on a host falls below demote_below is moved behind the rules that still work there,
+    so the first attempt is usually the one that succeeds. Rules that keep working stay in
+    their configured priority order. If skip_below is set, rules at or below that rate are
+    not attempted at all, except for one probe every probe_every links so they can recover.
+    A probe runs in the rule's configured position.
+
+    Rules after the first matching exclusive rule never run, and the exclusive rule itself is
+    never moved, so learning does not change which rules a link may reach.
+    """
+    def __init__(self,
+                 min_attempts: int = 5,
+                 window: int = 50,
+                 demote_below: float = 0.5,
+                 skip_below: float = None,
+                 probe_every: int = 20,
+                 max_hosts: int = 4096):
+        """
+        Initialize the learner.
+
+        Args:
+            min_attempts (int): The outcomes a rule needs on a host before it can be reordered or skipped.
+            window (int): The number of recent outcomes kept per rule and host.
+            demote_below (float): Rules with a lower success rate on a host are tried after the others.
+            skip_below (float, optional): Rules with this success rate or lower on a host are skipped.
+                Defaults to None, which never skips rules.
+            probe_every (int): A skipped rule is still attempted once every this many links from its host.
+            max_hosts (int): The number of hosts whose statistics are kept; the least recent are dropped.
+        """
+        assert isinstance(min_attempts, int) and min_attempts >= 1, "min_attempts must be a positive integer"
+        assert isinstance(window, int) and window >= min_attempts, "window must be an integer of at least min_attempts"
+        assert 0 <= demote_below <= 1, "demote_below must be between 0 and 1"
+        assert skip_below is None or 0 <= skip_below <= 1, "skip_below must be None or between 0 and 1"
+        assert isinstance(probe_every, int) and probe_every >= 1, "probe_every must be a positive integer"
+        assert isinstance(max_hosts, int) and max_hosts >= 1, "max_hosts must be a positive integer"
+        self.min_attempts = min_attempts
+        self.window = window
+        self.demote_below = demote_below
+        self.skip_below = skip_below
+        self.probe_every = probe_every
+        self.max_hosts = max_hosts
+        # host -> rule -> recent outcomes
+        self._outcomes: "OrderedDict[str, Dict[IngressRule, Deque[bool]]]" = OrderedDict()
+        # (host, rule) -> links skipped since the last probe
+        self._skipped: Dict[Tuple[str, IngressRule], int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, rule: IngressRule, success: bool) -> None:
+        """
+        Record whether a rule's scraper succeeded for a link from a host.
+
+        Args:
+            host (str): The lowercase host of the link.
+            rule (IngressRule): The rule that ran.
+            success (bool): Whether its scraper succeeded.
+        """
+        with self._lock:
+            rules = self._outcomes.get(host)
+            if rules is None:
+                rules = self._outcomes[host] = {}
+                if len(self._outcomes) > self.max_hosts:
+                    evicted, _ = self._outcomes.popitem(last=False)
+                    self._skipped = {key: count for key, count in self._skipped.items() if key[0] != evicted}
+            else:
+                self._outcomes.move_to_end(host)
+            outcomes = rules.get(rule)
+            if outcomes is None:
+                outcomes = rules[rule] = deque(maxlen=self.window)
+            outcomes.append(bool(success))
+
+    def success_rate(self, host: str, rule: IngressRule) -> float | None:
+        """
+        Get a rule's recent success rate on a host.
+
+        Args:
+            host (str): The lowercase host.
+            rule (IngressRule): The rule.
+
+        Returns:
+            float|None: The success rate, or None if the rule has fewer than min_attempts outcomes there.
+        """
+        with self._lock:
+            return self._success_rate(host, rule)
+
+    def _success_rate(self, host: str, rule: IngressRule) -> float | None:
+        rules = self._outcomes.get(host)
+        outcomes = rules.get(rule) if rules is not None else None
+        if outcomes is None or len(outcomes) < self.min_attempts:
+            return None
+        return sum(outcomes) / len(outcomes)
+
+    def order(self, host: str, rules: List[IngressRule]) -> List[IngressRule]:
+        """
+        Order the rules matching a link by how well they work on its host.
+
+        Args:
+            host (str): The lowercase host of the link.
+            rules (List[IngressRule]): The matching rules in configured priority order.
+
+        Returns:
+            List[IngressRule]: The rules to attempt, in order.
+        """
+        tail = []
+        for position, rule in enumerate(rules):
+            if rule.exclusive:
+                rules, tail = rules[:position], [rule]
+                break
+        with self._lock:
+            if host not in self._outcomes:
+                return rules + tail
+            working, demoted = [], []
+            for rule in rules:
+                rate = self._success_rate(host, rule)
+                if rate is None or rate >= self.demote_below:
+                    working.append(rule)
+                elif self.skip_below is None or rate > self.skip_below:
+                    demoted.append((rate, rule))
+                elif self._probe(host, rule):
+                    # Probes run in the configured position, where they get a real chance to succeed
+                    working.append(rule)
+            # Keep at least one rule so the link is not dropped without an attempt
+            if not working and not demoted and not tail and rules:
+                return rules
+        demoted.sort(key=lambda item: -item[0])
+        return working + [rule for _, rule in demoted] + tail
+
+    def _probe(self, host: str, rule: IngressRule) -> bool:
+        # Counts a skip and returns True when the rule is due for a probe
+        key = (host, rule)
+        skipped = self._skipped.get(key, 0) + 1
+        if skipped >= self.probe_every:
+            self._skipped.pop(key, None)
+            return True
+        self._skipped[key] = skipped
+        return False
+
+    def reset(self) -> None:
+        """Forget all recorded outcomes."""
+        with self._lock:
+            self._outcomes.clear()
+            self._skipped.clear()
+
 class MultiScraper(IAsyncScraper):
     """
     A scraper that uses multiple ingress rules to determine how to scrape a link.
@@ -73,6 +488,13 @@ class MultiScraper(IAsyncScraper):
         ingress_rules (List[IngressRule]): A list of ingress rule instances.
         debug (bool): Indicates whether debug mode is enabled.
         debug_delimiter (str): The delimiter used to join debug log messages.
+        sync_executor (Executor): The pool that runs synchronous scrapers, or None for the loop's default pool.
+        hedge_delay (float|str): How long to wait for a scraper before also starting the next matching one,
+            or "p95" to use the scraper's 95th percentile latency. None tries scrapers strictly in sequence.
+        rule_learner (DomainRuleLearner): Reorders rules per domain based on their success, or None.
+        breaker_threshold (int): The consecutive failures that open a rule's circuit breaker, or None.
+        breaker_cooldown (float): The seconds an open circuit breaker waits before probing its scraper again.
+        link_timeout (float): The total seconds the rule chain may spend on a link, or None.
 
     Methods:
         __init__(ingress_rules: List[IngressRule], debug: bool = False, debug_delimiter: str = "; "):
@@ -82,12 +504,29 @@ class MultiScraper(IAsyncScraper):
             Returns a ScrapeResult indicating success or failure.
     """
     DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+    HEDGE_P95_MIN_SAMPLES = 20
+    """The number of latency samples a rule needs before its p95 is used as the hedge delay."""
+    HEDGE_P95_DEFAULT_DELAY = 2.0
+    """The hedge delay used in "p95" mode until a rule has enough latency samples."""
+    HEDGE_P95_WINDOW = 200
+    """The number of recent latencies kept per rule in "p95" mode."""
+    LINK_TIMEOUT_GRACE = 1.0
+    """The seconds scrape_multiple() allows beyond link_timeout, so the chain can report its own failure."""
+    CIRCUIT_OPEN_ERROR = "Circuit open; scraper skipped"
+    """The error of the result recorded for a rule whose circuit breaker refused the link."""
         
     ingress_rules: List[IngressRule]
     def __init__(self,
         ingress_rules: List[IngressRule],
         debug: bool = False,
-        debug_delimiter: str = "; "
+        debug_delimiter: str = "; ",
+        route_cache_size: int = IngressRouter.DEFAULT_CACHE_SIZE,
+        sync_executor: Executor = None,
+        hedge_delay: float | str = None,
+        rule_learner: DomainRuleLearner = None,
+        breaker_threshold: int = None,
+        breaker_cooldown: float = 30.0,
+        link_timeout: float = None
     ):
         """
         Initialize the MultiScraper with ingress rules.
@@ -96,6 +535,30 @@ class MultiScraper(IAsyncScraper):
             ingress_rules (list[IngressRule]): A list of IngressRule instances. None items are omited.
             debug (bool, optional): Enable debug mode. Defaults to False.
             debug_delimiter (str, optional): Delimiter for joining debug log messages. Defaults to "; ".
+            route_cache_size (int, optional): The number of hosts whose routing decisions are cached for
+                rules with match_host=True. The cache is reset when ingress_rules changes. 0 disables it.
+            sync_executor (Executor, optional): The pool that runs synchronous (non-async) scrapers so they
+                do not block the event loop. Defaults to None, which uses the event loop's default thread pool.
+                A ProcessPoolExecutor can be used if the scrapers are picklable.
+            hedge_delay (float|str, optional): Enables hedging of non-exclusive fallback chains. If a matching
+                scraper has not finished after this many seconds, the next matching scraper is started as well.
+                "p95" uses each rule's recent 95th percentile latency instead of a fixed delay. The result is
+                always the one the sequential chain would return: the success of the highest priority rule.
+                Defaults to None, which runs the chain strictly in sequence.
+            rule_learner (DomainRuleLearner, optional): Records how each rule fares on each domain and tries
+                the rules that work there first, e.g. skipping a news extractor on sites where it always fails.
+                Defaults to None, which always tries rules in the configured order.
+            breaker_threshold (int, optional): Gives each rule a CircuitBreaker that opens after this many
+                consecutive failures of its scraper. While open, the rule is skipped without running it.
+                Defaults to None, which disables circuit breakers.
+            breaker_cooldown (float, optional): The seconds an open breaker waits before letting one link
+                through to probe the scraper again. Defaults to 30.
+            link_timeout (float, optional): The total seconds the rule chain may spend on one link. Each rule
+                gets its own timeout if it has one, or else an equal share of the time that is left among the
+                rules that have not run yet, so a slow first rule cannot starve the fallbacks. A timed out
+                rule fails and the next one runs. The chain stops when the budget is spent. scrape_multiple()
+                allows each link link_timeout + LINK_TIMEOUT_GRACE seconds. Defaults to None, which only applies
+                the rules' own timeouts. Synchronous scrapers that time out keep running in their worker.
         """
         super().__init__()
         assert isinstance(ingress_rules, list), "ingress_rules must be a list of IngressRule"
@@ -103,6 +566,28 @@ class MultiScraper(IAsyncScraper):
         
         # Omit None items from ingress_rules
         self.ingress_rules = [rule for rule in ingress_rules if rule is not None]
+        assert isinstance(route_cache_size, int) and route_cache_size >= 0, "route_cache_size must be a non-negative integer"
+        self.route_cache_size = route_cache_size
+        assert sync_executor is None or isinstance(sync_executor, Executor), "sync_executor must be a concurrent.futures.Executor"
+        self.sync_executor = sync_executor
+        assert hedge_delay is None or hedge_delay == "p95" or (isinstance(hedge_delay, (int, float)) and hedge_delay >= 0), \
+            "hedge_delay must be None, a non-negative number of seconds or 'p95'"
+        self.hedge_delay = hedge_delay
+        self._rule_latencies: Dict[IngressRule, Deque[float]] = {}
+        assert rule_learner is None or isinstance(rule_learner, DomainRuleLearner), "rule_learner must be a DomainRuleLearner"
+        self.rule_learner = rule_learner
+        assert breaker_threshold is None or (isinstance(breaker_threshold, int) and breaker_threshold >= 1), \
+            "breaker_threshold must be None or a positive integer"
+        assert isinstance(breaker_cooldown, (int, float)) and breaker_cooldown >= 0, "breaker_cooldown must be a non-negative number"
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._breakers: Dict[IngressRule, CircuitBreaker] = {}
+        assert link_timeout is None or (isinstance(link_timeout, (int, float)) and link_timeout > 0), \
+            "link_timeout must be None or a positive number"
+        self.link_timeout = link_timeout
+        if link_timeout is not None:
+            self.timeout = link_timeout + self.LINK_TIMEOUT_GRACE
+        self._router: IngressRouter = None
         
         assert isinstance(debug, bool), "debug must be a boolean"
         self.debug = debug
@@ -112,23 +597,188 @@ class MultiScraper(IAsyncScraper):
     async def _run_scraper(self, link:str, scraper:IScraper) -> ScrapeResult:
         if isinstance(scraper, IAsyncScraper):
             async_scraper = cast(IAsyncScraper, scraper)
-            result = await async_scraper.async_scrape(link)
+            result = await async_scraper.dispatch_scrape(link)
         else:
-            result = scraper.scrape(link)
+            # Run blocking scrapers in a worker so the loop stays responsive and they overlap
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.sync_executor, scraper.scrape, link)
         return result
     
     
-    async def _process_rules(self, rules:List[IngressRule], url:str) -> List[Tuple[IngressRule,ScrapeResult]]:
-        """Returns a ScrapeResult if a run succeeded; else None"""
+    def _get_router(self) -> IngressRouter:
+        # Recompile when ingress_rules is replaced or modified
+        router = self._router
+        if router is None or router.rules != tuple(self.ingress_rules):
+            router = self._router = IngressRouter(self.ingress_rules, cache_size=self.route_cache_size)
+        return router
+    
+    def route(self, url:str) -> List[IngressRule]:
+        """
+        Find the ingress rules that match a URL.
+
+        Args:
+            url (str): The URL to route.
+
+        Returns:
+            List[IngressRule]: The matching rules in the order they are tried.
+        """
+        return self._get_router().route(url)
+    
+    def get_circuit_breaker(self, rule:IngressRule) -> CircuitBreaker | None:
+        """
+        Get the circuit breaker guarding a rule's scraper.
+
+        Args:
+            rule (IngressRule): The rule.
+
+        Returns:
+            CircuitBreaker|None: The rule's breaker, or None if breaker_threshold is not set.
+        """
+        if self.breaker_threshold is None:
+            return None
+        breaker = self._breakers.get(rule)
+        if breaker is None:
+            breaker = self._breakers.setdefault(rule, CircuitBreaker(self.breaker_threshold, self.breaker_cooldown))
+        return breaker
+    
+    async def _run_rule(self, url:str, rule:IngressRule, timeout:float = None) -> ScrapeResult:
+        breaker = self.get_circuit_breaker(rule)
+        if breaker is None:
+            return await self._time_rule(url, rule, timeout)
+        if not breaker.allow():
+            return ScrapeResult.fail(url, self.CIRCUIT_OPEN_ERROR)
+        try:
+            result = await self._time_rule(url, rule, timeout)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+        if result.success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return result
+    
+    async def _time_rule(self, url:str, rule:IngressRule, timeout:float = None) -> ScrapeResult:
+        start = time.perf_counter()
+        if timeout is None:
+            result = await self._run_scraper(url, rule.scraper)
+        else:
+            try:
+                result = await asyncio.wait_for(self._run_scraper(url, rule.scraper), timeout)
+            except asyncio.TimeoutError:
+                result = ScrapeResult.fail(url, f"Timed out after {timeout:.3g} seconds")
+        if self.hedge_delay != "p95":
+            return result
+        latencies = self._rule_latencies.get(rule)
+        if latencies is None:
+            latencies = self._rule_latencies.setdefault(rule, deque(maxlen=self.HEDGE_P95_WINDOW))
+        latencies.append(time.perf_counter() - start)
+        return result
+    
+    def get_hedge_delay(self, rule:IngressRule) -> float:
+        """
+        Get how long to wait for a rule's scraper before hedging with the next matching rule.
+
+        Args:
+            rule (IngressRule): The rule whose scraper is running.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if self.hedge_delay != "p95":
+            return self.hedge_delay
+        latencies = self._rule_latencies.get(rule)
+        if latencies is None or len(latencies) < self.HEDGE_P95_MIN_SAMPLES:
+            return self.HEDGE_P95_DEFAULT_DELAY
+        ordered = sorted(latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+    
+    def _rule_timeout(self, rule:IngressRule, deadline:float|None, rules_left:int) -> float|None:
+        # Returns the rule's time limit: its own timeout or an equal share of the link's remaining budget
+        if deadline is None:
+            return rule.timeout
+        remaining = deadline - asyncio.get_running_loop().time()
+        share = rule.timeout if rule.timeout is not None else remaining / rules_left
+        return min(share, remaining)
+    
+    def _link_deadline(self) -> float|None:
+        if self.link_timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + self.link_timeout
+    
+    async def _process_rules_hedged(self, rules:List[IngressRule], url:str) -> List[Tuple[IngressRule,ScrapeResult]]:
+        # Rules after an exclusive rule never run, so they are never hedged
+        rules = _reachable(rules)
+        deadline = self._link_deadline()
+        tasks: List[asyncio.Task] = []
+        budget_spent = False
+        def start_next() -> bool:
+            # Starts the next rule, unless the link's time budget is spent
+            nonlocal budget_spent
+            rule = rules[len(tasks)]
+            # Hedges overlap, so each may use all of the remaining budget
+            timeout = self._rule_timeout(rule, deadline, 1)
+            if timeout is not None and timeout <= 0:
+                # Not a failure of the rule, so it must not reach the breakers or the learner
+                budget_spent = True
+                return False
+            tasks.append(asyncio.ensure_future(self._run_rule(url, rule, timeout)))
+            return True
+        def later_success(position):
+            return any(task.done() and not task.cancelled() and task.exception() is None and task.result().success
+                       for task in tasks[position + 1:])
+        
         process_results = []
-        for rule in rules:
-            if re.search(rule.pattern, url):
-                # If the rule matches, use the associated scraper
-                result = await self._run_scraper(url, rule.scraper)
-                process_results.append((rule,result))
-                # Stop processing after first success
+        try:
+            for position, rule in enumerate(rules):
+                if position == len(tasks) and not start_next():
+                    break
+                task = tasks[position]
+                # Wait for the highest priority rule, starting the next rule whenever it is slow
+                while not task.done() and not budget_spent and len(tasks) < len(rules) and not later_success(position):
+                    done, _ = await asyncio.wait({task}, timeout=self.get_hedge_delay(rules[len(tasks) - 1]))
+                    if not done and not later_success(position):
+                        start_next()
+                result = await task
+                process_results.append((rule, result))
                 if result.success or rule.exclusive:
                     break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Retrieve exceptions of hedges whose results were not needed
+                    task.exception()
+        return process_results
+    
+    async def _process_rules(self, rules:List[IngressRule], url:str) -> List[Tuple[IngressRule,ScrapeResult]]:
+        """Returns a ScrapeResult if a run succeeded; else None"""
+        if rules is self.ingress_rules:
+            matching_rules = self.route(url)
+        else:
+            matching_rules = [rule for rule in rules if rule.pattern.search(url)]
+        if self.rule_learner is not None and len(matching_rules) > 1:
+            matching_rules = self.rule_learner.order(_extract_host(url), matching_rules)
+        if self.hedge_delay is not None and len(matching_rules) > 1:
+            return await self._process_rules_hedged(matching_rules, url)
+        matching_rules = _reachable(matching_rules)
+        deadline = self._link_deadline()
+        process_results = []
+        for position, rule in enumerate(matching_rules):
+            timeout = self._rule_timeout(rule, deadline, len(matching_rules) - position)
+            if timeout is not None and timeout <= 0:
+                # The link's time budget is spent
+                break
+            # Use the scraper of each matching rule in turn
+            result = await self._run_rule(url, rule, timeout)
+            process_results.append((rule,result))
+            # Stop processing after first success
+            if result.success or rule.exclusive:
+                break
         return process_results
     
     def _compile_results(self, url:str, process_results:List[Tuple[IngressRule,ScrapeResult]]) -> ScrapeResult:
@@ -160,6 +810,8 @@ class MultiScraper(IAsyncScraper):
     async def async_scrape(self, url: str) -> ScrapeResult:
         """
         Scrape the given URL using the appropriate scraper based on ingress rules.
+        HTTP scrapers in the chain share downloads, so a fallback rule reuses the page
+        fetched by an earlier rule instead of downloading it again.
 
         Args:
             url (str): The URL to scrape.
@@ -167,5 +819,11 @@ class MultiScraper(IAsyncScraper):
         Returns:
             ScrapeResult: The result of the scrape.
         """
-        process_results = await self._process_rules(rules=self.ingress_rules, url=url)
+        with shared_fetch_cache():
+            process_results = await self._process_rules(rules=self.ingress_rules, url=url)
+        if self.rule_learner is not None:
+            host = _extract_host(url)
+            for rule, result in process_results:
+                if result.success or result.scrape_error != self.CIRCUIT_OPEN_ERROR:
+                    self.rule_learner.record(host, rule, result.success)
         return self._compile_results(url, process_results)
@@ -0,0 +1,122 @@
+from scraipe.classes import IAnalyzer, AnalysisResult
+from scraipe.async_classes import IAsyncAnalyzer
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Generator, List, Tuple
+import os
+import pickle
+
+# The analyzer of the current worker process, set by _init_worker()
+_worker_analyzer: IAnalyzer = None
+
+def _init_worker(analyzer: IAnalyzer) -> None:
+    # Receives the analyzer once per worker instead of once per chunk
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _analyze_chunk(chunk: Dict[str, str]) -> List[Tuple[str, AnalysisResult]]:
+    # Runs in a worker process; uses the analyzer's own analyze_multiple() so batched implementations apply
+    return list(_worker_analyzer.analyze_multiple(chunk))
+
+class ProcessPoolAnalyzer(IAnalyzer):
+    """
+    Runs a CPU-bound synchronous analyzer in a pool of worker processes, so analysis scales
+    across cores instead of being serialized by the GIL.
+
+    analyze_multiple() sends the contents to the workers in chunks of chunk_size to amortize
+    the cost of pickling, and yields the results in input order. Workflow.analyze() uses
+    analyze_multiple(), so wrapping a workflow's analyzer is enough to parallelize it:
+
+        workflow = Workflow(scraper, ProcessPoolAnalyzer(TextStatsAnalyzer()))
+
+    The wrapped analyzer must be picklable; it is sent to each worker once when the pool starts.
+    The pool is started on first use and is shut down by close() or when used as a context manager.
+    """
+    def __init__(self, analyzer: IAnalyzer, max_workers: int = None, chunk_size: int = 32, mp_context=None):
+        """
+        Initialize the ProcessPoolAnalyzer.
+
+        Args:
+            analyzer (IAnalyzer): The synchronous analyzer to run in the workers.
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            chunk_size (int): The number of contents sent to a worker at a time.
+            mp_context (multiprocessing.context.BaseContext, optional): The multiprocessing context used to
+                start the workers, e.g. multiprocessing.get_context("spawn"). Defaults to the platform default.
+
+        Raises:
+            ValueError: If the analyzer cannot be pickled.
+        """
+        assert isinstance(analyzer, IAnalyzer), "analyzer must extend IAnalyzer."
+        assert not isinstance(analyzer, IAsyncAnalyzer), "Async analyzers are I/O-bound; use MultiAnalyzer instead."
+        assert max_workers is None or (isinstance(max_workers, int) and max_workers > 0), "max_workers must be a positive integer."
+        assert isinstance(chunk_size, int) and chunk_size > 0, "chunk_size must be a positive integer."
+        try:
+            pickle.dumps(analyzer)
+        except Exception as e:
+            raise ValueError(f"{analyzer.__class__.__name__} cannot be pickled for the worker processes: {e}") from e
+        self.analyzer = analyzer
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+        self._pool: ProcessPoolExecutor = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                             initializer=_init_worker, initargs=(self.analyzer,))
+        return self._pool
+
+    def analyze(self, content: str) -> AnalysisResult:
+        """
+        Analyze the content in a worker process.
+
+        Args:
+            content (str): The content to analyze.
+
+        Returns:
+            AnalysisResult: The wrapped analyzer's result.
+        """
+        return self._get_pool().submit(_analyze_chunk, {"": content}).result()[0][1]
+
+    def analyze_multiple(self, contents: Dict[str, str]) -> Generator[Tuple[str, AnalysisResult], None, None]:
+        """
+        Analyze multiple contents in chunks across the worker processes.
+
+        Args:
+            contents (Dict[str, str]): The contents to analyze, keyed by link.
+
+        Yields:
+            Tuple[str, AnalysisResult]: Each link and its result, in input order.
+        """
+        pool = self._get_pool()
+        # Keep every worker busy without pickling all contents up front
+        max_pending = 2 * (self.max_workers or os.cpu_count() or 1)
+        items = iter(contents.items())
+        pending: Deque[Future] = deque()
+        try:
+            while True:
+                while len(pending) < max_pending:
+                    chunk = dict(islice(items, self.chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_analyze_chunk, chunk))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            # Drop queued chunks if the caller stops early or a chunk fails
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ProcessPoolAnalyzer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
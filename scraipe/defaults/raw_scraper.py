@@ -1,46 +1,60 @@
 from scraipe import ScrapeResult
-from scraipe.async_classes import IAsyncScraper
-import aiohttp
+from scraipe.defaults.http_scraper_base import HttpScraperBase, HttpFetchError
+from typing import Sequence
 
-class RawScraper(IAsyncScraper):
+class RawScraper(HttpScraperBase):
     """Asynchronous scraper that retrieves webpage content in raw text format. The scraper performs no cleaning or parsing of the content.
 
-    Uses aiohttp to perform HTTP GET requests.
+    Uses aiohttp to perform HTTP GET requests. With as_bytes=True the body is returned as bytes without being decoded,
+    which saves CPU and memory when downstream consumers only need the raw payload (hashing, archiving, binary analyzers).
 
     Attributes:
         DEFAULT_USER_AGENT (str): Default User-Agent string for HTTP requests.
         headers (dict): HTTP headers used during the requests.
+        max_bytes (int): The maximum response body size in bytes.
+        allowed_content_types (List[str]): Glob patterns of accepted mimetypes. None accepts any.
+        max_retries (int): The number of retries after a transient error.
+        as_bytes (bool): Whether the content is returned as bytes instead of decoded text.
     """
     
-    DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
-    headers: dict = {"User-Agent": DEFAULT_USER_AGENT}
-    """Headers to be used in the HTTP requests. Defaults to a standard User-Agent header."""
-    
-    def __init__(self, headers=None):
+    def __init__(self, headers=None,
+        max_bytes: int | None = HttpScraperBase.DEFAULT_MAX_BYTES,
+        allowed_content_types: Sequence[str] | None = None,
+        max_retries: int = HttpScraperBase.DEFAULT_MAX_RETRIES,
+        as_bytes: bool = False):
         """
         Initializes a RawScraper instance.
 
         Args:
             headers (dict, optional): Custom headers for HTTP requests.
                                       Defaults to None, which uses the class-defined headers.
+            max_bytes (int, optional): The maximum response body size in bytes. Downloads are aborted once exceeded.
+                                       Defaults to 10 MiB. None disables the cap.
+            allowed_content_types (Sequence[str], optional): Glob patterns of accepted mimetypes, e.g. ["text/*"].
+                                                             Defaults to None, which accepts any content type.
+            max_retries (int, optional): The number of retries after a 429, 502, 503 or 504 response or a connection error.
+                                         Defaults to 2. 0 disables retries.
+            as_bytes (bool, optional): Return the undecoded body as bytes instead of text. Defaults to False.
         """
-        self.headers = headers or RawScraper.headers
+        super().__init__(headers=headers, max_bytes=max_bytes, allowed_content_types=allowed_content_types, max_retries=max_retries)
+        self.as_bytes = as_bytes
         
     async def async_scrape(self, url: str) -> ScrapeResult:
-        """Scrape a webpage asynchronously and return its raw text content.
+        """Scrape a webpage asynchronously and return its raw content.
 
         Args:
             url (str): URL of the webpage to be scraped.
 
         Returns:
-            ScrapeResult: Result containing the URL, raw text content, success flag, and error message if applicable.
+            ScrapeResult: Result containing the URL, raw text (or bytes if as_bytes is set), success flag, and error message if applicable.
         """
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return ScrapeResult.fail(url, f"Failed to scrape {url}. Status code: {response.status}")
-                    text = await response.text()
-                    return ScrapeResult.succeed(url, text)
+            page = await self.fetch(url)
+            if self.as_bytes:
+                # The body is stored as is, without a decode/encode round trip
+                return ScrapeResult.succeed(url, page.body, metadata={"content_type": page.mimetype})
+            return ScrapeResult.succeed(url, page.text())
+        except HttpFetchError as e:
+            return ScrapeResult.fail(url, str(e))
         except Exception as e:
-            return ScrapeResult.fail(url, f"Failed to scrape {url}. Error: {e}")
\ No newline at end of file
+            return ScrapeResult.fail(url, f"Failed to scrape {url}. Error: {e}")
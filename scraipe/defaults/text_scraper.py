@@ -1,30 +1,45 @@
 from scraipe import ScrapeResult
-from scraipe.async_classes import IAsyncScraper
-from bs4 import BeautifulSoup
-import aiohttp
+from scraipe.defaults.http_scraper_base import HttpScraperBase, HttpFetchError
+from scraipe.defaults.html_text_engines import IHtmlTextEngine, get_text_engine
+from typing import Sequence
 
-class TextScraper(IAsyncScraper):
+class TextScraper(HttpScraperBase):
     """Asynchronous text scraper that extracts visible text from HTML.
 
-    Fetches webpage content using aiohttp and parses the HTML with BeautifulSoup. Strips HTML tags.
+    Fetches webpage content using aiohttp and extracts the text with a pluggable HTML engine. Strips HTML tags.
     
     Attributes:
         DEFAULT_USER_AGENT (str): Default User-Agent string for HTTP requests.
+        DEFAULT_CONTENT_TYPES (List[str]): Mimetypes accepted by default.
         headers (dict): HTTP headers used in fetching the webpage content.
+        max_bytes (int): The maximum response body size in bytes.
+        allowed_content_types (List[str]): Glob patterns of accepted mimetypes. None accepts any.
+        max_retries (int): The number of retries after a transient error.
+        text_engine (IHtmlTextEngine): The engine used to extract visible text from HTML.
     """
     
-    DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
-    headers: dict = {"User-Agent": DEFAULT_USER_AGENT}
-    """Headers to be used in the HTTP requests. Defaults to a standard User-Agent header."""
+    DEFAULT_CONTENT_TYPES = ["text/*", "application/xhtml+xml", "application/xml"]
     
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, engine: str | IHtmlTextEngine = "auto",
+        max_bytes: int | None = HttpScraperBase.DEFAULT_MAX_BYTES,
+        allowed_content_types: Sequence[str] | None = DEFAULT_CONTENT_TYPES,
+        max_retries: int = HttpScraperBase.DEFAULT_MAX_RETRIES):
         """
         Initializes the TextScraper with optional custom HTTP headers.
         
         :param headers: A dictionary of HTTP headers to use in asynchronous requests. If not provided,
                         defaults to a standard User-Agent header.
+        :param engine: The HTML-to-text engine name ("bs4", "lxml", "selectolax") or instance. Defaults to "auto",
+                       which selects the fastest installed engine and falls back to bs4.
+        :param max_bytes: The maximum response body size in bytes. Downloads are aborted once exceeded.
+                          Defaults to 10 MiB. None disables the cap.
+        :param allowed_content_types: Glob patterns of accepted mimetypes, checked before the body is read.
+                                      Defaults to text and (X)HTML/XML types. None accepts any content type.
+        :param max_retries: The number of retries after a 429, 502, 503 or 504 response or a connection error.
+                            Defaults to 2. 0 disables retries.
         """
-        self.headers = headers or TextScraper.headers
+        super().__init__(headers=headers, max_bytes=max_bytes, allowed_content_types=allowed_content_types, max_retries=max_retries)
+        self.text_engine = get_text_engine(engine)
         
     async def async_scrape(self, url: str) -> ScrapeResult:
         """Scrape a webpage asynchronously and extract visible text.
@@ -36,15 +51,11 @@ class TextScraper(IAsyncScraper):
             ScrapeResult: Result containing the URL, extracted text content, success flag, and error if any.
         """
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return ScrapeResult.fail(url, f"Failed to scrape {url}. Status code: {response.status}")                        
-                    text = await response.text()
-                    # Use bs4 to extract the text from the html
-                    soup = BeautifulSoup(text, "html.parser")
-                    content = soup.get_text()
-                    content = "\n".join([line for line in content.split("\n") if line.strip() != ""])
-                    return ScrapeResult.succeed(url, content)
+            page = await self.fetch(url)
+            # Extract the visible text from the html
+            content = self.text_engine.extract_text(page.text())
+            return ScrapeResult.succeed(url, content)
+        except HttpFetchError as e:
+            return ScrapeResult.fail(url, str(e))
         except Exception as e:
-            return ScrapeResult.fail(url, f"Failed to scrape {url}. Error: {e}")
\ No newline at end of file
+            return ScrapeResult.fail(url, f"Failed to scrape {url}. Error: {e}")
@@ -1,15 +1,238 @@
 """Module for analyzing text statistics."""
 
 from scraipe.classes import IAnalyzer, AnalysisResult
-from typing import Type
+from typing import Any, Dict, Generator, List, Tuple, Type
 import re
+import numpy as np
+
+# Words may contain apostrophes
+_WORD_RE = re.compile(r"\b[\w']+\b")
+_SENTENCE_DELIMITER_RE = re.compile(r'[.!?]+')
+
+# Per-character classes for the batch implementation
+_WORD_CHAR_RE = re.compile(r"\w")
+_WORD, _APOSTROPHE, _SPACE, _DELIMITER = 1, 2, 4, 8
+
+def _classify(char: str) -> int:
+    # Returns the class bits of a character
+    bits = 0
+    if _WORD_CHAR_RE.match(char):
+        bits |= _WORD
+    if char == "'":
+        bits |= _APOSTROPHE
+    if char.isspace():
+        bits |= _SPACE
+    if char in ".!?":
+        bits |= _DELIMITER
+    return bits
+
+_ASCII_CLASSES = np.array([_classify(chr(code)) for code in range(128)], dtype=np.uint8)
+# Joins documents in a batch; it ends words and sentences, so neither spans two documents
+_BATCH_SEPARATOR = "."
+
+def find_words(content: str) -> List[str]:
+    """
+    Find the words in a text, allowing apostrophes in words.
+    Can be used as the "words" preprocessor of a MultiAnalyzer.
+
+    Args:
+        content (str): The text.
+
+    Returns:
+        List[str]: The words in order.
+    """
+    return _WORD_RE.findall(content)
+
+def split_sentences(content: str) -> List[str]:
+    """
+    Split a text into sentences using punctuation as delimiters.
+    Can be used as the "sentences" preprocessor of a MultiAnalyzer.
+
+    Args:
+        content (str): The text.
+
+    Returns:
+        List[str]: The non-empty sentences, stripped of surrounding whitespace.
+    """
+    sentences = _SENTENCE_DELIMITER_RE.split(content)
+    # Filter out any empty strings resulting from the split
+    return [s.strip() for s in sentences if s.strip()]
+
+def _char_classes(text: str) -> np.ndarray:
+    # Returns the class bits of each character of the text
+    if text.isascii():
+        return _ASCII_CLASSES[np.frombuffer(text.encode("ascii"), dtype=np.uint8)]
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = _ASCII_CLASSES[np.minimum(codes, 127)]
+    non_ascii = np.flatnonzero(codes > 127)
+    # Classify each distinct non-ASCII character once
+    unique, inverse = np.unique(codes[non_ascii], return_inverse=True)
+    classes[non_ascii] = np.array([_classify(chr(code)) for code in unique.tolist()], dtype=np.uint8)[inverse]
+    return classes
+
+def _run_bounds(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Returns the first and last positions of each run of True values
+    edges = np.empty(mask.size + 1, dtype=bool)
+    edges[0] = mask[0] if mask.size else False
+    np.not_equal(mask[1:], mask[:-1], out=edges[1:-1])
+    edges[-1] = mask[-1] if mask.size else False
+    bounds = np.flatnonzero(edges)
+    return bounds[0::2], bounds[1::2] - 1
+
+def _per_document(positions: np.ndarray, starts: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+    # Counts the sorted positions (or sums their weights) per document, given the documents' start positions
+    bounds = np.append(np.searchsorted(positions, starts), positions.size)
+    if weights is None:
+        return np.diff(bounds)
+    totals = np.zeros(weights.size + 1, dtype=np.int64)
+    np.cumsum(weights, out=totals[1:])
+    return np.diff(totals[bounds])
+
+def _find_words(classes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns the start of each word, and the start and length of each run of word characters.
+    # \b[\w']+\b matches each run of word characters and apostrophes that contains a word
+    # character, from its first to its last word character. Find the runs of word characters,
+    # then join neighbors that are separated only by apostrophes.
+    run_starts, run_ends = _run_bounds((classes & _WORD) != 0)
+    run_lengths = run_ends - run_starts + 1
+    joined = np.zeros(run_starts.size, dtype=bool)
+    if run_starts.size > 1:
+        candidates = np.flatnonzero(classes[run_ends[:-1] + 1] & _APOSTROPHE)
+        if candidates.size:
+            gaps = run_starts[candidates + 1] - run_ends[candidates] - 1
+            apostrophes = np.flatnonzero(classes & _APOSTROPHE)
+            gap_apostrophes = (np.searchsorted(apostrophes, run_starts[candidates + 1])
+                               - np.searchsorted(apostrophes, run_ends[candidates] + 1))
+            inside = gap_apostrophes == gaps
+            joined[candidates[inside] + 1] = True
+            # Apostrophes inside a word count towards its length
+            run_lengths[candidates[inside] + 1] += gaps[inside]
+    return run_starts[~joined], run_starts, run_lengths
+
+def _find_sentences(classes: np.ndarray, open_at_start: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns the start of each sentence, and the positions of the delimiters and the ends of the content runs.
+    # A sentence is a run between delimiters that is not blank once stripped. Runs of other
+    # non-space characters start one if they are the first after a delimiter, or the first
+    # of the text when a sentence is open at its start.
+    content_starts, content_ends = _run_bounds((classes & (_SPACE | _DELIMITER)) == 0)
+    delimiters = np.flatnonzero(classes & _DELIMITER)
+    following = np.searchsorted(content_starts, delimiters)
+    if open_at_start:
+        following = np.concatenate(([0], following))
+    following = following[following < content_starts.size]
+    first_after = np.ones(following.size, dtype=bool)
+    np.not_equal(following[1:], following[:-1], out=first_after[1:])
+    return content_starts[following[first_after]], delimiters, content_ends
+
+def _batch_stats(texts: List[str]) -> List[Dict[str, Any]]:
+    # Computes the statistics of many texts at once over a single array of character classes
+    count = len(texts)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+    starts = np.zeros(count, dtype=np.int64)
+    np.cumsum(lengths[:-1] + len(_BATCH_SEPARATOR), out=starts[1:])
+    classes = _char_classes(_BATCH_SEPARATOR.join(texts))
+
+    word_starts, run_starts, run_lengths = _find_words(classes)
+    word_counts = _per_document(word_starts, starts)
+    word_characters = _per_document(run_starts, starts, run_lengths)
+    sentence_starts, _, _ = _find_sentences(classes)
+    sentence_counts = _per_document(sentence_starts, starts)
+
+    stats = []
+    for length, word_count, characters, sentence_count in zip(
+            lengths.tolist(), word_counts.tolist(), word_characters.tolist(), sentence_counts.tolist()):
+        stats.append(_stats(length, word_count, characters, sentence_count))
+    return stats
+
+def _stats(length: int, word_count: int, word_characters: int, sentence_count: int) -> Dict[str, Any]:
+    # Builds the output dictionary of TextStatsAnalyzer
+    return {
+        "word_count": word_count,
+        "character_count": length,
+        "sentence_count": sentence_count,
+        "average_word_length": int(word_characters) / word_count if word_count > 0 else 0,
+    }
+
+def _scan_counts(content: str, window: int) -> Dict[str, int]:
+    # Counts the words, word characters and sentences of one text in windows of about `window`
+    # characters, so the memory used beyond the text itself does not grow with its length
+    word_count = word_characters = sentence_count = 0
+    sentence_open = True
+    position, length = 0, len(content)
+    while position < length:
+        end = min(position + window, length)
+        classes = _char_classes(content[position:end])
+        while end < length:
+            # Cut after the last space or delimiter, so no word spans two windows
+            breaks = (classes & (_SPACE | _DELIMITER)) != 0
+            last_break = breaks.size - 1 - int(np.argmax(breaks[::-1]))
+            if breaks[last_break]:
+                end = position + last_break + 1
+                classes = classes[:last_break + 1]
+                break
+            # A single token fills the window; widen it
+            end = min(end + window, length)
+            classes = _char_classes(content[position:end])
+
+        word_starts, _, run_lengths = _find_words(classes)
+        word_count += word_starts.size
+        word_characters += int(run_lengths.sum())
+        sentence_starts, delimiters, content_ends = _find_sentences(classes, sentence_open)
+        sentence_count += sentence_starts.size
+        # A sentence is open at the next window if no content follows the last delimiter
+        if content_ends.size:
+            sentence_open = bool(delimiters.size) and delimiters[-1] > content_ends[-1]
+        elif delimiters.size:
+            sentence_open = True
+        position = end
+    return {"word_count": word_count, "word_characters": word_characters, "sentence_count": sentence_count}
+
+def _scan_stats(content: str, window: int) -> Dict[str, Any]:
+    # Computes the statistics of one text with the windowed scanner
+    return _stats_from_counts(len(content), _scan_counts(content, window))
+
+def _stats_from_counts(length: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    return _stats(length, counts["word_count"], counts["word_characters"], counts["sentence_count"])
+
+def _count_text(content: str, scan_min_chars: int, scan_window: int) -> Dict[str, int]:
+    if len(content) >= scan_min_chars:
+        return _scan_counts(content, scan_window)
+    words = find_words(content)
+    return {
+        "word_count": len(words),
+        "word_characters": sum(len(word) for word in words),
+        "sentence_count": len(split_sentences(content)),
+    }
+
+def count_text(content: str) -> Dict[str, int]:
+    """
+    Count the words, the characters in words and the sentences of a text, as TextStatsAnalyzer does.
+    Long texts are scanned in windows instead of building lists of their words and sentences.
+    Can be used as the "text_counts" preprocessor of a MultiAnalyzer.
+
+    Args:
+        content (str): The text.
+
+    Returns:
+        Dict[str, int]: The word_count, word_characters and sentence_count of the text.
+    """
+    return _count_text(content, TextStatsAnalyzer.SCAN_MIN_CHARS, TextStatsAnalyzer.SCAN_WINDOW)
 
 class TextStatsAnalyzer(IAnalyzer):
     """Analyzer that computes word count, character count, sentence count, and average word length."""
-    
+    uses_artifacts = ("text_counts",)
+    BATCH_CHARS = 1 << 21
+    """The approximate number of characters analyze_multiple() processes per batch."""
+    SCAN_MIN_CHARS = 2048
+    """Texts at least this long are analyzed with the windowed scanner instead of the regexes."""
+    SCAN_WINDOW = 1 << 16
+    """The number of characters the scanner processes at a time."""
+
     def analyze(self, content: str) -> AnalysisResult:
         """
         Analyze the provided text and return its statistics.
+        Texts of SCAN_MIN_CHARS or more are scanned in windows of SCAN_WINDOW characters
+        instead of building lists of their words and sentences.
 
         Args:
             content (str): The text to be analyzed.
@@ -21,22 +244,41 @@ class TextStatsAnalyzer(IAnalyzer):
                 - sentence_count (int): Total number of sentences.
                 - average_word_length (float): Average length of words in characters.
         """
-        # Use a regex pattern that allows apostrophes in words
-        words = re.findall(r"\b[\w']+\b", content)
+        return self.analyze_with_artifacts(content, {})
+
+    def analyze_with_artifacts(self, content: str, artifacts: Dict[str, Any]) -> AnalysisResult:
+        """
+        Analyze the provided text, reusing its "text_counts" artifact (see count_text()) if it is given.
+        Lists of its "words" (see find_words()) and "sentences" (see split_sentences()) are also accepted.
+
+        Args:
+            content (str): The text to be analyzed.
+            artifacts (Dict[str, Any]): Shared artifacts derived from the text.
+
+        Returns:
+            AnalysisResult: The same statistics as analyze().
+        """
+        counts = artifacts.get("text_counts")
+        words = artifacts.get("words")
+        sentences = artifacts.get("sentences")
+        if counts is None and words is None and sentences is None:
+            counts = _count_text(content, self.SCAN_MIN_CHARS, self.SCAN_WINDOW)
+        if counts is not None:
+            return AnalysisResult.succeed(_stats_from_counts(len(content), counts))
+        if words is None:
+            words = find_words(content)
         word_count = len(words)
-        
+
         # Count total characters (including whitespace and punctuation)
         character_count = len(content)
-        
-        # Split content into sentences using punctuation as delimiters
-        sentences = re.split(r'[.!?]+', content)
-        # Filter out any empty strings resulting from the split
-        sentences = [s.strip() for s in sentences if s.strip()]
+
+        if sentences is None:
+            sentences = split_sentences(content)
         sentence_count = len(sentences)
-        
+
         # Calculate average word length (avoid division by zero)
         avg_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0
-        
+
         # Prepare the output dictionary
         stats = {
             "word_count": word_count,
@@ -44,5 +286,40 @@ class TextStatsAnalyzer(IAnalyzer):
             "sentence_count": sentence_count,
             "average_word_length": avg_word_length,
         }
-        
-        return AnalysisResult.succeed(stats)
\ No newline at end of file
+
+        return AnalysisResult.succeed(stats)
+
+    def analyze_multiple(self, contents: Dict[str, str]) -> Generator[Tuple[str, AnalysisResult], None, None]:
+        """
+        Analyze multiple texts in batches, returning the same statistics as analyze().
+        Each batch is processed in one pass over a NumPy array of its characters instead of
+        running the regexes and building word lists per text.
+
+        Args:
+            contents (Dict[str, str]): The texts to analyze, keyed by link.
+
+        Yields:
+            Tuple[str, AnalysisResult]: Each link and the statistics of its text, in order.
+        """
+        links, texts, characters = [], [], 0
+        for link, content in contents.items():
+            if not isinstance(content, str) or len(content) >= self.BATCH_CHARS:
+                # Keep the order and the behavior of analyze() for anything that is not text,
+                # and scan texts that would fill a batch on their own
+                yield from self._analyze_batch(links, texts)
+                links, texts, characters = [], [], 0
+                yield link, self.analyze(content)
+                continue
+            links.append(link)
+            texts.append(content)
+            characters += len(content)
+            if characters >= self.BATCH_CHARS:
+                yield from self._analyze_batch(links, texts)
+                links, texts, characters = [], [], 0
+        yield from self._analyze_batch(links, texts)
+
+    def _analyze_batch(self, links: List[str], texts: List[str]) -> Generator[Tuple[str, AnalysisResult], None, None]:
+        if not texts:
+            return
+        for link, stats in zip(links, _batch_stats(texts)):
+            yield link, AnalysisResult.succeed(stats)
@@ -1,6 +1,7 @@
 """Contains analyzers for various cloud-based LLM provider integrations."""
 
 from scraipe.extended.llm_analyzers.llm_analyzer_base import LlmAnalyzerBase
+from scraipe.extended.llm_analyzers.llm_response_cache import LlmResponseCache
 
 # Import OpenAiAnalyzer
 try:
@@ -1,8 +1,9 @@
-from typing import Type
+from typing import Any, Callable, Dict, List, Type
 import google.genai
 import google.genai.errors
 from pydantic import BaseModel
 from scraipe.extended.llm_analyzers.llm_analyzer_base import LlmAnalyzerBase
+from scraipe.extended.llm_analyzers.llm_response_cache import LlmResponseCache
 
 from google.genai import Client
 from google.genai.types import GenerateContentConfig
@@ -17,7 +18,11 @@ class GeminiAnalyzer(LlmAnalyzerBase):
         pydantic_schema: Type[BaseModel] = None,
         model: str = "gemini-2.0-flash",
         max_content_size: int = 10000,
-        max_workers: int = 1):
+        max_workers: int = 1,
+        cache: LlmResponseCache = None,
+        chunk_tokens: int = None,
+        max_chunks: int = 8,
+        reducer: Callable[[List[Dict[str, Any]]], Dict[str, Any]] | str = None):
         """Initializes the GeminiAnalyzer instance.
         
         Args:
@@ -27,10 +32,15 @@ class GeminiAnalyzer(LlmAnalyzerBase):
             model (str, optional): The model to be used for the Gemini API. Defaults to "gemini-2.0-flash".
             max_content_size (int, optional): The maximum size of the content to be analyzed. Defaults to 10000 characters.
             max_workers (int, optional): The maximum number of workers to be used for the analysis. Defaults to 1 due to aggressive rate limiting.
+            cache (LlmResponseCache, optional): The on-disk cache of responses. Defaults to None for no caching.
+            chunk_tokens (int, optional): The maximum tokens per chunk to split long content into instead of truncating it. Defaults to None.
+            max_chunks (int, optional): The maximum number of chunks analyzed per content. Defaults to 8.
+            reducer (Callable|str, optional): Combines the chunk outputs. See LlmAnalyzerBase.reducer. Defaults to a field-wise merge.
         """
         super().__init__(
             instruction=instruction, pydantic_schema=pydantic_schema,
-            max_content_size=max_content_size, max_workers=max_workers)
+            max_content_size=max_content_size, max_workers=max_workers, cache=cache,
+            chunk_tokens=chunk_tokens, max_chunks=max_chunks, reducer=reducer)
         
         self.model = model
         self.client = Client(api_key=api_key)
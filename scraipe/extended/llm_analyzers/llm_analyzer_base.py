@@ -1,15 +1,29 @@
 from scraipe.classes import IAnalyzer, AnalysisResult
+import asyncio
 import json
 from pydantic import BaseModel, ValidationError
-from typing import Type
+from typing import Any, Callable, Dict, List, Type
 from abc import abstractmethod
 from scraipe.async_classes import IAsyncAnalyzer
+from scraipe.extended.llm_analyzers.llm_response_cache import LlmResponseCache
+from scraipe.extended.llm_analyzers.llm_chunking import split_into_chunks, merge_outputs
 
 class LlmAnalyzerBase(IAsyncAnalyzer):
     """Base class for LLM analyzers. This class should not be used directly.
     This class provides a common interface for LLM analyzers and handles the common logic for analyzing content using LLMs.
     query_llm() is an abstract method that requires the model to return a json string.
+    If rate_limiter is set, each query to the LLM takes a token from it.
+    If cache is set, valid responses are stored on disk and reused for the same provider, model,
+    instruction, schema and (truncated) content without querying the LLM or taking a token.
+    If chunk_tokens is set, content is split into chunks of chunk_tokens tokens instead of being
+    truncated. Up to max_chunks chunks are analyzed concurrently and their outputs are combined
+    by the reducer, so a document uses at most max_chunks queries plus one to reduce with the LLM.
     """
+    REDUCE_WITH_LLM = "llm"
+    """The reducer that asks the LLM to merge the chunk outputs."""
+    REDUCE_INSTRUCTION = ("The content is a JSON list of results, one for each consecutive part of a single document. "
+        "Merge them into one result for the whole document, in the same JSON format.")
+    throttles_requests = True
     
     # Attributes
     instruction:str
@@ -20,16 +34,55 @@ class LlmAnalyzerBase(IAsyncAnalyzer):
     """The maximum size of the content to be analyzed. This should be an integer that specifies the maximum number of characters."""
     max_workers:int = 3
     """The maximum number of workers to be used for the analysis. This should be an integer that specifies the maximum number of concurrent requests."""
+    model:str = None
+    """The model queried by the analyzer. Part of the cache key."""
+    cache:LlmResponseCache = None
+    """The cache of LLM responses, or None to always query the LLM."""
+    chunk_tokens:int = None
+    """The maximum number of tokens per chunk, or None to truncate content to max_content_size instead."""
+    max_chunks:int = 8
+    """The maximum number of chunks analyzed per document. Content beyond them is dropped."""
+    reducer:Callable[[List[Dict[str, Any]]], Dict[str, Any]] | str = None
+    """Combines the chunk outputs: None for a field-wise merge, REDUCE_WITH_LLM, or a callable taking the outputs in order."""
     
     def __init__(self,
         instruction:str,
         pydantic_schema:Type[BaseModel] = None,
         max_content_size:int=10000,
-        max_workers:int=3):
+        max_workers:int=3,
+        cache:LlmResponseCache = None,
+        chunk_tokens:int = None,
+        max_chunks:int = 8,
+        reducer:Callable[[List[Dict[str, Any]]], Dict[str, Any]] | str = None):
         super().__init__(max_workers=max_workers)
         self.instruction = instruction
         self.pydantic_schema = pydantic_schema
         self.max_content_size = max_content_size
+        assert cache is None or isinstance(cache, LlmResponseCache), "cache must be an LlmResponseCache"
+        self.cache = cache
+        assert chunk_tokens is None or chunk_tokens > 0, "chunk_tokens must be positive or None"
+        assert max_chunks > 0, "max_chunks must be positive"
+        assert reducer is None or reducer == self.REDUCE_WITH_LLM or callable(reducer), \
+            f"reducer must be None, {self.REDUCE_WITH_LLM!r} or callable"
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max_chunks
+        self.reducer = reducer
+    
+    def get_cache_key(self, content: str, instruction: str = None) -> str:
+        """Builds the cache key of a query from everything that determines the response.
+
+        Parameters:
+            content (str): The content after truncation to max_content_size, or a chunk.
+            instruction (str, optional): The instruction of the query. Defaults to the analyzer's instruction.
+
+        Returns:
+            str: The cache key.
+        """
+        schema = ""
+        if self.pydantic_schema is not None:
+            schema = json.dumps(self.pydantic_schema.model_json_schema(), sort_keys=True)
+        return LlmResponseCache.make_key(
+            [self.__class__.__name__, str(self.model), instruction or self.instruction, schema, content])
     
     
     @abstractmethod
@@ -49,7 +102,7 @@ class LlmAnalyzerBase(IAsyncAnalyzer):
         """Analyzes the provided content by querying the LLM and validating the response.
 
         Parameters:
-            content (str): The content to be analyzed. It must be a non-empty string. If the content exceeds the maximum allowed size, it will be truncated.
+            content (str): The content to be analyzed. It must be a non-empty string. If the content exceeds the maximum allowed size, it will be truncated, unless chunk_tokens is set.
 
         Returns:
             AnalysisResult: An object indicating the success or failure of the analysis. On success, the output contains the validated response data; on failure, it contains an error message.
@@ -59,21 +112,76 @@ class LlmAnalyzerBase(IAsyncAnalyzer):
         if not isinstance(content, str) or len(content) == 0:
             return AnalysisResult.fail("Content is not a valid string.")
         
+        if self.chunk_tokens is not None:
+            return await self._analyze_chunks(content)
+        
         # Cap the content size to the max_content_size
         if len(content) > self.max_content_size:
             content = content[:self.max_content_size]
+        return await self._query_and_parse(content, self.instruction)
+    
+    async def _analyze_chunks(self, content: str) -> AnalysisResult:
+        chunks = split_into_chunks(content, self.chunk_tokens, model=self.model, max_chunks=self.max_chunks)
+        if len(chunks) == 1:
+            return await self._query_and_parse(chunks[0], self.instruction)
         
+        # The rate limiter, if any, paces the concurrent chunk queries
+        results = await asyncio.gather(*(self._query_and_parse(chunk, self.instruction) for chunk in chunks))
+        for i, result in enumerate(results):
+            if not result.analysis_success:
+                return AnalysisResult.fail(f"Failed to analyze chunk {i + 1} of {len(chunks)}: {result.analysis_error}")
+        outputs = [result.output for result in results]
+        
+        if self.reducer == self.REDUCE_WITH_LLM:
+            instruction = f"{self.instruction}\n\n{self.REDUCE_INSTRUCTION}"
+            return await self._query_and_parse(json.dumps(outputs, default=str), instruction)
         try:
-            response = await self.query_llm(content, self.instruction)
+            reduced = (self.reducer or merge_outputs)(outputs)
         except Exception as e:
-            return AnalysisResult.fail(f"Failed to query LLM: {e}")
+            return AnalysisResult.fail(f"Failed to reduce chunk outputs: {e}")
+        return self._validate_output(reduced)
+    
+    async def _query_and_parse(self, content: str, instruction: str) -> AnalysisResult:
+        # Queries the LLM unless the response is cached, and caches valid responses
+        cache_key = None
+        response = None
+        if self.cache is not None:
+            cache_key = self.get_cache_key(content, instruction)
+            response = self.cache.get(cache_key)
+        if response is None:
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                response = await self.query_llm(content, instruction)
+            except Exception as e:
+                return AnalysisResult.fail(f"Failed to query LLM: {e}")
+        else:
+            # Cached responses were valid when stored
+            cache_key = None
         
+        result = self._parse_response(response)
+        if cache_key is not None and result.analysis_success:
+            # Only valid responses are cached, so a bad response is retried next time
+            self.cache.set(cache_key, response)
+        return result
+    
+    def _parse_response(self, response: str) -> AnalysisResult:
+        """Parses a JSON response from the LLM and validates it against pydantic_schema.
+
+        Parameters:
+            response (str): The response from query_llm() or an equivalent source, e.g. a batch job.
+
+        Returns:
+            AnalysisResult: The validated output, or a failure describing why the response was rejected.
+        """
         # Check if response is json string
         try:
             response_dict = json.loads(response)
         except json.JSONDecodeError:
             return AnalysisResult.fail(f"LLM response is not a valid json string: {response}")
-        
+        return self._validate_output(response_dict)
+    
+    def _validate_output(self, response_dict: Dict[str, Any]) -> AnalysisResult:
         # Check if response follows the pydantic schema
         output = response_dict
         if self.pydantic_schema:
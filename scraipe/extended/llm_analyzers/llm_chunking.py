@@ -0,0 +1,122 @@
+"""Token-aware splitting of long content and merging of per-chunk LLM outputs.
+
+Tokens are counted with tiktoken when it is installed. Otherwise they are estimated as
+CHARS_PER_TOKEN characters each, which is close for English text but undercounts text in
+scripts like CJK, where a character is often a token or more.
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List
+import json
+
+# Optional exact tokenizer
+try:
+    import tiktoken as _tiktoken
+except ImportError:
+    _tiktoken = None
+
+CHARS_PER_TOKEN = 4
+"""The estimated number of characters per token when tiktoken is not installed."""
+DEFAULT_ENCODING = "cl100k_base"
+"""The tiktoken encoding used for models tiktoken does not know."""
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    try:
+        return _tiktoken.encoding_for_model(model)
+    except (KeyError, TypeError, ValueError):
+        return _tiktoken.get_encoding(DEFAULT_ENCODING)
+
+def count_tokens(text: str, model: str = None) -> int:
+    """Counts the tokens in a text.
+
+    Args:
+        text (str): The text to count.
+        model (str, optional): The model whose tokenizer to use. Ignored without tiktoken.
+
+    Returns:
+        int: The number of tokens, or an estimate if tiktoken is not installed.
+    """
+    if _tiktoken is not None:
+        return len(_get_encoding(model).encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def split_into_chunks(text: str, chunk_tokens: int, model: str = None, max_chunks: int = None) -> List[str]:
+    """Splits a text into consecutive chunks of at most chunk_tokens tokens.
+
+    Without tiktoken, chunks are cut at the last whitespace in the second half of each
+    window where possible, so words are not split.
+
+    Args:
+        text (str): The text to split.
+        chunk_tokens (int): The maximum number of tokens per chunk.
+        model (str, optional): The model whose tokenizer to use. Ignored without tiktoken.
+        max_chunks (int, optional): The maximum number of chunks. Text beyond them is dropped.
+
+    Returns:
+        List[str]: The chunks, in order.
+    """
+    assert chunk_tokens > 0, "chunk_tokens must be positive"
+    if _tiktoken is not None:
+        encoding = _get_encoding(model)
+        tokens = encoding.encode(text, disallowed_special=())
+        if max_chunks is not None:
+            tokens = tokens[:max_chunks * chunk_tokens]
+        return [encoding.decode(tokens[start:start + chunk_tokens]) for start in range(0, len(tokens), chunk_tokens)]
+
+    chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    chunks = []
+    start = 0
+    while start < len(text) and (max_chunks is None or len(chunks) < max_chunks):
+        end = start + chunk_chars
+        if end < len(text):
+            # Prefer to end the chunk after whitespace
+            for cut in range(end, start + chunk_chars // 2, -1):
+                if text[cut - 1].isspace():
+                    end = cut
+                    break
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+def _identity(value: Any) -> str:
+    # A hashable stand-in for JSON values
+    return json.dumps(value, sort_keys=True, default=str)
+
+def _merge_values(values: List[Any]) -> Any:
+    if all(isinstance(value, bool) for value in values):
+        return any(values)
+    if all(isinstance(value, list) for value in values):
+        merged = {}
+        for value in values:
+            for item in value:
+                merged.setdefault(_identity(item), item)
+        return list(merged.values())
+    if all(isinstance(value, dict) for value in values):
+        return merge_outputs(values)
+    # The most common value, preferring the earliest chunk on ties
+    counts = Counter(_identity(value) for value in values)
+    most_common = counts.most_common(1)[0][0]
+    return next(value for value in values if _identity(value) == most_common)
+
+def merge_outputs(outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merges the outputs of the chunks of one document, field by field.
+
+    Outputs that were validated against a pydantic schema share its field types, which
+    decide how each field merges: booleans are or-ed, lists are concatenated without
+    duplicates, objects are merged recursively, and other values take the most common
+    value. Null and empty string values are ignored unless all chunks have them.
+
+    Args:
+        outputs (List[Dict[str, Any]]): The output of each chunk, in order.
+
+    Returns:
+        Dict[str, Any]: The merged output.
+    """
+    keys = list(dict.fromkeys(key for output in outputs for key in output))
+    merged = {}
+    for key in keys:
+        present = [output[key] for output in outputs if key in output]
+        values = [value for value in present if value is not None and value != ""]
+        merged[key] = _merge_values(values) if values else present[0]
+    return merged
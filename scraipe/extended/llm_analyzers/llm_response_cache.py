@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Sequence
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+class LlmResponseCache():
+    """An on-disk cache of LLM responses, shared by analyzers and kept across runs.
+
+    Each response is stored in its own file named by the SHA-256 hash of its key parts, so
+    lookups never read more than one small file and concurrent writers cannot corrupt each
+    other's entries: a response is written to a temporary file and atomically moved into place.
+    Hits and misses are counted so the cache's effect can be checked.
+    """
+
+    def __init__(self, directory: str | Path = ".scraipe_llm_cache"):
+        """Initializes the cache.
+
+        Args:
+            directory (str|Path): The directory that holds the cached responses. It is created on the first write.
+        """
+        self.directory = Path(directory)
+        self.hits = 0
+        """The number of lookups that found a cached response."""
+        self.misses = 0
+        """The number of lookups that found no cached response."""
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(parts: Sequence[str]) -> str:
+        """Hashes the parts that determine a response into a cache key.
+
+        Args:
+            parts (Sequence[str]): E.g. the provider, model, instruction, schema and content.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the parts.
+        """
+        # JSON keeps the parts apart, so ("ab", "c") and ("a", "bc") differ
+        encoded = json.dumps(list(parts), ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        # Shard by the first two hex digits to keep directories small
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        """Looks up a response.
+
+        Args:
+            key (str): The key from make_key().
+
+        Returns:
+            str|None: The cached response, or None if there is none.
+        """
+        try:
+            response = self._path(key).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            response = None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Stores a response, replacing any previous one.
+
+        Args:
+            key (str): The key from make_key().
+            response (str): The response to cache.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(response)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def clear(self) -> None:
+        """Deletes all cached responses and resets the counters."""
+        if self.directory.is_dir():
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
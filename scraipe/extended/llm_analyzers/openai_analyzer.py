@@ -1,13 +1,26 @@
 from openai import AsyncOpenAI, OpenAI
+import asyncio
+import json
 from pydantic import BaseModel
-from typing import Type
+from typing import Any, Callable, Dict, Generator, List, Tuple, Type
+from scraipe.classes import AnalysisResult
+from scraipe.async_util import AsyncManager
 from scraipe.extended.llm_analyzers.llm_analyzer_base import LlmAnalyzerBase
+from scraipe.extended.llm_analyzers.llm_response_cache import LlmResponseCache
 
 class OpenAiAnalyzer(LlmAnalyzerBase):
     """An analyzer that integrates the OpenAI API.
     
     This analyzer makes asynchronous calls to the OpenAI API to obtain language model completions.
+
+    In batch mode, analyze_multiple() submits all contents as OpenAI batch jobs instead of one
+    request per content. Batch jobs are cheaper and are not bound by max_workers, but may take
+    up to the completion window to finish, so batch mode suits large backfills.
     """
+    BATCH_ENDPOINT = "/v1/chat/completions"
+    BATCH_MAX_REQUESTS = 50000
+    """The maximum number of requests in one batch job, as allowed by the OpenAI API."""
+    BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
 
     def __init__(self,
         api_key: str,
@@ -16,7 +29,14 @@ class OpenAiAnalyzer(LlmAnalyzerBase):
         pydantic_schema: Type[BaseModel] = None,
         model: str = "gpt-4o-mini",
         max_content_size: int = 10000,
-        max_workers: int = 3):
+        max_workers: int = 3,
+        cache: LlmResponseCache = None,
+        chunk_tokens: int = None,
+        max_chunks: int = 8,
+        reducer: Callable[[List[Dict[str, Any]]], Dict[str, Any]] | str = None,
+        batch_mode: bool = False,
+        batch_poll_interval: float = 30.0,
+        batch_timeout: float = None):
         """Initializes the OpenAiAnalyzer instance.
         
         Args:
@@ -27,14 +47,27 @@ class OpenAiAnalyzer(LlmAnalyzerBase):
             model (str, optional): The model identifier to be used for generating completions. Defaults to "gpt-4o-mini".
             max_content_size (int, optional): The maximum length of the content to analyze. Defaults to 10000.
             max_workers (int, optional): The maximum number of workers for concurrent analysis. Defaults to 3.
+            cache (LlmResponseCache, optional): The on-disk cache of responses. Defaults to None for no caching.
+            chunk_tokens (int, optional): The maximum tokens per chunk to split long content into instead of truncating it. Defaults to None.
+            max_chunks (int, optional): The maximum number of chunks analyzed per content. Defaults to 8.
+            reducer (Callable|str, optional): Combines the chunk outputs. See LlmAnalyzerBase.reducer. Defaults to a field-wise merge.
+            batch_mode (bool, optional): Whether analyze_multiple() submits batch jobs. Defaults to False.
+            batch_poll_interval (float, optional): The seconds between checks on a batch job's status. Defaults to 30.
+            batch_timeout (float, optional): The seconds to wait for a batch job before cancelling it. Defaults to None for no limit.
         """
         super().__init__(
             instruction=instruction, pydantic_schema=pydantic_schema,
-            max_content_size=max_content_size, max_workers=max_workers)
+            max_content_size=max_content_size, max_workers=max_workers, cache=cache,
+            chunk_tokens=chunk_tokens, max_chunks=max_chunks, reducer=reducer)
         self.api_key = api_key
         self.organization = organization
         self.client = AsyncOpenAI(api_key=api_key, organization=organization)
         self.model = model
+        assert batch_poll_interval > 0, "batch_poll_interval must be positive"
+        assert batch_timeout is None or batch_timeout > 0, "batch_timeout must be positive or None"
+        self.batch_mode = batch_mode
+        self.batch_poll_interval = batch_poll_interval
+        self.batch_timeout = batch_timeout
         
         # Connect to OpenAi synchronously to ensure the API key and model are valid
         self.validate()
@@ -57,14 +90,147 @@ class OpenAiAnalyzer(LlmAnalyzerBase):
         Returns:
             str: The content of the response message generated by the language model.
         """
+        response = await self.client.chat.completions.create(**self._build_request(content, instruction))
+        response_content: str = response.choices[0].message.content
+        return response_content
+    
+    def _build_request(self, content: str, instruction: str) -> Dict[str, Any]:
+        # The chat completion parameters, shared by direct queries and batch jobs
         messages = [
             {"role": "system", "content": instruction},
             {"role": "user", "content": content}
         ]
-        response = await self.client.chat.completions.create(
+        return dict(
             model=self.model,
             messages=messages,
             response_format={ "type": "json_object" }
         )
-        response_content: str = response.choices[0].message.content
-        return response_content
\ No newline at end of file
+    
+    def analyze_multiple(self, contents: dict) -> Generator[Tuple[str, AnalysisResult], None, None]:
+        """Analyzes multiple contents, as batch jobs if batch_mode is set.
+
+        Args:
+            contents (dict): The contents to analyze, keyed by link.
+
+        Returns:
+            Generator[Tuple[str, AnalysisResult], None, None]: A generator yielding each link and its result.
+        """
+        if not self.batch_mode:
+            yield from super().analyze_multiple(contents)
+            return
+        yield from self.analyze_batch(contents).items()
+    
+    def analyze_batch(self, contents: Dict[str, str]) -> Dict[str, AnalysisResult]:
+        """Synchronously analyzes multiple contents as batch jobs. Wraps async_analyze_batch().
+
+        Args:
+            contents (Dict[str, str]): The contents to analyze, keyed by link.
+
+        Returns:
+            Dict[str, AnalysisResult]: The result for each link.
+        """
+        return AsyncManager.get_executor().run(self.async_analyze_batch(contents))
+    
+    async def async_analyze_batch(self, contents: Dict[str, str]) -> Dict[str, AnalysisResult]:
+        """Analyzes multiple contents as OpenAI batch jobs.
+
+        The requests are uploaded as a JSONL file, submitted as batch jobs of up to BATCH_MAX_REQUESTS,
+        and polled every batch_poll_interval seconds until they finish. Contents are truncated and
+        validated like in async_analyze(), and cached responses are reused without being submitted.
+        The rate limiter is not used, since a batch job is a single request. Chunking is not supported.
+
+        Args:
+            contents (Dict[str, str]): The contents to analyze, keyed by link.
+
+        Returns:
+            Dict[str, AnalysisResult]: The result for each link, in input order.
+        """
+        assert self.chunk_tokens is None, "Batch jobs do not support chunking; set chunk_tokens to None."
+        results: Dict[str, AnalysisResult] = {}
+        # Each pending request is (link, truncated content, cache key)
+        pending: List[Tuple[str, str, str]] = []
+        for link, content in contents.items():
+            if not isinstance(content, str) or len(content) == 0:
+                results[link] = AnalysisResult.fail("Content is not a valid string.")
+                continue
+            content = content[:self.max_content_size]
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.get_cache_key(content)
+                response = self.cache.get(cache_key)
+                if response is not None:
+                    results[link] = self._parse_response(response)
+                    continue
+            results[link] = None
+            pending.append((link, content, cache_key))
+        
+        chunks = [pending[i:i + self.BATCH_MAX_REQUESTS] for i in range(0, len(pending), self.BATCH_MAX_REQUESTS)]
+        for chunk_results in await asyncio.gather(*(self._run_batch(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return results
+    
+    async def _run_batch(self, requests: List[Tuple[str, str, str]]) -> Dict[str, AnalysisResult]:
+        # Custom ids are request indices, since links may be long or contain any characters
+        lines = [
+            json.dumps({"custom_id": str(i), "method": "POST", "url": self.BATCH_ENDPOINT,
+                        "body": self._build_request(content, self.instruction)})
+            for i, (_, content, _) in enumerate(requests)]
+        try:
+            input_file = await self.client.files.create(
+                file=("scraipe_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id, endpoint=self.BATCH_ENDPOINT, completion_window="24h")
+            batch = await self._wait_for_batch(batch)
+            responses, errors = await self._read_batch_results(batch)
+        except Exception as e:
+            return {link: AnalysisResult.fail(f"Failed to query LLM: {e}") for link, _, _ in requests}
+        
+        results = {}
+        for i, (link, _, cache_key) in enumerate(requests):
+            custom_id = str(i)
+            if custom_id in responses:
+                result = self._parse_response(responses[custom_id])
+                if cache_key is not None and result.analysis_success:
+                    self.cache.set(cache_key, responses[custom_id])
+            elif custom_id in errors:
+                result = AnalysisResult.fail(f"Failed to query LLM: {errors[custom_id]}")
+            else:
+                result = AnalysisResult.fail(f"Failed to query LLM: batch {batch.id} ended with status {batch.status}")
+            results[link] = result
+        return results
+    
+    async def _wait_for_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        deadline = None if self.batch_timeout is None else loop.time() + self.batch_timeout
+        while batch.status not in self.BATCH_TERMINAL_STATUSES:
+            if deadline is not None and loop.time() >= deadline:
+                await self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"batch {batch.id} did not finish within {self.batch_timeout} seconds and was cancelled")
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        return batch
+    
+    async def _read_batch_results(self, batch) -> Tuple[Dict[str, str], Dict[str, str]]:
+        # Returns the response content and the error of each custom id
+        responses: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        # Finished requests are in the output file even if the batch expired or was cancelled
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            file_content = await self.client.files.content(file_id)
+            for line in file_content.text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                custom_id = record["custom_id"]
+                response = record.get("response") or {}
+                body = response.get("body") or {}
+                if record.get("error"):
+                    errors[custom_id] = record["error"].get("message", record["error"])
+                elif response.get("status_code") != 200:
+                    message = (body.get("error") or {}).get("message", "")
+                    errors[custom_id] = f"status {response.get('status_code')}: {message}"
+                else:
+                    responses[custom_id] = body["choices"][0]["message"]["content"]
+        return responses, errors
\ No newline at end of file
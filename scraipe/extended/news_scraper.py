@@ -1,29 +1,44 @@
-import aiohttp
 import trafilatura
 from scraipe.classes import ScrapeResult
-from scraipe.async_classes import IAsyncScraper
+from scraipe.defaults.http_scraper_base import HttpScraperBase
+from typing import Sequence
 
-class NewsScraper(IAsyncScraper):
+class NewsScraper(HttpScraperBase):
     """A scraper that uses aiohttp and trafilatura to extract article content.
     
     Retrieves HTML content from a given URL and extracts the main article text 
     using the trafilatura library. Handles HTTP errors by raising exceptions or 
-    returning a failed ScrapeResult.
+    returning a failed ScrapeResult. Downloads are capped at max_bytes and
+    non-HTML content types are rejected before the body is read.
     """
     DEFAULT_USER_AGENT = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/58.0.3029.110 Safari/537.36"
     )
+    DEFAULT_CONTENT_TYPES = ["text/html", "application/xhtml+xml", "text/plain"]
 
-    def __init__(self, headers=None):
+    def __init__(self, headers=None,
+        max_bytes: int | None = HttpScraperBase.DEFAULT_MAX_BYTES,
+        allowed_content_types: Sequence[str] | None = DEFAULT_CONTENT_TYPES,
+        max_retries: int = HttpScraperBase.DEFAULT_MAX_RETRIES):
         """Initialize the NewsScraper with optional custom headers.
 
         Args:
             headers (dict, optional): A dictionary of HTTP headers to use for requests.
                 Defaults to a User-Agent header.
+            max_bytes (int, optional): The maximum response body size in bytes. Downloads are
+                aborted once exceeded. Defaults to 10 MiB. None disables the cap.
+            allowed_content_types (Sequence[str], optional): Glob patterns of accepted mimetypes,
+                checked before the body is read. Defaults to HTML and plain text. None accepts any.
+            max_retries (int, optional): The number of retries after a 429, 502, 503 or 504
+                response or a connection error. Defaults to 2. 0 disables retries.
         """
-        self.headers = headers or {"User-Agent": NewsScraper.DEFAULT_USER_AGENT}
+        super().__init__(
+            headers=headers or {"User-Agent": NewsScraper.DEFAULT_USER_AGENT},
+            max_bytes=max_bytes,
+            allowed_content_types=allowed_content_types,
+            max_retries=max_retries)
         
     async def get_site_html(self, url: str) -> str:
         """Retrieve HTML content from the specified URL using aiohttp.
@@ -35,13 +50,10 @@ class NewsScraper(IAsyncScraper):
             str: The HTML content of the webpage.
         
         Raises:
-            aiohttp.ClientResponseError: If the HTTP response status is not 200.
+            HttpFetchError: If the HTTP response status is not 200 or the response is rejected.
         """
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to scrape {url}. Status code: {response.status}")
-                return await response.text()
+        page = await self.fetch(url)
+        return page.text()
 
     async def async_scrape(self, url: str) -> ScrapeResult:
         """Asynchronously scrape the specified URL and extract its content.
@@ -11,6 +11,8 @@ class TelegramNewsScraper(MultiScraper):
     This scraper uses a dedicated telegram_scraper for Telegram links, 
     a news_scraper for standard news links, and a text_scraper as fallback.
     If these are not provided, default configurations (NewsScraper, TextScraper) are used.
+    Pass rule_learner=DomainRuleLearner() to go straight to the text scraper on domains
+    where news extraction keeps failing.
     """
     
     def __init__(
@@ -2,6 +2,8 @@ import asyncio
 import pytest
 from scraipe.classes import ScrapeResult
 from scraipe.async_classes import IAsyncScraper
+from scraipe.async_util.limiters import TokenBucketRateLimiter
+import time
 
 # Dummy subclass with a concrete implementation for testing
 class DummyScraper(IAsyncScraper):
@@ -35,4 +37,122 @@ def test_scrape_multiple():
     assert set(results.keys()) == set(urls)
     for url in urls:
         assert results[url].link == url
-        assert results[url].content == f"content for {url}"
\ No newline at end of file
+        assert results[url].content == f"content for {url}"
+
+class ThrottledScraper(IAsyncScraper):
+    """Returns 429 whenever more than `capacity` scrapes run at once."""
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.capacity = capacity
+        self.running = 0
+    async def async_scrape(self, url: str) -> ScrapeResult:
+        self.running += 1
+        try:
+            await asyncio.sleep(0.005)
+            if self.running > self.capacity:
+                return ScrapeResult.fail(url, f"Failed to scrape {url}. Status code: 429")
+            return ScrapeResult.succeed(url, "ok")
+        finally:
+            self.running -= 1
+
+def test_is_overloaded():
+    scraper = DummyScraper()
+    assert scraper.is_overloaded(ScrapeResult.fail("x", "Failed to scrape x. Status code: 503"))
+    assert scraper.is_overloaded(ScrapeResult.fail("x", "Task timed out after 10 seconds."))
+    assert not scraper.is_overloaded(ScrapeResult.fail("x", "Failed to scrape x. Status code: 404"))
+    assert not scraper.is_overloaded(ScrapeResult.succeed("x", "ok"))
+
+def test_adaptive_concurrency_grows_when_healthy():
+    scraper = DummyScraper()
+    limiter = scraper.enable_adaptive_concurrency(initial_workers=1, max_workers=8, latency_tolerance=None)
+    urls = [f"http://example.com/{i}" for i in range(100)]
+    results = dict(scraper.scrape_multiple(urls))
+    assert len(results) == len(urls)
+    assert limiter.limit > 1
+    limits = [limit for _, limit in limiter.history]
+    assert limits == sorted(limits)
+
+def test_adaptive_concurrency_backs_off_on_429():
+    scraper = ThrottledScraper(capacity=2)
+    limiter = scraper.enable_adaptive_concurrency(initial_workers=16, max_workers=16, latency_tolerance=None)
+    results = dict(scraper.scrape_multiple([f"http://example.com/{i}" for i in range(100)]))
+    assert len(results) == 100
+    assert limiter.limit < 16
+    assert min(limit for _, limit in limiter.history) <= 2
+    scraper.disable_adaptive_concurrency()
+    assert scraper.adaptive_concurrency is None
+
+def test_rate_limiter_shared_between_scrapers():
+    limiter = TokenBucketRateLimiter(50)
+    first, second = DummyScraper(), DummyScraper()
+    first.rate_limiter = limiter
+    second.rate_limiter = limiter
+    start = time.monotonic()
+    results = list(first.scrape_multiple([f"http://a.com/{i}" for i in range(3)]))
+    results += list(second.scrape_multiple([f"http://b.com/{i}" for i in range(3)]))
+    assert len(results) == 6
+    # Six requests at 50/s share one quota
+    assert time.monotonic() - start >= 0.09
+
+def test_rate_limited_links_are_not_timed_out():
+    # More links than the quota allows within one timeout
+    scraper = DummyScraper()
+    scraper.rate_limiter = TokenBucketRateLimiter(40)
+    scraper.timeout = 0.25
+    urls = [f"http://example.com/{i}" for i in range(40)]
+    start = time.monotonic()
+    results = dict(scraper.scrape_multiple(urls))
+    assert set(results) == set(urls)
+    assert all(result.scrape_success for result in results.values())
+    assert time.monotonic() - start >= 0.9
+
+class SlowCountingScraper(IAsyncScraper):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+    async def async_scrape(self, url: str) -> ScrapeResult:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if "fail" in url:
+            raise ValueError("boom")
+        return ScrapeResult.succeed(url, f"content for {url}", metadata={"calls": self.calls})
+
+@pytest.mark.asyncio
+async def test_concurrent_scrapes_coalesced():
+    scraper = SlowCountingScraper()
+    results = await asyncio.gather(*[scraper.dispatch_scrape("http://example.com") for _ in range(5)])
+    assert scraper.calls == 1
+    assert all(result.content == "content for http://example.com" for result in results)
+    # Each caller gets its own copy
+    results[1].metadata["calls"] = 99
+    assert results[2].metadata["calls"] == 1
+    assert len({id(result) for result in results}) == 5
+    # Finished scrapes are not cached
+    await scraper.dispatch_scrape("http://example.com")
+    assert scraper.calls == 2
+
+@pytest.mark.asyncio
+async def test_coalesced_exception_shared():
+    scraper = SlowCountingScraper()
+    results = await asyncio.gather(*[scraper.dispatch_scrape("http://example.com/fail") for _ in range(3)], return_exceptions=True)
+    assert scraper.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+@pytest.mark.asyncio
+async def test_coalescing_survives_cancelled_leader():
+    scraper = SlowCountingScraper()
+    leader = asyncio.ensure_future(scraper.dispatch_scrape("http://example.com"))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(scraper.dispatch_scrape("http://example.com"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    result = await follower
+    assert result.scrape_success
+    assert scraper.calls == 2
+
+@pytest.mark.asyncio
+async def test_coalescing_disabled():
+    scraper = SlowCountingScraper()
+    scraper.coalesce_scrapes = False
+    await asyncio.gather(*[scraper.dispatch_scrape("http://example.com") for _ in range(3)])
+    assert scraper.calls == 3
@@ -1,6 +1,7 @@
 import pytest
 import asyncio
 from scraipe.async_util.async_executors import IAsyncExecutor, EventLoopPoolExecutor, DefaultBackgroundExecutor
+from scraipe.async_util.limiters import idle_slot
 from asdftimer import AsdfTimer as Timer
 
 @pytest.fixture(params=[DefaultBackgroundExecutor,EventLoopPoolExecutor])
@@ -107,6 +108,24 @@ def test_run_multiple_timeout(executor:IAsyncExecutor):
         assert "timed out" in error
         print("asdf")
 
+def test_run_multiple_timeout_excludes_idle_time(executor:IAsyncExecutor):
+    async def waits_idle():
+        # Waiting without the slot, e.g. for a rate limiter token, does not count
+        async with idle_slot():
+            await asyncio.sleep(0.3)
+        await asyncio.sleep(0.05)
+        return "ok"
+    async def stays_busy():
+        async with idle_slot():
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(1000)
+
+    results = list(executor.run_multiple([waits_idle() for _ in range(3)], max_workers=1, timeout=0.2))
+    assert results == [("ok", None)] * 3
+    [(result, error)] = list(executor.run_multiple([stays_busy()], timeout=0.2))
+    assert result is None
+    assert "timed out" in error
+
 @pytest.mark.asyncio
 async def test_async_run_multiple(executor:IAsyncExecutor):
     async def async_task(x):
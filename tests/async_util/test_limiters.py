@@ -0,0 +1,231 @@
+import pytest
+import asyncio
+import threading
+from scraipe.async_util.limiters import ConcurrencyLimiter, AdaptiveConcurrencyLimiter, TokenBucketRateLimiter, idle_slot
+import time
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    limiter = ConcurrencyLimiter(2)
+    peak = 0
+    async def work():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*[work() for _ in range(6)])
+    assert peak == 2
+    assert limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_idle_slot_lets_others_run():
+    limiter = ConcurrencyLimiter(1)
+    order = []
+    async def sleeper():
+        async with limiter.slot():
+            order.append("sleeper start")
+            async with idle_slot():
+                await asyncio.sleep(0.05)
+            order.append("sleeper end")
+    async def worker():
+        await asyncio.sleep(0.01)
+        async with limiter.slot():
+            order.append("worker")
+    await asyncio.gather(sleeper(), worker())
+    assert order == ["sleeper start", "worker", "sleeper end"]
+    assert limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_idle_slot_without_slot_is_noop():
+    async with idle_slot():
+        await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+    assert limiter.active == 0
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+    limiter.release()
+
+@pytest.mark.asyncio
+async def test_cancelled_during_idle_does_not_double_release():
+    limiter = ConcurrencyLimiter(1)
+    async def sleeper():
+        async with limiter.slot():
+            async with idle_slot():
+                await asyncio.sleep(0.01)
+    task = asyncio.ensure_future(sleeper())
+    await asyncio.sleep(0)
+    await limiter.acquire()
+    # Let the sleeper finish idling and block on taking its slot back
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.active == 1
+    limiter.release()
+    assert limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_idle_task_does_not_wait_for_slot():
+    limiter = ConcurrencyLimiter(1)
+    async def sleeper():
+        async with limiter.slot():
+            async with idle_slot():
+                await asyncio.sleep(5)
+    async def holder():
+        async with limiter.slot():
+            await asyncio.sleep(2)
+    task = asyncio.ensure_future(sleeper())
+    await asyncio.sleep(0)
+    hold = asyncio.ensure_future(holder())
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(task, timeout=0.2)
+    assert asyncio.get_running_loop().time() - start < 1
+    assert limiter.active == 1
+    hold.cancel()
+
+@pytest.mark.asyncio
+async def test_set_limit_wakes_waiters():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    limiter.set_limit(2)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.active == 2
+
+def test_shared_across_event_loops():
+    limiter = ConcurrencyLimiter(1)
+    active = []
+    peak = []
+    def run():
+        async def work():
+            async with limiter.slot():
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+        async def main():
+            await asyncio.gather(*[work() for _ in range(3)])
+        asyncio.run(main())
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 1
+    assert limiter.active == 0
+
+def test_aimd_additive_increase():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4, latency_tolerance=None)
+    for _ in range(2):
+        limiter.record(0.1)
+    assert limiter.limit == 3
+    for _ in range(3):
+        limiter.record(0.1)
+    assert limiter.limit == 4
+    for _ in range(10):
+        limiter.record(0.1)
+    assert limiter.limit == 4
+    assert [limit for _, limit in limiter.history] == [2, 3, 4]
+
+def test_aimd_multiplicative_decrease_once_per_window():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2, max_limit=32)
+    limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 8
+    # The rest of the burst belongs to the same congestion event
+    for _ in range(7):
+        limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 8
+    limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 4
+    for _ in range(20):
+        limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 2
+
+def test_aimd_holds_when_latency_rises():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_tolerance=2.0)
+    limiter.record(0.1)
+    for _ in range(10):
+        limiter.record(0.5)
+    assert limiter.limit == 2
+
+@pytest.mark.asyncio
+async def test_aimd_increase_wakes_waiters():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, latency_tolerance=None)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    limiter.record(0.1)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.active == 2
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests():
+    limiter = TokenBucketRateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire()
+    elapsed = time.monotonic() - start
+    # The first token is free; the remaining five are spaced 20 ms apart
+    assert 0.09 <= elapsed < 0.5
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst():
+    limiter = TokenBucketRateLimiter(1, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+@pytest.mark.asyncio
+async def test_token_bucket_pause():
+    limiter = TokenBucketRateLimiter(1000, burst=10)
+    limiter.pause(0.1)
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+@pytest.mark.asyncio
+async def test_token_bucket_cancel_refunds():
+    limiter = TokenBucketRateLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    # The cancelled reservation no longer delays the next caller by a full extra period
+    assert limiter._reserve(0) < 1.0
+
+def test_token_bucket_shared_across_event_loops():
+    limiter = TokenBucketRateLimiter(100, per=1)
+    times = []
+    lock = threading.Lock()
+    def run():
+        async def main():
+            for _ in range(5):
+                await limiter.acquire()
+                with lock:
+                    times.append(time.monotonic())
+        asyncio.run(main())
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 20 requests at 100/s with no burst need at least 190 ms
+    assert max(times) - start >= 0.18
@@ -1,8 +1,35 @@
 import pytest
 import typing
+from unittest.mock import MagicMock
+
 def skip_if_no_capture(request) -> bool|typing.NoReturn:
     capture_option = request.config.option.capture
     if capture_option != "no":
         pytest.skip("The -s flag is not set. Test requires interaction.")
         assert False, "wtf"
-    return False
\ No newline at end of file
+    return False
+
+def mock_http_response(mock_session_cls, status:int=200, body:bytes=b"", headers:dict=None, chunk_size:int=None) -> MagicMock:
+    """Configure a patched aiohttp.ClientSession to return a response that streams body."""
+    chunk_size = chunk_size or max(len(body), 1)
+    async def iter_chunked(n):
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+    mock_response = MagicMock()
+    mock_response.status = status
+    mock_response.headers = headers if headers is not None else {}
+    mock_response.content.iter_chunked = iter_chunked
+    mock_session = MagicMock()
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    return mock_response
+
+def mock_http_response_sequence(mock_session_cls, responses:list) -> list:
+    """Configure a patched aiohttp.ClientSession to return one response per request.
+
+    Each item of responses is a dict of mock_http_response keyword arguments.
+    """
+    mocks = [mock_http_response(mock_session_cls, **kwargs) for kwargs in responses]
+    mock_session = mock_session_cls.return_value.__aenter__.return_value
+    mock_session.get.return_value.__aenter__.side_effect = mocks
+    return mocks
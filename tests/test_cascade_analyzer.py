@@ -0,0 +1,69 @@
+import asyncio
+from scraipe.classes import AnalysisResult, IAnalyzer
+from scraipe.async_classes import IAsyncAnalyzer
+from scraipe.defaults.cascade_analyzer import CascadeAnalyzer
+from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer, count_text
+
+class CountingLlmAnalyzer(IAsyncAnalyzer):
+    def __init__(self, succeed=True):
+        super().__init__()
+        self.calls = 0
+        self.succeed = succeed
+    async def async_analyze(self, content):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.succeed:
+            return AnalysisResult.succeed({"summary": content[:5]})
+        return AnalysisResult.fail("llm failure")
+
+class FailingGate(IAnalyzer):
+    def analyze(self, content):
+        return AnalysisResult.fail("gate failure")
+
+def long_enough(stats):
+    return stats["word_count"] >= 3
+
+def test_gate_blocks_expensive_analyzer():
+    llm = CountingLlmAnalyzer()
+    cascade = CascadeAnalyzer(TextStatsAnalyzer(), long_enough, [llm])
+    result = cascade.analyze("too short")
+    assert result.analysis_success
+    assert result.output[CascadeAnalyzer.PASSED_KEY] is False
+    assert result.output["word_count"] == 2
+    assert "summary" not in result.output
+    assert llm.calls == 0
+
+def test_gate_passes_to_analyzers():
+    llm = CountingLlmAnalyzer()
+    cascade = CascadeAnalyzer(TextStatsAnalyzer(), long_enough, [llm], debug=True)
+    result = cascade.analyze("long enough content here")
+    assert result.analysis_success
+    assert result.output[CascadeAnalyzer.PASSED_KEY] is True
+    assert result.output["summary"] == "long "
+    assert result.output["word_count"] == 4
+    assert llm.calls == 1
+
+def test_all_analyzers_failing_fails_cascade():
+    cascade = CascadeAnalyzer(TextStatsAnalyzer(), long_enough, [CountingLlmAnalyzer(succeed=False)])
+    result = cascade.analyze("long enough content here")
+    assert not result.analysis_success
+    assert "llm failure" in result.analysis_error
+
+def test_failing_gate_fails_cascade():
+    llm = CountingLlmAnalyzer()
+    result = CascadeAnalyzer(FailingGate(), long_enough, [llm]).analyze("content")
+    assert not result.analysis_success
+    assert "gate failure" in result.analysis_error
+    assert llm.calls == 0
+
+def test_gate_artifacts_shared():
+    calls = []
+    def counts(content):
+        calls.append(content)
+        return count_text(content)
+    second_stats = TextStatsAnalyzer()
+    cascade = CascadeAnalyzer(TextStatsAnalyzer(), long_enough, [second_stats], preprocessors={"text_counts": counts})
+    result = cascade.analyze("long enough content here")
+    assert result.output["TextStatsAnalyzer-1_word_count"] == 4
+    # Computed once for the gate and reused by the analyzers
+    assert len(calls) == 1
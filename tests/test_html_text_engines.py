@@ -0,0 +1,61 @@
+import pytest
+from pathlib import Path
+from scraipe.defaults.html_text_engines import (
+    Bs4TextEngine, TEXT_ENGINES, available_text_engines, get_text_engine, IHtmlTextEngine
+)
+from scraipe.defaults.text_scraper import TextScraper
+
+CORPUS_DIR = Path(__file__).parent.parent / "benchmarks" / "corpus"
+CORPUS = sorted(CORPUS_DIR.glob("*.html"))
+
+def read_page(path: Path) -> str:
+    # Keep original line endings
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+@pytest.fixture(params=list(TEXT_ENGINES))
+def engine(request) -> IHtmlTextEngine:
+    if request.param not in available_text_engines():
+        pytest.skip(f"{request.param} is not installed.")
+    return get_text_engine(request.param)
+
+def test_corpus_not_empty():
+    assert len(CORPUS) > 0
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: p.name)
+def test_corpus_parity(engine, path):
+    html = read_page(path)
+    expected = Bs4TextEngine().extract_text(html)
+    assert engine.extract_text(html) == expected
+
+@pytest.mark.parametrize("html", [
+    "",
+    "   ",
+    "plain text without tags",
+    "<p>unclosed <b>bold <i>italic</p> after",
+    "<b>a</b>   <i>b</i>\n\n<div>\n   </div>c",
+    "<pre>  keep\n    <span>indent</span>\n</pre>",
+    "<p>one\r\ntwo\rthree</p>",
+])
+def test_snippet_parity(engine, html):
+    expected = Bs4TextEngine().extract_text(html)
+    assert engine.extract_text(html) == expected
+
+def test_hidden_content_removed(engine):
+    html = "<html><head><style>p{}</style><script>var x;</script></head><body><!-- c --><p>Visible</p><template>t</template></body></html>"
+    assert engine.extract_text(html) == "Visible"
+
+def test_auto_falls_back_to_installed_engine():
+    engine = get_text_engine("auto")
+    assert engine.name == available_text_engines()[0]
+    assert Bs4TextEngine.name in available_text_engines()
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_text_engine("not-an-engine")
+
+def test_text_scraper_engine():
+    engine = Bs4TextEngine()
+    scraper = TextScraper(engine=engine)
+    assert scraper.text_engine is engine
+    assert TextScraper(engine="bs4").text_engine.name == "bs4"
@@ -0,0 +1,334 @@
+import pytest
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+from scraipe.defaults.http_scraper_base import (
+    HttpScraperBase, HttpFetchError, FetchResult, parse_content_type, decode_body, normalize_charset,
+    parse_retry_after, supported_content_encodings, shared_fetch_cache, ACCEPT_ENCODING
+)
+from scraipe.defaults.raw_scraper import RawScraper
+from scraipe.defaults.text_scraper import TextScraper
+from tests.common import mock_http_response, mock_http_response_sequence
+
+def test_parse_content_type():
+    assert parse_content_type(None) == (None, None)
+    assert parse_content_type("text/html") == ("text/html", None)
+    assert parse_content_type('Text/HTML; Charset="ISO-8859-1"') == ("text/html", "ISO-8859-1")
+
+def test_content_type_patterns():
+    scraper = RawScraper(allowed_content_types=["text/*", "application/*+json"])
+    assert scraper.is_content_type_allowed("text/html")
+    assert scraper.is_content_type_allowed("application/ld+json")
+    assert not scraper.is_content_type_allowed("application/pdf")
+    # Undeclared content types are accepted
+    assert scraper.is_content_type_allowed(None)
+    assert RawScraper(allowed_content_types=None).is_content_type_allowed("video/mp4")
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_body_streamed_within_cap(mock_session_cls):
+    mock_http_response(mock_session_cls, body=b"a" * 100, chunk_size=10)
+    scraper = RawScraper(max_bytes=100)
+    result = await scraper.async_scrape("https://example.com")
+    assert result.scrape_success
+    assert result.content == "a" * 100
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_body_over_cap_aborts(mock_session_cls):
+    mock_response = mock_http_response(mock_session_cls, body=b"a" * 100, chunk_size=10)
+    scraper = RawScraper(max_bytes=50)
+    result = await scraper.async_scrape("https://example.com")
+    assert not result.scrape_success
+    assert "exceeds 50 bytes" in result.scrape_error
+    mock_response.close.assert_called_once()
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_content_length_rejected_before_read(mock_session_cls):
+    mock_response = mock_http_response(mock_session_cls, body=b"a" * 10, headers={"Content-Length": "200000000"})
+    mock_response.content.iter_chunked = None  # Reading the body would fail
+    scraper = RawScraper(max_bytes=1024)
+    with pytest.raises(HttpFetchError) as e:
+        await scraper.fetch("https://example.com/video.mp4")
+    assert "Content length 200000000" in str(e.value)
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_content_type_rejected_before_read(mock_session_cls):
+    mock_response = mock_http_response(mock_session_cls, body=b"%PDF-1.7", headers={"Content-Type": "application/pdf"})
+    mock_response.content.iter_chunked = None  # Reading the body would fail
+    scraper = TextScraper()
+    result = await scraper.async_scrape("https://example.com/file.pdf")
+    assert not result.scrape_success
+    assert "application/pdf is not allowed" in result.scrape_error
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_declared_charset_used(mock_session_cls):
+    mock_http_response(mock_session_cls, body="café".encode("latin-1"), headers={"Content-Type": "text/plain; charset=latin-1"})
+    result = await RawScraper().async_scrape("https://example.com")
+    assert result.content == "café"
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_non_200_raises(mock_session_cls):
+    mock_http_response(mock_session_cls, status=500)
+    with pytest.raises(HttpFetchError) as e:
+        await RawScraper().fetch("https://example.com")
+    assert e.value.status == 500
+
+def test_news_scraper_settings():
+    pytest.importorskip("trafilatura")
+    from scraipe.extended.news_scraper import NewsScraper
+    scraper = NewsScraper(max_bytes=2048)
+    assert isinstance(scraper, HttpScraperBase)
+    assert scraper.max_bytes == 2048
+    assert not scraper.is_content_type_allowed("image/png")
+
+@pytest.mark.parametrize("body,declared,expected_text,expected_source", [
+    ("café".encode("utf-8"), None, "café", "utf-8"),
+    ("café".encode("cp1252"), "windows-1252", "café", "header"),
+    ("﻿café".encode("utf-8"), "latin-1", "café", "bom"),
+    ('<html><head><meta charset="iso-8859-1"></head>café</html>'.encode("latin-1"), None,
+     '<html><head><meta charset="iso-8859-1"></head>café</html>', "meta"),
+    ('<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">привет'.encode("koi8-r"), None,
+     '<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">привет', "meta"),
+    ('<?xml version="1.0" encoding="ISO-8859-1"?><a>é</a>'.encode("latin-1"), None,
+     '<?xml version="1.0" encoding="ISO-8859-1"?><a>é</a>', "meta"),
+])
+def test_decode_body(body, declared, expected_text, expected_source):
+    text, source = decode_body(body, declared)
+    assert text == expected_text
+    assert source == expected_source
+
+def test_decode_body_unknown_header_charset():
+    text, source = decode_body(b"plain", "not-a-charset")
+    assert text == "plain"
+    assert source == "utf-8"
+
+def test_decode_body_sniffs_undeclared_non_utf8():
+    body = ("Le café était très bon, merci beaucoup à vous. " * 20).encode("latin-1")
+    text, source = decode_body(body)
+    assert source in ("sniff", "fallback")
+    if source == "sniff":
+        # Detection is heuristic; a single-byte codec must be chosen
+        assert len(text) == len(body)
+
+def test_normalize_charset():
+    assert normalize_charset("UTF8") == "utf-8"
+    assert normalize_charset(" Latin-1 ") == "iso8859-1"
+    assert normalize_charset("bogus") is None
+    assert normalize_charset(None) is None
+
+def test_accept_encoding_advertised():
+    scraper = RawScraper()
+    headers = scraper.get_request_headers()
+    assert headers["Accept-Encoding"] == ACCEPT_ENCODING
+    assert "gzip" in supported_content_encodings()
+    # User-provided encodings are respected
+    custom = RawScraper(headers={"User-Agent": "x", "accept-encoding": "identity"})
+    assert custom.get_request_headers() == {"User-Agent": "x", "accept-encoding": "identity"}
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_stats_counters(mock_session_cls):
+    mock_http_response(mock_session_cls, body=b"hello world", headers={"Content-Type": "text/plain; charset=utf-8"})
+    scraper = RawScraper()
+    await scraper.async_scrape("https://example.com/1")
+    await scraper.async_scrape("https://example.com/2")
+    stats = scraper.stats.snapshot()
+    assert stats["responses"] == 2
+    assert stats["body_bytes"] == 22
+    assert stats["decodes"] == 2
+    assert stats["decode_seconds"] >= 0
+    assert stats["charset_sources"] == {"header": 2}
+    scraper.stats.reset()
+    assert scraper.stats.snapshot()["responses"] == 0
+    assert mock_session_cls.call_args.kwargs["headers"]["Accept-Encoding"] == ACCEPT_ENCODING
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Records retry delays instead of sleeping."""
+    delays = []
+    real_sleep = asyncio.sleep
+    async def fake_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+    monkeypatch.setattr("scraipe.defaults.http_scraper_base.asyncio.sleep", fake_sleep)
+    return delays
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(future) <= 30
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_retries_transient_status(mock_session_cls, no_backoff):
+    mock_http_response_sequence(mock_session_cls, [
+        {"status": 503},
+        {"status": 429},
+        {"body": b"ok"},
+    ])
+    result = await RawScraper().async_scrape("https://example.com")
+    assert result.scrape_success
+    assert result.content == "ok"
+    assert len(no_backoff) == 2
+    # Full jitter stays under the doubling ceiling
+    assert 0 <= no_backoff[0] <= HttpScraperBase.RETRY_BACKOFF_BASE
+    assert 0 <= no_backoff[1] <= HttpScraperBase.RETRY_BACKOFF_BASE * 2
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_retries_exhausted(mock_session_cls, no_backoff):
+    mock_http_response_sequence(mock_session_cls, [{"status": 503}] * 2)
+    result = await RawScraper(max_retries=1).async_scrape("https://example.com")
+    assert not result.scrape_success
+    assert "Status code: 503" in result.scrape_error
+    assert len(no_backoff) == 1
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_non_transient_status_not_retried(mock_session_cls, no_backoff):
+    mock_http_response_sequence(mock_session_cls, [{"status": 404}, {"body": b"ok"}])
+    result = await RawScraper().async_scrape("https://example.com")
+    assert not result.scrape_success
+    assert no_backoff == []
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_retry_after_honored(mock_session_cls, no_backoff):
+    mock_http_response_sequence(mock_session_cls, [
+        {"status": 429, "headers": {"Retry-After": "2"}},
+        {"body": b"ok"},
+    ])
+    result = await TextScraper().async_scrape("https://example.com")
+    assert result.scrape_success
+    assert 2 <= no_backoff[0] <= 2 + HttpScraperBase.RETRY_BACKOFF_BASE
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_retry_after_too_long_gives_up(mock_session_cls, no_backoff):
+    mock_http_response_sequence(mock_session_cls, [
+        {"status": 503, "headers": {"Retry-After": "3600"}},
+        {"body": b"ok"},
+    ])
+    with pytest.raises(HttpFetchError) as e:
+        await RawScraper().fetch("https://example.com")
+    assert e.value.status == 503
+    assert e.value.retry_after == 3600
+    assert no_backoff == []
+
+def test_retry_delay_capped():
+    scraper = RawScraper(max_retries=20)
+    for attempt in range(1, 21):
+        assert 0 <= scraper.get_retry_delay(attempt) <= HttpScraperBase.RETRY_BACKOFF_MAX
+    assert scraper.get_retry_delay(21) is None
+
+def test_retry_budget_caps_total_wait():
+    scraper = RawScraper(max_retries=20)
+    assert scraper.get_retry_delay(1, waited=HttpScraperBase.RETRY_BUDGET) is None
+    assert scraper.get_retry_delay(5, waited=HttpScraperBase.RETRY_BUDGET - 0.1) <= 0.1
+    # A Retry-After that does not fit in the remaining budget is not honored
+    assert scraper.get_retry_delay(1, retry_after=2, waited=HttpScraperBase.RETRY_BUDGET - 1) is None
+
+@patch("aiohttp.ClientSession")
+def test_scrape_multiple_keeps_links_that_back_off(mock_session_cls, no_backoff):
+    """Links that back off must still produce a result instead of timing out in the executor."""
+    mock_http_response_sequence(mock_session_cls, [
+        {"status": 429, "headers": {"Retry-After": "9"}},
+        {"status": 503, "headers": {"Retry-After": "1"}},
+        {"body": b"ok"},
+    ])
+    scraper = RawScraper()
+    scraper.max_workers = 1
+    results = dict(scraper.scrape_multiple(["https://example.com/a", "https://example.com/b"]))
+    assert set(results) == {"https://example.com/a", "https://example.com/b"}
+    # Task start order is not deterministic, so either link may receive the long Retry-After
+    failed = [result for result in results.values() if not result.scrape_success]
+    succeeded = [result for result in results.values() if result.scrape_success]
+    assert len(failed) == 1 and "Status code: 429" in failed[0].scrape_error
+    assert len(succeeded) == 1 and succeeded[0].content == "ok"
+    assert sum(no_backoff) <= HttpScraperBase.RETRY_BUDGET
+
+def test_backoff_releases_concurrency_slot():
+    """A task backing off must not block other links from being scraped."""
+    from scraipe.async_util.async_executors import DefaultBackgroundExecutor
+    order = []
+    class FlakyScraper(RawScraper):
+        RETRY_BACKOFF_BASE = 0.2
+        attempts = 0
+        async def _fetch_once(self, url):
+            if url == "flaky":
+                FlakyScraper.attempts += 1
+                if FlakyScraper.attempts == 1:
+                    raise HttpFetchError("busy", status=503, retry_after=0.2)
+            order.append(url)
+            return FetchResult(url, 200, None, None, b"")
+    scraper = FlakyScraper()
+    executor = DefaultBackgroundExecutor()
+    try:
+        tasks = [scraper.async_scrape("flaky"), scraper.async_scrape("steady")]
+        results = list(executor.run_multiple(tasks, max_workers=1))
+    finally:
+        executor.shutdown()
+    assert all(error is None for _, error in results)
+    assert order == ["steady", "flaky"]
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_rate_limiter_per_attempt(mock_session_cls, no_backoff):
+    from unittest.mock import AsyncMock, MagicMock
+    mock_http_response_sequence(mock_session_cls, [
+        {"status": 429, "headers": {"Retry-After": "1"}},
+        {"body": b"ok"},
+    ])
+    scraper = RawScraper()
+    scraper.rate_limiter = MagicMock()
+    scraper.rate_limiter.acquire = AsyncMock()
+    result = await scraper.dispatch_scrape("https://example.com")
+    assert result.scrape_success
+    # One token per attempt, none extra for the dispatch itself
+    assert scraper.rate_limiter.acquire.await_count == 2
+    scraper.rate_limiter.pause.assert_called_once_with(1.0)
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_shared_fetch_cache_reuses_download(mock_session_cls):
+    mock_http_response(mock_session_cls, body=b"<p>hello</p>", headers={"Content-Type": "text/html"})
+    raw, text = RawScraper(), TextScraper()
+    with shared_fetch_cache():
+        assert (await raw.async_scrape("https://example.com")).content == "<p>hello</p>"
+        assert (await text.async_scrape("https://example.com")).content == "hello"
+    mock_session = mock_session_cls.return_value.__aenter__.return_value
+    assert mock_session.get.call_count == 1
+    assert text.stats.snapshot()["cache_hits"] == 1
+    # Outside the scope every scrape downloads the page
+    await text.async_scrape("https://example.com")
+    assert mock_session.get.call_count == 2
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_shared_fetch_cache_applies_each_scrapers_limits(mock_session_cls):
+    mock_http_response(mock_session_cls, body=b"%PDF-1.7" * 10, headers={"Content-Type": "application/pdf"})
+    with shared_fetch_cache():
+        assert (await RawScraper().async_scrape("https://example.com/a.pdf")).scrape_success
+        result = await TextScraper().async_scrape("https://example.com/a.pdf")
+        assert "application/pdf is not allowed" in result.scrape_error
+        result = await RawScraper(max_bytes=10).async_scrape("https://example.com/a.pdf")
+        assert "exceeds 10 bytes" in result.scrape_error
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_shared_fetch_cache_reuses_http_errors(mock_session_cls):
+    mock_http_response(mock_session_cls, status=404)
+    with shared_fetch_cache():
+        await RawScraper().async_scrape("https://example.com/missing")
+        result = await TextScraper().async_scrape("https://example.com/missing")
+    assert "Status code: 404" in result.scrape_error
+    assert mock_session_cls.return_value.__aenter__.return_value.get.call_count == 1
@@ -1,6 +1,11 @@
+import json
 import pytest
+from unittest.mock import AsyncMock
 from pydantic import BaseModel, ValidationError
+from scraipe.extended.llm_analyzers import llm_chunking
 from scraipe.extended.llm_analyzers.llm_analyzer_base import LlmAnalyzerBase
+from scraipe.extended.llm_analyzers.llm_response_cache import LlmResponseCache
+from scraipe.async_util.limiters import TokenBucketRateLimiter
 from scraipe.classes import AnalysisResult
 
 class MockAnalyzer(LlmAnalyzerBase):
@@ -57,4 +62,147 @@ async def test_async_analyze_schema_validation_fail():
     analyzer = MockAnalyzer(instruction="Test instruction", pydantic_schema=MockSchema)
     result = await analyzer.async_analyze("schema_fail")
     assert not result.success
-    assert "OpenAI response does not follow the pydantic schema" in result.error
\ No newline at end of file
+    assert "OpenAI response does not follow the pydantic schema" in result.error
+
+@pytest.mark.asyncio
+async def test_rate_limiter_applied_once_per_query():
+    analyzer = MockAnalyzer(instruction="Test instruction")
+    analyzer.rate_limiter = TokenBucketRateLimiter(1000)
+    analyzer.rate_limiter.acquire = AsyncMock()
+    result = await analyzer.dispatch_analyze("valid content")
+    assert result.success
+    # The analyzer throttles its own queries, so dispatch_analyze does not take a second token
+    assert analyzer.rate_limiter.acquire.await_count == 1
+
+class CountingAnalyzer(MockAnalyzer):
+    """MockAnalyzer that counts its queries."""
+    queries = 0
+    async def query_llm(self, content: str, instruction: str) -> str:
+        self.queries += 1
+        return await super().query_llm(content, instruction)
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_query_and_rate_limiter(tmp_path):
+    cache = LlmResponseCache(tmp_path)
+    analyzer = CountingAnalyzer(instruction="Test instruction", pydantic_schema=MockSchema, cache=cache)
+    analyzer.rate_limiter = TokenBucketRateLimiter(1000)
+    analyzer.rate_limiter.acquire = AsyncMock()
+    first = await analyzer.async_analyze("valid content")
+    # A new analyzer sharing the directory reuses the response across runs
+    second_analyzer = CountingAnalyzer(instruction="Test instruction", pydantic_schema=MockSchema,
+                                       cache=LlmResponseCache(tmp_path))
+    second = await second_analyzer.async_analyze("valid content")
+    assert first.success and second.success
+    assert second.output == first.output
+    assert analyzer.queries == 1 and second_analyzer.queries == 0
+    assert analyzer.rate_limiter.acquire.await_count == 1
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert (second_analyzer.cache.hits, second_analyzer.cache.misses) == (1, 0)
+
+@pytest.mark.asyncio
+async def test_cache_key_covers_instruction_schema_and_truncated_content(tmp_path):
+    cache = LlmResponseCache(tmp_path)
+    analyzer = CountingAnalyzer(instruction="Test instruction", max_content_size=13, cache=cache)
+    await analyzer.async_analyze("valid content")
+    # Same content after truncation
+    await analyzer.async_analyze("valid content that is truncated")
+    assert analyzer.queries == 1
+    await analyzer.async_analyze("valid content!"[1:])
+    assert analyzer.queries == 2
+    other_instruction = CountingAnalyzer(instruction="Other instruction", max_content_size=13, cache=cache)
+    await other_instruction.async_analyze("valid content")
+    assert other_instruction.queries == 1
+    with_schema = CountingAnalyzer(instruction="Test instruction", pydantic_schema=MockSchema, max_content_size=13, cache=cache)
+    await with_schema.async_analyze("valid content")
+    assert with_schema.queries == 1
+    assert (cache.hits, cache.misses) == (1, 4)
+
+@pytest.mark.asyncio
+async def test_cache_stores_only_valid_responses(tmp_path):
+    cache = LlmResponseCache(tmp_path)
+    analyzer = CountingAnalyzer(instruction="Test instruction", pydantic_schema=MockSchema, cache=cache)
+    for content in ["error", "invalid_json", "schema_fail"]:
+        assert not (await analyzer.async_analyze(content)).success
+        assert not (await analyzer.async_analyze(content)).success
+    assert analyzer.queries == 6
+    assert cache.hits == 0
+    assert not list(tmp_path.glob("*/*.json"))
+
+def test_response_cache_roundtrip_and_clear(tmp_path):
+    cache = LlmResponseCache(tmp_path / "cache")
+    key = LlmResponseCache.make_key(["a", "bc"])
+    assert key != LlmResponseCache.make_key(["ab", "c"])
+    assert cache.get(key) is None
+    cache.set(key, '{"ключ": 1}')
+    cache.set(key, '{"ключ": 2}')
+    assert cache.get(key) == '{"ключ": 2}'
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+class ChunkSchema(BaseModel):
+    words: list[str]
+    first: str
+
+class ChunkAnalyzer(LlmAnalyzerBase):
+    """Returns the words of each chunk."""
+    async def query_llm(self, content: str, instruction: str) -> str:
+        if "Merge them" in instruction:
+            outputs = json.loads(content)
+            return json.dumps({"words": ["merged"], "first": outputs[0]["first"]})
+        if "broken" in content:
+            raise Exception("Mock LLM error")
+        words = content.split()
+        return json.dumps({"words": words, "first": words[0]})
+
+LONG_CONTENT = " ".join(f"w{i:03d}" for i in range(200))
+
+@pytest.mark.asyncio
+async def test_chunking_merges_outputs_instead_of_truncating():
+    analyzer = ChunkAnalyzer(instruction="List words", pydantic_schema=ChunkSchema, max_content_size=10, chunk_tokens=25, max_chunks=100)
+    result = await analyzer.async_analyze(LONG_CONTENT)
+    assert result.success
+    assert result.output["words"] == LONG_CONTENT.split()
+    assert result.output["first"] == "w000"
+
+@pytest.mark.asyncio
+async def test_chunking_bounds_queries(monkeypatch):
+    monkeypatch.setattr(llm_chunking, "_tiktoken", None)
+    analyzer = ChunkAnalyzer(instruction="List words", pydantic_schema=ChunkSchema, chunk_tokens=25, max_chunks=3)
+    queries = []
+    original = analyzer.query_llm
+    async def counting_query(content, instruction):
+        queries.append(content)
+        return await original(content, instruction)
+    analyzer.query_llm = counting_query
+    result = await analyzer.async_analyze(LONG_CONTENT)
+    assert result.success
+    assert len(queries) == 3
+    assert all(len(query) <= 25 * llm_chunking.CHARS_PER_TOKEN for query in queries)
+    assert LONG_CONTENT.startswith(" ".join(result.output["words"]))
+
+@pytest.mark.asyncio
+async def test_chunking_reducers():
+    analyzer = ChunkAnalyzer(instruction="List words", pydantic_schema=ChunkSchema, chunk_tokens=25,
+                             reducer=ChunkAnalyzer.REDUCE_WITH_LLM)
+    result = await analyzer.async_analyze(LONG_CONTENT)
+    assert result.output == {"words": ["merged"], "first": "w000"}
+    
+    analyzer.reducer = lambda outputs: {"words": [str(len(outputs))], "first": outputs[-1]["first"]}
+    result = await analyzer.async_analyze(LONG_CONTENT)
+    assert result.output == {"words": ["8"], "first": result.output["first"]}
+    assert result.output["first"] != "w000"
+    
+    analyzer.reducer = lambda outputs: {"words": "not a list"}
+    result = await analyzer.async_analyze(LONG_CONTENT)
+    assert not result.success
+    assert "schema" in result.error
+
+@pytest.mark.asyncio
+async def test_chunking_fails_if_a_chunk_fails():
+    analyzer = ChunkAnalyzer(instruction="List words", chunk_tokens=25)
+    result = await analyzer.async_analyze("broken " + LONG_CONTENT)
+    assert not result.success
+    assert "Failed to analyze chunk" in result.error
+    assert "Mock LLM error" in result.error
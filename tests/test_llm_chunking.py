@@ -0,0 +1,47 @@
+import pytest
+from scraipe.extended.llm_analyzers import llm_chunking
+from scraipe.extended.llm_analyzers.llm_chunking import split_into_chunks, count_tokens, merge_outputs
+
+@pytest.fixture
+def no_tiktoken(monkeypatch):
+    monkeypatch.setattr(llm_chunking, "_tiktoken", None)
+
+def test_split_estimates_tokens_without_tiktoken(no_tiktoken):
+    text = " ".join(f"word{i}" for i in range(1000))
+    chunks = split_into_chunks(text, chunk_tokens=50)
+    assert "".join(chunks) == text
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks)
+    # Chunks end after whitespace, so words are not split
+    assert all(chunk.endswith(" ") for chunk in chunks[:-1])
+
+def test_split_without_whitespace(no_tiktoken):
+    text = "x" * 1001
+    chunks = split_into_chunks(text, chunk_tokens=100)
+    assert [len(chunk) for chunk in chunks] == [400, 400, 201]
+
+def test_split_max_chunks_bounds_tokens():
+    text = "lorem ipsum dolor sit amet " * 2000
+    chunks = split_into_chunks(text, chunk_tokens=64, max_chunks=3)
+    assert len(chunks) == 3
+    assert sum(count_tokens(chunk) for chunk in chunks) <= 3 * 64
+    assert text.startswith("".join(chunks))
+
+def test_split_short_text():
+    assert split_into_chunks("short", chunk_tokens=100) == ["short"]
+
+def test_merge_outputs():
+    outputs = [
+        {"topic": "Rome", "people": ["Ann", "Bob"], "urgent": False, "meta": {"tags": ["a"]}, "note": ""},
+        {"topic": "Paris", "people": ["Bob", "Cy"], "urgent": True, "meta": {"tags": ["b"]}, "note": None},
+        {"topic": "Paris", "people": [], "urgent": False, "meta": {"tags": ["a"]}},
+    ]
+    assert merge_outputs(outputs) == {
+        "topic": "Paris",
+        "people": ["Ann", "Bob", "Cy"],
+        "urgent": True,
+        "meta": {"tags": ["a", "b"]},
+        "note": "",
+    }
+
+def test_merge_outputs_prefers_earliest_on_ties():
+    assert merge_outputs([{"city": "Rome"}, {"city": None}, {"city": "Paris"}]) == {"city": "Rome"}
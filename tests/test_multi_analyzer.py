@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+import threading
 from scraipe.classes import AnalysisResult, IAnalyzer
 from scraipe.async_classes import IAsyncAnalyzer
 from scraipe.defaults.multi_analyzer import MultiAnalyzer
@@ -90,4 +91,119 @@ def test_mixed_sync_async():
     assert result.output.get("sync_key") == "sync_value"
     assert result.output.get("async_key") == "async_value"
     # Both analyzers succeeded so their debug indications should be present
-    assert result.error.count("SUCCESS") == 2
\ No newline at end of file
+    assert result.error.count("SUCCESS") == 2
+class SlowSyncAnalyzer(IAnalyzer):
+    def __init__(self, key):
+        self.key = key
+    def analyze(self, content):
+        import time, threading
+        time.sleep(0.2)
+        return AnalysisResult.succeed({self.key: threading.current_thread().name})
+
+class SlowAsyncAnalyzer(IAsyncAnalyzer):
+    async def async_analyze(self, content):
+        await asyncio.sleep(0.2)
+        return AnalysisResult.succeed({"async": True})
+
+def test_sync_analyzers_overlap():
+    import time
+    ma = MultiAnalyzer([SlowSyncAnalyzer("a"), SlowSyncAnalyzer("b"), SlowSyncAnalyzer("c"), SlowAsyncAnalyzer()])
+    start = time.perf_counter()
+    result = ma.analyze("content")
+    elapsed = time.perf_counter() - start
+    assert result.analysis_success
+    assert set(result.output) == {"a", "b", "c", "async"}
+    # About as long as the slowest analyzer rather than the sum
+    assert elapsed < 0.5
+
+def test_sync_executor_configurable():
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="analyzer-pool") as pool:
+        ma = MultiAnalyzer([SlowSyncAnalyzer("a")], sync_executor=pool)
+        result = ma.analyze("content")
+    assert result.output["a"].startswith("analyzer-pool")
+
+class WordConsumer(IAnalyzer):
+    uses_artifacts = ("words",)
+    def __init__(self, key):
+        self.key = key
+        self.received = None
+    def analyze(self, content):
+        return AnalysisResult.succeed({self.key: len(content.split())})
+    def analyze_with_artifacts(self, content, artifacts):
+        self.received = artifacts
+        return AnalysisResult.succeed({self.key: len(artifacts["words"])})
+
+class AsyncWordConsumer(IAsyncAnalyzer):
+    uses_artifacts = ("words", "unknown")
+    received = None
+    async def async_analyze(self, content):
+        return AnalysisResult.succeed({"async_words": len(content.split())})
+    async def async_analyze_with_artifacts(self, content, artifacts):
+        self.received = artifacts
+        return AnalysisResult.succeed({"async_words": len(artifacts["words"])})
+
+def test_preprocessors_run_once_per_document():
+    calls = []
+    def words(content):
+        calls.append(content)
+        return content.split()
+    first, second, async_consumer = WordConsumer("a"), WordConsumer("b"), AsyncWordConsumer()
+    ma = MultiAnalyzer([first, second, async_consumer, DummySyncAnalyzerSuccess()],
+                       preprocessors={"words": words, "unused": lambda content: content.upper()})
+    result = ma.analyze("one two three")
+    assert result.output["a"] == result.output["b"] == result.output["async_words"] == 3
+    assert calls == ["one two three"]
+    # Each member receives only the artifacts it uses and that are available
+    assert first.received == {"words": ["one", "two", "three"]}
+    assert async_consumer.received == {"words": ["one", "two", "three"]}
+
+def test_failing_preprocessor_falls_back():
+    def broken(content):
+        raise ValueError("boom")
+    consumer = WordConsumer("a")
+    ma = MultiAnalyzer([consumer], preprocessors={"words": broken})
+    result = ma.analyze("one two")
+    assert result.output["a"] == 2
+    assert consumer.received is None
+
+def test_text_stats_with_shared_artifacts():
+    from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer
+    content = "Hello world! This is a test. It's shared?"
+    # The default preprocessors provide the counts, without lists of words or sentences
+    ma = MultiAnalyzer([TextStatsAnalyzer()])
+    assert ma.analyze(content).output == TextStatsAnalyzer().analyze(content).output
+    long_content = content * 1000
+    assert ma.analyze(long_content).output == TextStatsAnalyzer().analyze(long_content).output
+
+def test_text_stats_counts_shared_once():
+    from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer, count_text
+    calls = []
+    def counts(content):
+        calls.append(content)
+        return count_text(content)
+    ma = MultiAnalyzer([TextStatsAnalyzer(), TextStatsAnalyzer()], preprocessors={"text_counts": counts})
+    result = ma.analyze("One two. Three")
+    assert result.output["TextStatsAnalyzer-1_word_count"] == 3
+    assert calls == ["One two. Three"]
+
+class LockedAsyncAnalyzer(IAsyncAnalyzer):
+    """Holds a lock, so it cannot be pickled."""
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+    async def async_analyze(self, content):
+        with self.lock:
+            return AnalysisResult.succeed({"locked": True})
+
+def test_preprocessors_run_in_process_pool():
+    from concurrent.futures import ProcessPoolExecutor
+    from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer
+    content = "Hello world! This is a test. It's shared?"
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        # Only the preprocessors are sent to the pool, not the unpicklable members
+        ma = MultiAnalyzer([TextStatsAnalyzer(), LockedAsyncAnalyzer()], sync_executor=pool)
+        result = ma.analyze(content)
+    assert result.analysis_success
+    assert result.output["locked"]
+    assert result.output["word_count"] == TextStatsAnalyzer().analyze(content).output["word_count"]
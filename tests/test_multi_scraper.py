@@ -1,9 +1,18 @@
+import asyncio
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 import pytest
-from scraipe.defaults.multi_scraper import MultiScraper, IngressRule
+import scraipe.defaults.multi_scraper as multi_scraper
+from scraipe.defaults.multi_scraper import MultiScraper, IngressRule, DomainRuleLearner, CircuitBreaker, IngressRouter, _extract_host
+from scraipe.defaults.raw_scraper import RawScraper
+from scraipe.defaults.text_scraper import TextScraper
 from scraipe.classes import ScrapeResult
 from scraipe import IScraper
 from scraipe.async_classes import IAsyncScraper  # added import
+from tests.common import mock_http_response
 
 # Dummy scraper that always returns success.
 class DummySuccessScraper(IScraper):
@@ -75,4 +84,303 @@ def test_async_and_sync_scrapers():
     url = "http://example.com/async"
     result = ms.scrape(url)
     assert result.scrape_success is True
-    assert "[SUCCESS]" in result.scrape_error
\ No newline at end of file
+    assert "[SUCCESS]" in result.scrape_error
+
+def test_fallback_rules_share_fetch():
+    class EmptyExtractScraper(RawScraper):
+        async def async_scrape(self, url):
+            await self.fetch(url)
+            return ScrapeResult.fail(url, "No content extracted")
+    with patch("aiohttp.ClientSession") as mock_session_cls:
+        mock_http_response(mock_session_cls, body=b"<p>fallback text</p>", headers={"Content-Type": "text/html"})
+        ms = MultiScraper([IngressRule(r".*", EmptyExtractScraper()), IngressRule(r".*", TextScraper())])
+        result = ms.scrape("https://example.com/article")
+        assert result.scrape_success
+        assert result.content == "fallback text"
+        assert mock_session_cls.return_value.__aenter__.return_value.get.call_count == 1
+
+ROUTING_PATTERNS = [
+    r"t.me/\w+/\d+", r".*", r"^https?://(?:www\.)?reddit\.com/r/\w+", re.compile(r"NEWS", re.IGNORECASE),
+    r"(a)\1", r"(?i)example", r"\.pdf$", r"^$", r"(?P<host>[\w.]+)/wiki/", r"news\.(?:com|org)", r"(?i)story",
+]
+ROUTING_URLS = [
+    "https://t.me/channel/123", "https://www.reddit.com/r/python/comments/1", "http://news.com/story",
+    "https://aa.example.org/file.PDF", "https://en.wikipedia.org/wiki/Regex", "", "https://EXAMPLE.com/x.pdf",
+    # Matches (?i)story only through Unicode case folding of the long s
+    "https://\u017ftory.com/",
+]
+
+def test_router_matches_per_rule_search():
+    rules = [IngressRule(pattern, DummySuccessScraper()) for pattern in ROUTING_PATTERNS]
+    router = IngressRouter(rules)
+    for url in ROUTING_URLS:
+        expected = [rule for rule in rules if rule.pattern.search(url)]
+        assert router.route(url) == expected, url
+
+def test_router_rebuilt_when_rules_change():
+    first = IngressRule(r"first", DummySuccessScraper())
+    ms = MultiScraper([first])
+    assert ms.route("http://first.com") == [first]
+    second = IngressRule(r"second", DummySuccessScraper())
+    ms.ingress_rules.append(second)
+    assert ms.route("http://first.com/second") == [first, second]
+    ms.ingress_rules = [second]
+    assert ms.route("http://first.com/second") == [second]
+
+@pytest.mark.parametrize("url,host", [
+    ("https://www.Reddit.com/r/python", "www.reddit.com"),
+    ("http://user:pw@example.com:8080/path?q=1", "example.com"),
+    ("t.me/channel/1", "t.me"),
+    ("https://[::1]:443/x", "[::1]"),
+    ("https://example.com?q=a/b", "example.com"),
+])
+def test_extract_host(url, host):
+    assert _extract_host(url) == host
+
+def test_host_rules_cached_per_host():
+    reddit = IngressRule(r"(?:^|\.)reddit\.com$", DummySuccessScraper(), match_host=True)
+    fallback = IngressRule(r".*", DummySuccessScraper())
+    ms = MultiScraper([reddit, fallback])
+    assert ms.route("https://www.reddit.com/r/a") == [reddit, fallback]
+    assert ms.route("https://www.reddit.com/r/b") == [reddit, fallback]
+    # The host is matched, not the path
+    assert ms.route("https://example.com/reddit.com") == [fallback]
+    info = ms._get_router().cache_info()
+    assert info.hits == 1 and info.misses == 2
+
+def test_host_and_url_rules_mixed():
+    reddit = IngressRule(r"reddit\.com$", DummySuccessScraper(), match_host=True)
+    comments = IngressRule(r"/comments/", DummySuccessScraper())
+    ms = MultiScraper([comments, reddit])
+    assert ms.route("https://reddit.com/r/a/comments/1") == [comments, reddit]
+    assert ms.route("https://reddit.com/r/a") == [reddit]
+    assert ms.route("https://example.com/comments/") == [comments]
+
+def test_route_cache_invalidated_when_rules_change():
+    first = IngressRule(r"example\.com$", DummySuccessScraper(), match_host=True)
+    ms = MultiScraper([first])
+    assert ms.route("https://example.com/") == [first]
+    second = IngressRule(r"^example", DummySuccessScraper(), match_host=True)
+    ms.ingress_rules.insert(0, second)
+    assert ms.route("https://example.com/") == [second, first]
+    assert ms._get_router().cache_info().currsize == 1
+
+class SlowSyncScraper(IScraper):
+    def scrape(self, url: str) -> ScrapeResult:
+        time.sleep(0.2)
+        return ScrapeResult.succeed(url, threading.current_thread().name)
+
+def test_sync_scrapers_run_concurrently_off_loop():
+    ms = MultiScraper([IngressRule(r".*", SlowSyncScraper())])
+    ms.max_workers = 4
+    start = time.perf_counter()
+    results = dict(ms.scrape_multiple([f"http://example.com/{i}" for i in range(4)]))
+    assert time.perf_counter() - start < 0.6
+    assert all(result.scrape_success for result in results.values())
+
+def test_sync_executor_configurable():
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="sync-scrape") as pool:
+        ms = MultiScraper([IngressRule(r".*", SlowSyncScraper())], sync_executor=pool)
+        result = ms.scrape("http://example.com")
+    assert result.content.startswith("sync-scrape")
+
+class TimedAsyncScraper(IAsyncScraper):
+    """Sleeps for `delay` seconds, then succeeds or fails."""
+    def __init__(self, delay: float, succeed: bool):
+        super().__init__()
+        self.delay = delay
+        self.succeed = succeed
+        self.started = 0
+        self.cancelled = 0
+    async def async_scrape(self, url: str) -> ScrapeResult:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.succeed:
+            return ScrapeResult.succeed(url, f"{self.delay}")
+        return ScrapeResult.fail(url, "failed")
+
+def test_hedging_starts_fallback_early():
+    slow_fail = TimedAsyncScraper(0.4, succeed=False)
+    fast = TimedAsyncScraper(0.1, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", slow_fail), IngressRule(r".*", fast)], hedge_delay=0.05)
+    start = time.perf_counter()
+    result = ms.scrape("http://example.com")
+    elapsed = time.perf_counter() - start
+    assert result.content == "0.1"
+    # The fallback ran while the first scraper was still working
+    assert elapsed < 0.45
+    assert fast.started == 1
+
+def test_hedging_keeps_rule_priority():
+    slow_success = TimedAsyncScraper(0.2, succeed=True)
+    fast = TimedAsyncScraper(0.05, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", slow_success), IngressRule(r".*", fast)], hedge_delay=0.01, debug=True)
+    result = ms.scrape("http://example.com")
+    # The first rule's success wins even though the hedge finished earlier
+    assert result.content == "0.2"
+    assert fast.started == 1
+
+def test_hedging_cancels_unneeded_hedges():
+    first = TimedAsyncScraper(0.1, succeed=True)
+    second = TimedAsyncScraper(0.5, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", first), IngressRule(r".*", second)], hedge_delay=0.02)
+    assert ms.scrape("http://example.com").content == "0.1"
+    assert second.started == 1 and second.cancelled == 1
+
+def test_hedging_respects_exclusive_rules():
+    exclusive = TimedAsyncScraper(0.1, succeed=False)
+    after = TimedAsyncScraper(0.01, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", exclusive, exclusive=True), IngressRule(r".*", after)], hedge_delay=0.01)
+    assert not ms.scrape("http://example.com").scrape_success
+    assert after.started == 0
+
+def test_hedge_delay_p95():
+    scraper = TimedAsyncScraper(0.0, succeed=True)
+    rule = IngressRule(r".*", scraper)
+    ms = MultiScraper([rule, IngressRule(r".*", DummySuccessScraper())], hedge_delay="p95")
+    assert ms.get_hedge_delay(rule) == MultiScraper.HEDGE_P95_DEFAULT_DELAY
+    for i in range(MultiScraper.HEDGE_P95_MIN_SAMPLES):
+        ms.scrape(f"http://example.com/{i}")
+    assert ms.get_hedge_delay(rule) < 0.05
+
+class CountingScraper(IScraper):
+    """Succeeds only for links containing `works_on`, counting attempts."""
+    def __init__(self, works_on: str):
+        self.works_on = works_on
+        self.attempts = 0
+    def scrape(self, url: str) -> ScrapeResult:
+        self.attempts += 1
+        if self.works_on in url:
+            return ScrapeResult.succeed(url, self.works_on)
+        return ScrapeResult.fail(url, "failed")
+
+def test_rule_learner_demotes_failing_rule_per_domain():
+    news = CountingScraper("news.example")
+    text = CountingScraper("")
+    learner = DomainRuleLearner(min_attempts=3)
+    ms = MultiScraper([IngressRule(r".*", news), IngressRule(r".*", text)], rule_learner=learner)
+    for i in range(3):
+        ms.scrape(f"http://blog.example/{i}")
+    assert learner.success_rate("blog.example", ms.ingress_rules[0]) == 0
+    news.attempts = text.attempts = 0
+    # The text scraper is now tried first on this domain
+    assert ms.scrape("http://blog.example/next").content == ""
+    assert news.attempts == 0 and text.attempts == 1
+    # Other domains keep the configured order
+    assert ms.scrape("http://news.example/1").content == "news.example"
+    assert news.attempts == 1
+
+def test_rule_learner_skips_and_probes():
+    failing = CountingScraper("never")
+    fallback = CountingScraper("")
+    learner = DomainRuleLearner(min_attempts=2, skip_below=0.0, probe_every=3)
+    ms = MultiScraper([IngressRule(r".*", failing), IngressRule(r".*", fallback)], rule_learner=learner)
+    ms.scrape("http://a.example/1")
+    ms.scrape("http://a.example/2")
+    failing.attempts = 0
+    for i in range(6):
+        assert ms.scrape(f"http://a.example/{i}").scrape_success
+    # Skipped except for one probe every three links
+    assert failing.attempts == 2
+
+def test_rule_learner_keeps_exclusive_rule_in_place():
+    first = CountingScraper("never")
+    exclusive = CountingScraper("")
+    rules = [IngressRule(r".*", first), IngressRule(r".*", exclusive, exclusive=True), IngressRule(r".*", DummySuccessScraper())]
+    learner = DomainRuleLearner(min_attempts=1)
+    learner.record("a.example", rules[0], False)
+    assert learner.order("a.example", rules) == [rules[0], rules[1]]
+
+def test_circuit_breaker_states(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(multi_scraper.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    now[0] += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+def test_circuit_breaker_skips_failing_rule(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(multi_scraper.time, "monotonic", lambda: now[0])
+    down = CountingScraper("never")
+    fallback = CountingScraper("")
+    ms = MultiScraper([IngressRule(r".*", down), IngressRule(r".*", fallback)], breaker_threshold=3, breaker_cooldown=30, debug=True)
+    for i in range(5):
+        result = ms.scrape(f"http://example.com/{i}")
+        assert result.scrape_success
+    assert down.attempts == 3
+    assert MultiScraper.CIRCUIT_OPEN_ERROR in result.scrape_error
+    # Probed again after the cool-down
+    now[0] += 30
+    ms.scrape("http://example.com/probe")
+    assert down.attempts == 4
+    ms.scrape("http://example.com/again")
+    assert down.attempts == 4
+
+def test_rule_timeout_falls_back():
+    hung = TimedAsyncScraper(5, succeed=True)
+    fallback = TimedAsyncScraper(0.01, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", hung, timeout=0.05), IngressRule(r".*", fallback)], debug=True)
+    result = ms.scrape("http://example.com")
+    assert result.content == "0.01"
+    assert "Timed out" in result.scrape_error
+    assert hung.cancelled == 1
+
+def test_link_timeout_split_across_chain():
+    first = TimedAsyncScraper(5, succeed=True)
+    second = TimedAsyncScraper(5, succeed=True)
+    third = TimedAsyncScraper(0.01, succeed=True)
+    rules = [IngressRule(r".*", first), IngressRule(r".*", second), IngressRule(r".*", third)]
+    ms = MultiScraper(rules, link_timeout=0.3)
+    assert ms.timeout == 0.3 + MultiScraper.LINK_TIMEOUT_GRACE
+    start = time.perf_counter()
+    result = ms.scrape("http://example.com")
+    elapsed = time.perf_counter() - start
+    # Each slow rule got a share of the budget, leaving time for the last one
+    assert result.content == "0.01"
+    assert elapsed < 0.3
+
+def test_link_timeout_stops_chain_when_spent():
+    slow = TimedAsyncScraper(5, succeed=True)
+    never_run = TimedAsyncScraper(0.01, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", slow, timeout=0.1), IngressRule(r".*", never_run)], link_timeout=0.1)
+    result = ms.scrape("http://example.com")
+    assert not result.scrape_success
+    assert never_run.started == 0
+
+def test_scrape_multiple_uses_link_timeout():
+    hung = TimedAsyncScraper(5, succeed=True)
+    ms = MultiScraper([IngressRule(r".*", hung)], link_timeout=0.05)
+    results = dict(ms.scrape_multiple(["http://a.example", "http://b.example"]))
+    # The chain reports its own failure instead of being dropped by the executor
+    assert len(results) == 2
+    assert all(not result.scrape_success for result in results.values())
+
+def test_hedging_stops_when_link_budget_spent():
+    slow = TimedAsyncScraper(5, succeed=True)
+    never_run = TimedAsyncScraper(0.01, succeed=True)
+    rules = [IngressRule(r".*", slow), IngressRule(r".*", never_run)]
+    learner = DomainRuleLearner(min_attempts=1)
+    ms = MultiScraper(rules, hedge_delay=1.0, link_timeout=0.1, breaker_threshold=1, rule_learner=learner)
+    result = ms.scrape("http://a.example/1")
+    assert not result.scrape_success
+    # The spent budget is not held against the rule that never ran
+    assert never_run.started == 0
+    assert ms.get_circuit_breaker(rules[1]).failures == 0
+    assert learner.success_rate("a.example", rules[1]) is None
+    assert learner.success_rate("a.example", rules[0]) == 0.0
@@ -1,8 +1,9 @@
 import pytest
 import asyncio
+import json
 from unittest.mock import patch, AsyncMock, MagicMock
 
-from scraipe.extended.llm_analyzers import OpenAiAnalyzer
+from scraipe.extended.llm_analyzers import OpenAiAnalyzer, LlmResponseCache
 import pydantic
 
 TARGET_MODULE = OpenAiAnalyzer.__module__
@@ -82,4 +83,134 @@ async def test_analyze_schema_validation_failure(mock_query_llm, analyzer):
     content = TEST_CONTENT
     analysis_result = await analyzer.async_analyze(content)
     assert not analysis_result.analysis_success
-    assert "schema" in analysis_result.analysis_error
\ No newline at end of file
+    assert "schema" in analysis_result.analysis_error
+
+class FakeBatchClient:
+    """A local stand-in for the OpenAI file and batch endpoints.
+    
+    Each batch is answered by respond(body), which returns the response content or raises to fail the request.
+    Requests whose content contains "unfinished" are left out of the output, as if the batch expired.
+    """
+    def __init__(self, respond, polls_until_done=2, final_status="completed"):
+        self.respond = respond
+        self.polls_until_done = polls_until_done
+        self.final_status = final_status
+        self.uploads = []
+        self.retrieves = 0
+        self.cancelled = []
+        self.files = MagicMock()
+        self.files.create = AsyncMock(side_effect=self._create_file)
+        self.files.content = AsyncMock(side_effect=self._file_content)
+        self.batches = MagicMock()
+        self.batches.create = AsyncMock(side_effect=self._create_batch)
+        self.batches.retrieve = AsyncMock(side_effect=self._retrieve_batch)
+        self.batches.cancel = AsyncMock(side_effect=self.cancelled.append)
+        self._files = {}
+        self._batches = {}
+    
+    async def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        name, data = file
+        file_id = f"file-{len(self._files)}"
+        self._files[file_id] = data.decode("utf-8")
+        self.uploads.append([json.loads(line) for line in self._files[file_id].splitlines()])
+        return MagicMock(id=file_id)
+    
+    async def _create_batch(self, input_file_id, endpoint, completion_window):
+        batch_id = f"batch-{len(self._batches)}"
+        self._batches[batch_id] = {"input": input_file_id, "polls": 0}
+        return MagicMock(id=batch_id, status="validating", output_file_id=None, error_file_id=None)
+    
+    async def _retrieve_batch(self, batch_id):
+        self.retrieves += 1
+        state = self._batches[batch_id]
+        state["polls"] += 1
+        if state["polls"] < self.polls_until_done:
+            return MagicMock(id=batch_id, status="in_progress", output_file_id=None, error_file_id=None)
+        outputs, errors = [], []
+        for request in map(json.loads, self._files[state["input"]].splitlines()):
+            content = request["body"]["messages"][1]["content"]
+            if "unfinished" in content:
+                continue
+            try:
+                body = {"choices": [{"message": {"content": self.respond(request["body"])}}]}
+                outputs.append({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}, "error": None})
+            except Exception as e:
+                body = {"error": {"message": str(e)}}
+                errors.append({"custom_id": request["custom_id"], "response": {"status_code": 400, "body": body}, "error": None})
+        output_id, error_id = f"{batch_id}-output", f"{batch_id}-errors"
+        self._files[output_id] = "\n".join(map(json.dumps, outputs))
+        self._files[error_id] = "\n".join(map(json.dumps, errors))
+        return MagicMock(id=batch_id, status=self.final_status, output_file_id=output_id, error_file_id=error_id)
+    
+    async def _file_content(self, file_id):
+        return MagicMock(text=self._files[file_id])
+
+def respond_with_city(body):
+    content = body["messages"][1]["content"]
+    if "bad request" in content:
+        raise ValueError("Invalid request")
+    if "no schema" in content:
+        return '{"city": "Rome"}'
+    return '{"location": "Rome"}'
+
+@pytest.fixture
+def batch_analyzer(analyzer):
+    analyzer.batch_mode = True
+    analyzer.batch_poll_interval = 0.001
+    analyzer.client = FakeBatchClient(respond_with_city)
+    return analyzer
+
+def test_batch_mode_maps_results_to_links(batch_analyzer):
+    contents = {
+        "link1": TEST_CONTENT,
+        "link2": "a bad request",
+        "link3": "no schema here",
+        "link4": "",
+        "link5": "unfinished " + TEST_CONTENT,
+    }
+    results = dict(batch_analyzer.analyze_multiple(contents))
+    assert list(results) == list(contents)
+    assert results["link1"].analysis_success and results["link1"].output == {"location": "Rome"}
+    assert "Invalid request" in results["link2"].analysis_error
+    assert "schema" in results["link3"].analysis_error
+    assert results["link4"].analysis_error == "Content is not a valid string."
+    assert "ended with status completed" in results["link5"].analysis_error
+    
+    client = batch_analyzer.client
+    # One batch job for all valid contents, polled until it finished
+    assert len(client.uploads) == 1 and len(client.uploads[0]) == 4
+    request = client.uploads[0][0]
+    assert request["url"] == OpenAiAnalyzer.BATCH_ENDPOINT
+    assert request["body"]["model"] == "gpt-4o-mini"
+    assert request["body"]["messages"][0]["content"] == TEST_INSTRUCTION
+    assert client.retrieves == 2
+
+def test_batch_mode_splits_large_batches_and_truncates(batch_analyzer):
+    batch_analyzer.BATCH_MAX_REQUESTS = 2
+    batch_analyzer.max_content_size = 10
+    contents = {f"link{i}": f"content {i} " + "x" * 20 for i in range(5)}
+    results = batch_analyzer.analyze_batch(contents)
+    assert all(result.analysis_success for result in results.values())
+    uploads = batch_analyzer.client.uploads
+    assert [len(upload) for upload in uploads] == [2, 2, 1]
+    assert all(len(request["body"]["messages"][1]["content"]) == 10 for upload in uploads for request in upload)
+
+def test_batch_mode_timeout_cancels_batch(batch_analyzer):
+    batch_analyzer.client.polls_until_done = 10**6
+    batch_analyzer.batch_timeout = 0.01
+    results = batch_analyzer.analyze_batch({"link1": TEST_CONTENT})
+    assert not results["link1"].analysis_success
+    assert "cancelled" in results["link1"].analysis_error
+    assert batch_analyzer.client.cancelled == ["batch-0"]
+
+def test_batch_mode_uses_cache(batch_analyzer, tmp_path):
+    batch_analyzer.cache = LlmResponseCache(tmp_path)
+    contents = {"link1": TEST_CONTENT, "link2": "no schema here"}
+    first = batch_analyzer.analyze_batch(contents)
+    second = batch_analyzer.analyze_batch(contents)
+    assert second["link1"].output == first["link1"].output == {"location": "Rome"}
+    assert not second["link2"].analysis_success
+    # Only the invalid response is submitted again
+    assert [len(upload) for upload in batch_analyzer.client.uploads] == [2, 1]
+    assert batch_analyzer.cache.hits == 1
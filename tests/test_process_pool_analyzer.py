@@ -0,0 +1,56 @@
+import os
+import threading
+import pytest
+from scraipe.classes import AnalysisResult, IAnalyzer
+from scraipe.defaults.process_pool_analyzer import ProcessPoolAnalyzer
+from scraipe.defaults.text_stats_analyzer import TextStatsAnalyzer
+
+class PidAnalyzer(IAnalyzer):
+    def analyze(self, content):
+        return AnalysisResult.succeed({"pid": os.getpid(), "length": len(content)})
+
+class FailingAnalyzer(IAnalyzer):
+    def analyze(self, content):
+        raise RuntimeError("boom")
+
+class UnpicklableAnalyzer(IAnalyzer):
+    def __init__(self):
+        self.lock = threading.Lock()
+    def analyze(self, content):
+        return AnalysisResult.succeed({})
+
+def test_analyze_multiple_runs_in_workers_in_order():
+    contents = {f"link{i}": "x" * i for i in range(50)}
+    with ProcessPoolAnalyzer(PidAnalyzer(), max_workers=2, chunk_size=4) as analyzer:
+        results = list(analyzer.analyze_multiple(contents))
+    assert [link for link, _ in results] == list(contents)
+    assert [result.output["length"] for _, result in results] == list(range(50))
+    assert all(result.output["pid"] != os.getpid() for _, result in results)
+
+def test_matches_wrapped_analyzer():
+    contents = {f"link{i}": "Hello world! It's test %d." % i for i in range(20)}
+    with ProcessPoolAnalyzer(TextStatsAnalyzer(), max_workers=2, chunk_size=3) as analyzer:
+        assert list(analyzer.analyze_multiple(contents)) == list(TextStatsAnalyzer().analyze_multiple(contents))
+        assert analyzer.analyze("One. Two.") == TextStatsAnalyzer().analyze("One. Two.")
+
+def test_errors_propagate():
+    with ProcessPoolAnalyzer(FailingAnalyzer(), max_workers=1) as analyzer:
+        with pytest.raises(RuntimeError):
+            list(analyzer.analyze_multiple({"a": "content"}))
+
+def test_unpicklable_analyzer_rejected():
+    with pytest.raises(ValueError):
+        ProcessPoolAnalyzer(UnpicklableAnalyzer())
+
+def test_workflow_analyze_uses_pool():
+    from scraipe import Workflow
+    from scraipe.classes import IScraper, ScrapeResult
+    class EchoScraper(IScraper):
+        def scrape(self, url):
+            return ScrapeResult.succeed(url, url)
+    with ProcessPoolAnalyzer(PidAnalyzer(), max_workers=2) as analyzer:
+        workflow = Workflow(EchoScraper(), analyzer)
+        workflow.scrape(["a", "bb"])
+        results = workflow.analyze()
+    assert sorted(result.output["length"] for result in results) == [1, 2]
+    assert all(result.output["pid"] != os.getpid() for result in results)
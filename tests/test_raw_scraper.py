@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from scraipe.defaults.raw_scraper import RawScraper
 from scraipe import ScrapeResult
+from tests.common import mock_http_response
 
 @pytest.mark.asyncio
 async def test_default_headers():
@@ -17,12 +18,7 @@ async def test_custom_headers():
 @pytest.mark.asyncio
 @patch("aiohttp.ClientSession")
 async def test_scrape_success(mock_session_cls):
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.text = AsyncMock(return_value="Mocked raw content")
-    mock_session = MagicMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    mock_http_response(mock_session_cls, body=b"Mocked raw content")
 
     scraper = RawScraper()
     result: ScrapeResult = await scraper.async_scrape("https://example.com")
@@ -32,12 +28,7 @@ async def test_scrape_success(mock_session_cls):
 @pytest.mark.asyncio
 @patch("aiohttp.ClientSession")
 async def test_scrape_non_200(mock_session_cls):
-    mock_response = MagicMock()
-    mock_response.status = 404
-    mock_response.text = AsyncMock(return_value="Not Found")
-    mock_session = MagicMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    mock_http_response(mock_session_cls, status=404, body=b"Not Found")
 
     scraper = RawScraper()
     result: ScrapeResult = await scraper.async_scrape("https://example.com")
@@ -54,4 +45,27 @@ async def test_scrape_exception(mock_session_cls):
     scraper = RawScraper()
     result: ScrapeResult = await scraper.async_scrape("https://example.com")
     assert not result.scrape_success
-    assert "Request failed" in result.scrape_error
\ No newline at end of file
+    assert "Request failed" in result.scrape_error
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_bytes_mode_keeps_body(mock_session_cls):
+    body = "café".encode("latin-1") + b"\x00\xff"
+    mock_http_response(mock_session_cls, body=body, headers={"Content-Type": "application/octet-stream"})
+    scraper = RawScraper(as_bytes=True)
+    result = await scraper.async_scrape("https://example.com/blob")
+    assert result.scrape_success
+    assert result.content == body
+    assert isinstance(result.content, bytes)
+    assert result.metadata == {"content_type": "application/octet-stream"}
+    # No decoding happens in bytes mode
+    assert scraper.stats.snapshot()["decodes"] == 0
+
+def test_scrape_result_accepts_buffers():
+    body = b"x" * 1024
+    # A memoryview over a whole bytes object is stored without copying
+    assert ScrapeResult.succeed("link", memoryview(body)).content is body
+    assert ScrapeResult.succeed("link", memoryview(body)[10:20]).content == b"x" * 10
+    assert ScrapeResult.succeed("link", bytearray(b"abc")).content == b"abc"
+    assert ScrapeResult.succeed("link", body).content is body
+    assert ScrapeResult.succeed("link", "text").content == "text"
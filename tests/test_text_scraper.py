@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock  # added import for asynchronous mocks
 from scraipe.defaults.text_scraper import TextScraper
 from scraipe import ScrapeResult, AnalysisResult
+from tests.common import mock_http_response
 
 TARGET_MODULE = TextScraper.__module__
 
@@ -19,14 +20,8 @@ def test_custom_headers():
 
 @patch("aiohttp.ClientSession")
 def test_scrape_success(mock_session_cls):
-    # Create an async mock response
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.text = AsyncMock(return_value="Mocked response content")
-    # Create a mock session whose get returns an async context manager yielding mock_response
-    mock_session = MagicMock()
-    mock_session.get.return_value.__aenter__.return_value = mock_response
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    # Create a mock session whose response streams the body
+    mock_http_response(mock_session_cls, body=b"Mocked response content", headers={"Content-Type": "text/html"})
 
     scraper = TextScraper()
     scrape_result: ScrapeResult = scraper.scrape("https://google.com")
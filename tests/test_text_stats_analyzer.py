@@ -45,3 +45,67 @@ def test_analyze_text_with_only_punctuation(analyzer):
     assert result.output["character_count"] == 11
     assert result.output["sentence_count"] == 0
     assert result.output["average_word_length"] == 0
+
+def _reference(analyzer, contents):
+    from scraipe.classes import IAnalyzer
+    return list(IAnalyzer.analyze_multiple(analyzer, contents))
+
+@pytest.mark.parametrize("alphabet", [
+    "abcXYZ019_'' .!?,\n\t-\"",
+    "aé中١_' .!?  ​\ud800\U0001F600",
+    "a'. ",
+])
+def test_analyze_multiple_matches_analyze(analyzer, alphabet):
+    import random
+    rng = random.Random(0)
+    contents = {f"doc{i}": "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 60))) for i in range(2000)}
+    contents.update({"empty": "", "dots": "...", "quote": "'", "quoted": "it's a 'quoted' word''s."})
+    assert list(analyzer.analyze_multiple(contents)) == _reference(analyzer, contents)
+
+def test_analyze_multiple_batches(analyzer, monkeypatch):
+    monkeypatch.setattr(TextStatsAnalyzer, "BATCH_CHARS", 10)
+    contents = {f"doc{i}": "Hello world! This is a test number %d." % i for i in range(25)}
+    assert list(analyzer.analyze_multiple(contents)) == _reference(analyzer, contents)
+
+def test_analyze_multiple_non_text(analyzer):
+    contents = {"a": "Some text.", "b": None}
+    results = analyzer.analyze_multiple(contents)
+    assert next(results)[1].output["word_count"] == 2
+    with pytest.raises(TypeError):
+        next(results)
+
+def _regex_stats(content):
+    from scraipe.defaults.text_stats_analyzer import find_words, split_sentences
+    return TextStatsAnalyzer().analyze_with_artifacts(
+        content, {"words": find_words(content), "sentences": split_sentences(content)}).output
+
+@pytest.mark.parametrize("window", [2, 7, 64])
+@pytest.mark.parametrize("alphabet", [
+    "abcXYZ019_'' .!?,\n\t-\"",
+    "aé中١_' .!?  ​\ud800\U0001F600",
+    "ab'",
+    " .!",
+])
+def test_scanner_matches_regexes(window, alphabet):
+    import random
+    from scraipe.defaults.text_stats_analyzer import _scan_stats
+    rng = random.Random(window)
+    for _ in range(100):
+        content = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 200)))
+        assert _scan_stats(content, window) == _regex_stats(content)
+
+def test_analyze_scans_long_text(analyzer, monkeypatch):
+    monkeypatch.setattr(TextStatsAnalyzer, "SCAN_WINDOW", 100)
+    content = "Hello world! It's a test of the scanner... Isn't it? " * 200
+    assert len(content) >= TextStatsAnalyzer.SCAN_MIN_CHARS
+    result = analyzer.analyze(content)
+    assert result.output == _regex_stats(content)
+    assert result.output["sentence_count"] == 600
+
+def test_text_counts_artifact(analyzer, monkeypatch):
+    from scraipe.defaults.text_stats_analyzer import count_text
+    monkeypatch.setattr(TextStatsAnalyzer, "SCAN_WINDOW", 100)
+    for content in ["Hello world! It's a test.", "Hello world! It's a test of the scanner... Isn't it? " * 200]:
+        counts = count_text(content)
+        assert set(counts) == {"word_count", "word_characters", "sentence_count"}
+        assert analyzer.analyze_with_artifacts(content, {"text_counts": counts}).output == _regex_stats(content)